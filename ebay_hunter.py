@@ -2,7 +2,7 @@
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
@@ -12,6 +12,29 @@ from datetime import datetime
 import os
 import traceback
 import threading
+import io
+import sqlite3
+import argparse
+import json
+import queue
+import shutil
+import gzip
+import html
+import http.client
+import random
+import heapq
+import math
+import asyncio
+import signal
+import contextlib
+from urllib.parse import urlencode, urljoin, urlsplit
+from collections import OrderedDict, deque
+from itertools import islice
+
+try:
+    import websockets  # Optional - only the cdp engine needs it
+except ImportError:
+    websockets = None
 
 # ========================
 # GLOBAL WATCHDOG
@@ -19,9 +42,10 @@ import threading
 
 
 class Watchdog:
-    """Global timeout watchdog - kills operations that take too long"""
+    """Timeout watchdog - kills operations that take too long"""
 
     def __init__(self):
+        self.deadline = None  # Budget of the task this thread is running, if any
         self.reset()
 
     def reset(self):
@@ -29,7 +53,10 @@ class Watchdog:
         self.is_stuck = False
 
     def check(self, max_seconds=15):
-        """Check if we've been stuck too long"""
+        """Check if we've been stuck too long or the task budget is spent"""
+        if self.deadline is not None and self.deadline.expired:
+            self.is_stuck = True
+            return True
         elapsed = time.time() - self.last_activity
         if elapsed > max_seconds:
             self.is_stuck = True
@@ -42,7 +69,197 @@ class Watchdog:
         self.is_stuck = False
 
 
-watchdog = Watchdog()
+class ThreadWatchdog:
+    """Gives every thread its own Watchdog - pool workers keep separate stuck state"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def current(self):
+        wd = getattr(self._local, 'watchdog', None)
+        if wd is None:
+            wd = self._local.watchdog = Watchdog()
+        return wd
+
+    def __getattr__(self, name):
+        return getattr(self.current, name)
+
+
+watchdog = ThreadWatchdog()
+
+# ========================
+# TASK DEADLINES
+# ========================
+
+
+class Deadline:
+    """Monotonic time budget for one task (a keyword, a product)
+
+    Children never outlive their parent. Immutable apart from the abort flag,
+    so workers and the supervisor thread can share one safely.
+    """
+
+    def __init__(self, seconds, label="", parent=None):
+        self.label = label
+        self.parent = parent
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.expires = self.started + seconds
+        if parent is not None:
+            self.expires = min(self.expires, parent.expires)
+        self._aborted = threading.Event()
+
+    def child(self, seconds, label=""):
+        return Deadline(seconds, label, self)
+
+    def remaining(self):
+        return self.expires - time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def clamp(self, seconds):
+        """seconds, cut down to what is left of the budget"""
+        return max(0.0, min(seconds, self.remaining()))
+
+    def abort(self):
+        self._aborted.set()
+
+    @property
+    def aborted(self):
+        return self._aborted.is_set() or (self.parent is not None and self.parent.aborted)
+
+    @property
+    def expired(self):
+        return self.aborted or self.remaining() <= 0
+
+
+def set_command_timeout(driver, seconds):
+    """Cap how long a single WebDriver HTTP command may block"""
+    executor = getattr(driver, 'command_executor', None)
+    try:
+        config = getattr(executor, '_client_config', None)
+        if config is not None:
+            # Selenium 4.26+: read on every request
+            config.timeout = seconds
+            return
+        # Older Selenium: the timeout lives on the urllib3 pools
+        import urllib3
+        manager = executor._conn
+        manager.connection_pool_kw['timeout'] = urllib3.Timeout(total=seconds)
+        for key in manager.pools.keys():
+            manager.pools[key].timeout = urllib3.Timeout(total=seconds)
+    except Exception:
+        pass
+
+
+class DeadlineSupervisor(threading.Thread):
+    """Enforces task budgets on browser commands that never return
+
+    A task enters its deadline for a driver; the WebDriver command timeout is
+    capped to the remaining budget and, should a command still be blocked
+    DEADLINE_GRACE seconds past it, the browser process is killed so the call
+    fails instead of hanging the worker. A task that overran between commands
+    is left to notice its expired deadline itself.
+    """
+
+    def __init__(self, poll=0.25):
+        super().__init__(name="deadline-supervisor", daemon=True)
+        self.poll = poll
+        self.lock = threading.Lock()
+        self.watched = {}  # id(deadline) -> (deadline, driver)
+        self.aborts = 0
+
+    def enter(self, driver, deadline):
+        """Start enforcing deadline - returns the thread's previous budget for leave()"""
+        with self.lock:
+            if not self.is_alive():
+                self.start()
+            self.watched[id(deadline)] = (deadline, driver)
+        stack = getattr(driver, 'ebh_deadlines', None)
+        if stack is None:
+            stack = driver.ebh_deadlines = []
+        stack.append(deadline)
+        set_command_timeout(driver, max(deadline.remaining(), 0) + DEADLINE_GRACE)
+        previous = watchdog.deadline
+        watchdog.current.deadline = deadline
+        return previous
+
+    def leave(self, driver, deadline, previous=None):
+        with self.lock:
+            self.watched.pop(id(deadline), None)
+        stack = getattr(driver, 'ebh_deadlines', [])
+        if deadline in stack:
+            stack.remove(deadline)
+        outer = stack[-1] if stack else None
+        set_command_timeout(driver, max(outer.remaining(), 0) + DEADLINE_GRACE if outer
+                            else DEFAULT_COMMAND_TIMEOUT)
+        watchdog.current.deadline = previous
+
+    @contextlib.contextmanager
+    def watch(self, driver, deadline):
+        previous = self.enter(driver, deadline)
+        try:
+            yield deadline
+        finally:
+            self.leave(driver, deadline, previous)
+
+    def run(self):
+        while True:
+            time.sleep(self.poll)
+            with self.lock:
+                watched = list(self.watched.values())
+            for deadline, driver in watched:
+                if deadline.aborted or deadline.remaining() > -DEADLINE_GRACE:
+                    continue
+                since = getattr(driver, 'ebh_command_since', None)
+                if since is None or time.monotonic() - since < DEADLINE_GRACE:
+                    continue
+                deadline.abort()
+                self.aborts += 1
+                self._kill_browser(driver, deadline)
+
+    @staticmethod
+    def _kill_browser(driver, deadline):
+        pid = browser_root_pid(driver)
+        print(f"\n   {Colors.error('⏱')} {deadline.label or 'Task'} blew its {deadline.seconds:.0f}s budget "
+              f"- killing browser (pid {pid}) to abort the hung command")
+        if pid:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+deadline_supervisor = DeadlineSupervisor()
+
+
+def track_commands(driver):
+    """Record on the driver when its in-flight WebDriver command started
+
+    Every Selenium call goes through driver.execute; ebh_command_since is None
+    while no command is running, so the supervisor can tell a blocked command
+    from Python-side work.
+    """
+    execute = driver.execute
+    driver.ebh_command_since = None
+
+    def tracked(*args, **kwargs):
+        driver.ebh_command_since = time.monotonic()
+        try:
+            return execute(*args, **kwargs)
+        finally:
+            driver.ebh_command_since = None
+
+    driver.execute = tracked
+
+
+def keyword_budget():
+    """Seconds one keyword may take - KEYWORD_BUDGET, or derived from the product budget"""
+    if KEYWORD_BUDGET:
+        return KEYWORD_BUDGET
+    return PRODUCTS_PER_KEYWORD * PRODUCT_BUDGET + SEARCH_BUDGET
 
 # ========================
 # TERMINAL COLORS
@@ -88,13 +305,45 @@ class Colors:
 # ========================
 INPUT_FILE = "product_keywords.txt"
 OUTPUT_FILE = "ebay_keyword_results.csv"
-STUCK_KEYWORDS_FILE = "stuck_keywords.txt"  # Track stuck/failed keywords
+RESULTS_BACKEND = "csv"  # "csv" (append-only file) or "sqlite" (WAL database)
+RESULTS_DB_FILE = "ebay_keyword_results.db"
+DB_BATCH_SIZE = 20  # Rows buffered before a single commit
+DB_FLUSH_SECONDS = 15  # Max age of buffered rows before they are committed anyway
+STUCK_REGISTRY_FILE = "stuck_keywords.jsonl"  # Per-keyword failure counts and next retry time
+STUCK_KEYWORDS_FILE = "stuck_keywords.txt"  # Legacy plain-text list - imported into the registry once
+STUCK_BACKOFF_BASE = 15 * 60  # First retry delay in seconds; doubles with every further failure
+STUCK_BACKOFF_MAX = 7 * 24 * 3600
+STUCK_MAX_FAILURES = 6  # Failures after which a keyword is parked until cleared by hand
+STUCK_IGNORE_BACKOFF = False  # Try registered keywords right away (--retry-stuck)
 MIN_SALES_THRESHOLD = 5
 WINNER_THRESHOLD = 10
 SAVE_ALL_PRODUCTS = True
-
+# Sold-history window: the last SALES_WINDOW_MONTHS months up to SALES_WINDOW_END ("YYYY-MM", None = this month)
+SALES_WINDOW_MONTHS = 2
+SALES_WINDOW_END = None
+SALES_HISTOGRAM = "month"  # Buckets stored per product: "month" or "day"
+# Early stopping: Wald's sequential test on each keyword's good/dud products
+EARLY_STOP = True
+EARLY_STOP_DUD_RATE = 0.02  # Good-product rate of a keyword not worth finishing
+EARLY_STOP_GOOD_RATE = 0.3  # Good-product rate of a promising keyword
+EARLY_STOP_ALPHA = 0.05  # Risk of calling a dud keyword promising
+EARLY_STOP_BETA = 0.2  # Risk of stopping a promising keyword early
+EARLY_STOP_MIN_PRODUCTS = 3  # Products checked before any decision
+EARLY_STOP_BONUS = 10  # Extra products a promising keyword may take from visits saved by early stops
+KEYWORD_DECISIONS_FILE = "keyword_decisions.jsonl"  # Early-stop decisions (csv backend)
+
+CHROME_USER_DATA_DIR = "/Users/mac/Library/Application Support/Google/Chrome"
 CHROME_PROFILE = "Profile 12"
-RESTART_EVERY = 30
+WORKERS = 1  # >1 runs a pool of browsers, each with a cloned profile
+WORKER_PROFILE_ROOT = "worker_profiles"  # Where per-worker profile clones live
+WARM_STANDBY = True  # Keep a pre-launched browser so restarts are an instant swap
+STANDBY_WAIT = 20  # Max seconds to wait for a standby that is still starting
+RECYCLE_MAX_RSS_MB = 2500  # Recycle when the Chrome process tree uses more memory
+RECYCLE_MAX_TABS = 4  # ...or has leaked this many tabs/windows
+RECYCLE_LATENCY_P90 = 8.0  # ...or the p90 of recent page loads is slower than this
+RECYCLE_LATENCY_WINDOW = 20  # Page loads the latency percentiles are taken over
+RECYCLE_MAX_PAGES = 400  # Safety ceiling on pages per browser even when healthy
+RECYCLE_LOG_FILE = "browser_recycle_log.jsonl"
 REQUEST_DELAY = 0.25
 MAX_RETRIES = 2
 PRODUCTS_PER_KEYWORD = 10
@@ -102,6 +351,41 @@ PRODUCTS_PER_KEYWORD = 10
 # Price filter configuration
 MIN_PRICE = 8  # Minimum price filter in dollars
 
+# Results-page pre-filter: skip the sold-history visit for cards that cannot qualify
+PREFILTER = True
+PREFILTER_MIN_PRICE = MIN_PRICE  # Card price below this (None = no price rule)
+PREFILTER_MIN_SOLD = 0  # Require an "N sold" badge of at least this (0 = no rule)
+PREFILTER_SKIP_SPONSORED = False
+PREFILTER_US_ONLY = False  # Reject cards that show a non-US "from ..." origin
+PREFILTER_AUDIT_RATE = 0.1  # Share of rejected cards visited anyway to measure missed winners
+PREFILTER_LOG_FILE = "prefilter_log.jsonl"
+
+# Search navigation
+FAST_SEARCH_URL = True  # Load the filtered results URL directly instead of typing + clicking filters
+EBAY_BASE_URL = "https://www.ebay.com"  # Point at a local server to replay recorded pages
+HTTP_SEARCH = False  # Fetch search results over plain HTTP; Chrome is kept for sold history only
+HTTP_TIMEOUT = 15
+
+# Keyword order: "yield" ranks pending keywords by the winner rate of similar scraped ones, "file" keeps file order
+KEYWORD_SCHEDULE = "yield"
+SCHEDULE_EXPLORE = 0.1  # Share of early slots given to keywords without history
+SCHEDULE_PRIOR_WEIGHT = 20  # Pseudo-products pulling sparse token estimates toward the base rate
+SCHEDULE_MIN_EVIDENCE = 10  # Token products below which a keyword counts as unexplored
+
+# Run journal: append-only record of keyword/product progress for mid-keyword resume
+RUN_JOURNAL = True
+RUN_JOURNAL_FILE = "run_journal.jsonl"
+JOURNAL_COMPACT_EVERY = 2000  # Events appended before the journal is rewritten to live state
+
+# Keyword clustering: near-duplicate keywords share one search
+KEYWORD_CLUSTERS = True
+CLUSTER_SIMILARITY = 0.8  # Jaccard similarity of normalized token sets to join a cluster
+
+# Candidate pool: one search load feeds many products
+CANDIDATE_POOL = True  # Ask for the largest results page and follow pagination lazily
+RESULTS_PAGE_SIZE = 240  # eBay's largest _ipg page size
+POOL_MAX_PAGES = 3  # Results pages loaded per keyword before giving up on the quota
+
 # Enhanced timeouts
 PAGE_LOAD_TIMEOUT = 5
 SEARCH_WAIT = 5
@@ -109,16 +393,183 @@ FILTER_WAIT = 8
 FILTER_MAX_WAIT = 15
 SCROLL_DELAY = 0.8
 BUTTON_WAIT = 0.8
+ITEM_READY_WAIT = 0.8  # Upper bound for an item page body to render
+PREFETCH_TABS = 2  # Listing pages loaded ahead in background tabs (0 = one page at a time)
+
+# Browser engine: "selenium" (WebDriver) or "cdp" (asyncio over DevTools, needs websockets)
+ENGINE = "selenium"
+CDP_TABS = 4  # Product tabs the cdp engine runs concurrently
+EXTENSION_BUTTON_WAIT = 2.0  # Upper bound for the extension's "View Sold History" button
+NEW_WINDOW_WAIT = 2.5  # Upper bound for the extension to open its sold-history window
+HISTORY_READY_WAIT = 0.9  # Upper bound for the sold-history tab to render
 MAX_STUCK_TIME = 30
 KEYWORD_STUCK_RETRY = 2  # Retry stuck keywords twice before skipping
 
+# Adaptive pacing: shrink the request delay additively while healthy, back off multiplicatively on trouble
+ADAPTIVE_PACING = True
+PACING_LOG_FILE = "pacing_decisions.jsonl"
+PACING_HEALTHY_STREAK = 5  # Consecutive healthy outcomes before one additive step down
+PACING_BACKOFF = 2.0  # Multiplier applied on a timeout, stuck or throttled outcome
+PACING_SLOW_FACTOR = 2.0  # An ok outcome this many times the median latency holds steady
+PACING_DELAY_MIN = 0.05
+PACING_DELAY_MAX = 5.0
+PACING_DELAY_STEP = 0.05  # Additive step down after a healthy streak
+
+# Calibration: measured timeouts are written here and loaded at startup
+TUNED_SETTINGS_FILE = "tuned_settings.json"
+CALIBRATION_KEYWORDS = 5  # Keywords sampled from INPUT_FILE per calibration run
+CALIBRATION_PRODUCTS = 3  # Products visited per sampled keyword
+CALIBRATION_PERCENTILE = 95  # Waits are set from this percentile of the measured phase...
+CALIBRATION_HEADROOM = 1.5  # ...times this safety factor
+CALIBRATION_CEILING = 30  # Generous wait used while measuring so samples are not cut off
+
+# Task budgets (monotonic seconds) - a hung browser command is aborted once its budget runs out
+KEYWORD_BUDGET = None  # None = PRODUCTS_PER_KEYWORD × PRODUCT_BUDGET + SEARCH_BUDGET
+PRODUCT_BUDGET = 30
+SEARCH_BUDGET = 60  # Search, filters and result extraction within a keyword budget
+DEADLINE_GRACE = 3  # Slack past a budget before the supervisor kills the browser
+DEFAULT_COMMAND_TIMEOUT = 120  # Selenium's own HTTP command timeout outside any budget
+
+# Cross-keyword sold-history cache (keyed by eBay item ID)
+ITEM_CACHE_FILE = "item_history_cache.json"
+ITEM_CACHE_TTL_HOURS = 24  # Reuse a checked item for this long
+ITEM_CACHE_MAX_ITEMS = 50000  # Least recently used items are evicted beyond this
+ITEM_CACHE_SAVE_EVERY = 25  # Persist after this many new entries
+
+SELECTOR_STATS_FILE = "selector_stats.json"  # Learned selector hit counts
+
+# Sold-history tab: "persistent" reuses one long-lived tab, "new-window" opens/closes one per product
+HISTORY_TAB_MODE = "persistent"
+HISTORY_WINDOW_NAME = "ebh_sold_history"
+
+# Resource blocking via CDP: "off", "extension-safe" or "minimal"
+RESOURCE_BLOCKING = "extension-safe"
+
 # ========================
 # ========================
 # CSV SETUP - REINFORCED
 # ========================
 
+CSV_HEADERS = ['Keyword', 'Product URL', 'Price', 'Sales Window', 'Window Sales',
+               'Sales Histogram', 'Date Checked', 'Status']
+# Schema before the window was configurable - counted January and February 2026
+LEGACY_CSV_HEADERS = ['Keyword', 'Product URL', 'Price', 'January 2026 Sales',
+                      'February 2026 Sales', 'Date Checked', 'Status']
+LEGACY_WINDOW = ('2026-01', '2026-02')
+
+
+def sales_window(end=None, months=None):
+    """First and last month ('YYYY-MM') of the rolling sold-history window"""
+    end = end or SALES_WINDOW_END or datetime.now().strftime("%Y-%m")
+    months = months or SALES_WINDOW_MONTHS
+    year, month = map(int, end.split('-'))
+    first = year * 12 + month - 1 - (months - 1)
+    return f"{first // 12:04d}-{first % 12 + 1:02d}", f"{year:04d}-{month:02d}"
+
+
+def window_label(window):
+    return f"{window[0]}..{window[1]}"
+
+
+def window_months(window):
+    """Every 'YYYY-MM' in the window, oldest first"""
+    first_year, first_month = map(int, window[0].split('-'))
+    last_year, last_month = map(int, window[1].split('-'))
+    return [f"{index // 12:04d}-{index % 12 + 1:02d}"
+            for index in range(first_year * 12 + first_month - 1, last_year * 12 + last_month)]
+
+
+def format_histogram(histogram):
+    """Compact 'bucket:count' text for the CSV/SQLite column"""
+    return " ".join(f"{bucket}:{count}" for bucket, count in sorted(histogram.items()))
+
+
+def parse_histogram(text):
+    histogram = {}
+    for part in (text or '').split():
+        bucket, _, count = part.partition(':')
+        if bucket:
+            histogram[bucket] = _to_int(count)
+    return histogram
+
+
+def month_totals(histogram):
+    """Per-month sales from a month or day histogram"""
+    totals = {}
+    for bucket, count in histogram.items():
+        totals[bucket[:7]] = totals.get(bucket[:7], 0) + count
+    return totals
+
+
+def legacy_history(jan_sales, feb_sales):
+    """Sold-history record for a row from the January/February 2026 schema"""
+    return {'window': window_label(LEGACY_WINDOW),
+            'sales': {LEGACY_WINDOW[0]: _to_int(jan_sales), LEGACY_WINDOW[1]: _to_int(feb_sales)}}
+
+
+def build_result(keyword, url, price, history, status='Success', date_checked=None):
+    """Result row for the stores - carries its sales window and histogram"""
+    return {
+        'keyword': keyword,
+        'url': url,
+        'price': price,
+        'window': history['window'],
+        'sales': history['sales'],
+        'window_sales': history.get('window_sales', sum(history['sales'].values())),
+        'date_checked': date_checked or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'status': status,
+    }
+
+
+def csv_row(result):
+    return [
+        result['keyword'],
+        result['url'],
+        result['price'],
+        result['window'],
+        result['window_sales'],
+        format_histogram(result['sales']),
+        result['date_checked'],
+        result.get('status', 'Success'),
+    ]
+
+
+def migrate_legacy_csv(path=OUTPUT_FILE):
+    """Rewrite a January/February 2026 results file into the windowed schema (backup kept)"""
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if next(csv.reader(f), None) != LEGACY_CSV_HEADERS:
+                return 0
+    except FileNotFoundError:
+        return 0
+
+    backup = path + ".legacy.bak"
+    shutil.copy2(path, backup)
+    tmp_path = path + ".tmp"
+    migrated = 0
+    with open(backup, 'r', encoding='utf-8', newline='') as source, \
+            open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        reader = csv.reader(source)
+        next(reader)
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
+        for row in reader:
+            migrated += 1
+            if len(row) < 2:
+                continue
+            row = row + [''] * (len(LEGACY_CSV_HEADERS) - len(row))
+            keyword, url, price, jan_sales, feb_sales, date_checked, status = row[:7]
+            writer.writerow(csv_row(build_result(keyword, url, price, legacy_history(jan_sales, feb_sales),
+                                                 status or 'Success', date_checked)))
+    os.replace(tmp_path, path)
+    print(f"{Colors.success('✓')} Migrated {migrated} rows in {path} to the sales-window schema "
+          f"(original kept as {backup})")
+    return migrated
+
+
 def setup_csv():
     """Create CSV file with headers if it doesn't exist"""
+    migrate_legacy_csv()
     if os.path.exists(OUTPUT_FILE):
         print(f"{Colors.success('✓')} Using existing file: {OUTPUT_FILE}")
         return True
@@ -126,8 +577,7 @@ def setup_csv():
     try:
         with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(['Keyword', 'Product URL', 'Price', 'January 2026 Sales',
-                            'February 2026 Sales', 'Date Checked', 'Status'])
+            writer.writerow(CSV_HEADERS)
         print(f"{Colors.success('✓')} Created new file: {OUTPUT_FILE}")
         return True
     except Exception as e:
@@ -135,100 +585,184 @@ def setup_csv():
         return False
 
 
-def get_processed_keywords():
-    """Get keywords and their processed URLs from CSV - REINFORCED VERSION"""
-    processed = {}
-    if not os.path.exists(OUTPUT_FILE):
-        return processed
+def complete_records_end(chunk):
+    """Byte length of the complete CSV records at the start of chunk
 
-    try:
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f:
-            # Read first line to check headers
-            first_line = f.readline().strip()
+    A newline only ends a record outside quotes - quoted fields may span lines,
+    and an escaped quote ("") leaves the parity unchanged.
+    """
+    end = position = quotes = 0
+    for line in chunk.split(b'\n')[:-1]:
+        quotes += line.count(b'"')
+        position += len(line) + 1
+        if quotes % 2 == 0:
+            end = position
+    return end
 
-            # Reset to beginning
-            f.seek(0)
 
-            # Check if file has proper headers
-            if 'Keyword' in first_line and 'Product URL' in first_line:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        keyword = row['Keyword'].strip().lower()  # NORMALIZE: lowercase
-                        url = row['Product URL'].strip()
-
-                        if keyword and url:
-                            if keyword not in processed:
-                                processed[keyword] = set()
-                            processed[keyword].add(url)
-                    except KeyError:
-                        continue
-            else:
-                # File exists but no proper headers - read as raw CSV
-                reader = csv.reader(f)
-                next(reader, None)  # Skip first line
-                for row in reader:
-                    if len(row) >= 2:
-                        keyword = row[0].strip().lower()  # NORMALIZE: lowercase
-                        url = row[1].strip()
-                        if keyword and url:
-                            if keyword not in processed:
-                                processed[keyword] = set()
-                            processed[keyword].add(url)
-
-        print(f"{Colors.success('✓')} Loaded {sum(len(urls) for urls in processed.values())} processed products from CSV")
-        
+class ResumeIndex:
+    """In-memory keyword -> processed URLs index, built once and tailed from the CSV
+
+    The same pass counts rows and winners per keyword for the yield scheduler.
+    """
+
+    def __init__(self, path=OUTPUT_FILE):
+        self.path = path
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.processed = {}
+        self.yields = {}  # keyword -> (products checked, winners)
+        self.offset = 0
+        self.keyword_col = 0
+        self.url_col = 1
+        self.sales_col = None
+
+    def load(self):
+        """Build the index from scratch (startup only)"""
+        with self.lock:
+            self.reset()
+            self._consume()
+        return self
+
+    def refresh(self):
+        """Pick up rows appended since the last read - reads only the new bytes"""
+        with self.lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            if size < self.offset:
+                # File was truncated or replaced - the only case we start over
+                self.reset()
+            elif size == self.offset:
+                return 0
+            return self._consume()
+
+    def _consume(self):
+        """Parse complete lines from the last byte offset onward"""
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+
+        # Only consume complete records - a partially written row stays for next time
+        end = complete_records_end(chunk)
+        if not end:
+            return 0
+        chunk = chunk[:end]
+        start_offset = self.offset
+        self.offset += len(chunk)
+
+        rows = csv.reader(io.StringIO(chunk.decode('utf-8', errors='replace')))
+        if start_offset == 0:
+            header = next(rows, None) or []
+            if 'Keyword' in header and 'Product URL' in header:
+                self.keyword_col = header.index('Keyword')
+                self.url_col = header.index('Product URL')
+            if 'Window Sales' in header:
+                self.sales_col = header.index('Window Sales')
+
+        added = 0
+        for row in rows:
+            if len(row) <= max(self.keyword_col, self.url_col):
+                continue
+            if self.record(row[self.keyword_col], row[self.url_col]):
+                added += 1
+            if self.sales_col is not None and self.sales_col < len(row):
+                keyword = row[self.keyword_col].strip().lower()
+                products, winners = self.yields.get(keyword, (0, 0))
+                self.yields[keyword] = (products + 1,
+                                        winners + (_to_int(row[self.sales_col]) >= WINNER_THRESHOLD))
+        return added
+
+    def record(self, keyword, url):
+        """Add a keyword/URL pair - returns True if it was new"""
+        keyword = keyword.strip().lower()  # NORMALIZE: lowercase
+        url = url.strip()
+        if not keyword or not url:
+            return False
+        with self.lock:
+            urls = self.processed.setdefault(keyword, set())
+            if url in urls:
+                return False
+            urls.add(url)
+            return True
+
+    def get(self, keyword, default=None):
+        return self.processed.get(keyword.strip().lower(), default)
+
+    def progress(self, keyword):
+        return len(self.processed.get(keyword.strip().lower(), ()))
+
+    def completed(self, min_products):
+        return {kw for kw, urls in self.processed.items() if len(urls) >= min_products}
+
+    def items(self):
+        return self.processed.items()
+
+    def __len__(self):
+        return len(self.processed)
+
+    def total_products(self):
+        return sum(len(urls) for urls in self.processed.values())
+
+
+resume_index = ResumeIndex()
+
+
+def get_processed_keywords():
+    """Build the resume index from CSV - full parse happens once at startup"""
+    try:
+        resume_index.load()
+        print(f"{Colors.success('✓')} Loaded {resume_index.total_products()} processed products from CSV")
+
         # DEBUG: Show processed keywords count
-        if processed:
-            print(f"   {Colors.CYAN}→{Colors.RESET} Processed keywords: {len(processed)}")
-            
+        if len(resume_index):
+            print(f"   {Colors.CYAN}→{Colors.RESET} Processed keywords: {len(resume_index)}")
+
     except Exception as e:
         print(f"{Colors.warning('⚠')} Error reading processed data: {e}")
 
-    return processed
+    return resume_index
 
 
 def get_completed_keywords(processed_data):
     """Get list of keywords that have been fully processed (10+ products) - REINFORCED"""
-    completed = set()
-    for keyword, urls in processed_data.items():
-        if len(urls) >= PRODUCTS_PER_KEYWORD:
-            completed.add(keyword.lower())  # NORMALIZE: lowercase
+    completed = processed_data.completed(PRODUCTS_PER_KEYWORD)
     
     # DEBUG: Show completed keywords
     if completed:
         print(f"   {Colors.GREEN}→{Colors.RESET} Completed keywords (≥{PRODUCTS_PER_KEYWORD} products): {len(completed)}")
+
+    # Early-stopped keywords are done too - their evidence said not to finish them
+    stopped = results_store.stopped_keywords() - completed
+    if stopped:
+        print(f"   {Colors.GREEN}→{Colors.RESET} Stopped early (sales evidence below threshold): {len(stopped)}")
     
-    return completed
+    return completed | stopped
 
 
 def is_keyword_completed(keyword, processed_data):
     """Check if a specific keyword has enough products - NEW FUNCTION"""
-    keyword_normalized = keyword.strip().lower()
-    urls = processed_data.get(keyword_normalized, set())
-    return len(urls) >= PRODUCTS_PER_KEYWORD
+    return (processed_data.progress(keyword) >= PRODUCTS_PER_KEYWORD
+            or keyword.strip().lower() in results_store.stopped_keywords())
 
 
 def get_keyword_progress(keyword, processed_data):
     """Get progress for a keyword - NEW FUNCTION"""
-    keyword_normalized = keyword.strip().lower()
-    urls = processed_data.get(keyword_normalized, set())
-    return len(urls)
+    return processed_data.progress(keyword)
 
 def save_to_csv(result):
     """Append result to CSV file"""
     try:
         with open(OUTPUT_FILE, 'a', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow([
-                result['keyword'],
-                result['url'],
-                result['price'],
-                result['jan_sales'],
-                result['feb_sales'],
-                result['date_checked'],
-                result.get('status', 'Success')
-            ])
+            writer.writerow(csv_row(result))
+        resume_index.record(result['keyword'], result['url'])
         watchdog.activity()
         return True
     except Exception as e:
@@ -236,146 +770,1775 @@ def save_to_csv(result):
         return False
 
 
-def load_stuck_keywords():
-    """Load previously stuck keywords from file"""
-    stuck = set()
-    if os.path.exists(STUCK_KEYWORDS_FILE):
+class StuckRegistry:
+    """Stuck/failed keywords with failure counts, last reason and an exponential backoff
+
+    Backed by an append-only JSONL file read once at startup - the last line for
+    a keyword wins and a cleared entry removes it. A keyword with N failures is
+    not retried before STUCK_BACKOFF_BASE * 2**(N-1) seconds have passed;
+    after STUCK_MAX_FAILURES it is parked until its entry is removed.
+    """
+
+    def __init__(self, path=STUCK_REGISTRY_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = None  # keyword -> entry
+
+    def _load(self):
+        if self.entries is not None:
+            return self.entries
+        self.entries = {}
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    lines += 1
+                    if entry.get('cleared'):
+                        self.entries.pop(entry['keyword'], None)
+                    else:
+                        self.entries[entry['keyword']] = entry
+        except OSError:
+            pass
+        if self._import_legacy() or lines > 2 * len(self.entries) + 50:
+            self._rewrite()
+        return self.entries
+
+    def _import_legacy(self):
+        """Pull in stuck_keywords.txt lines ('keyword  # reason - timestamp') once
+
+        Runs only while the registry file does not exist yet. The text file is
+        tracked in git, so it is read and left in place.
+        """
+        if os.path.exists(self.path) or not os.path.exists(STUCK_KEYWORDS_FILE):
+            return False
+        imported = 0
         try:
             with open(STUCK_KEYWORDS_FILE, 'r', encoding='utf-8') as f:
                 for line in f:
-                    keyword = line.strip()
-                    if keyword and not keyword.startswith('#'):
-                        stuck.add(keyword)
-        except Exception as e:
-            print(f"{Colors.warning('⚠')} Error reading stuck keywords: {e}")
-    return stuck
+                    keyword, _, note = line.strip().partition('#')
+                    keyword = keyword.strip().lower()
+                    if not keyword or keyword in self.entries:
+                        continue
+                    reason, _, timestamp = note.strip().rpartition(' - ')
+                    try:
+                        failed_at = datetime.strptime(timestamp.strip(), "%Y-%m-%d %H:%M:%S")
+                    except ValueError:
+                        failed_at, reason = datetime.now(), note.strip()
+                    self.entries[keyword] = self._entry(keyword, 1, reason or "Stuck (legacy)", failed_at)
+                    imported += 1
+        except OSError as e:
+            print(f"{Colors.warning('⚠')} Could not import {STUCK_KEYWORDS_FILE}: {e}")
+            return False
+        print(f"{Colors.success('✓')} Imported {imported} stuck keywords from {STUCK_KEYWORDS_FILE} "
+              f"into {self.path}")
+        return True
+
+    def _rewrite(self):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for entry in self.entries.values():
+                    f.write(json.dumps(entry) + "\n")
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"{Colors.warning('⚠')} Error writing stuck registry: {e}")
+
+    def _append(self, entry):
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"{Colors.warning('⚠')} Error saving stuck keyword: {e}")
+
+    @staticmethod
+    def _entry(keyword, failures, reason, failed_at):
+        if failures >= STUCK_MAX_FAILURES:
+            retry_after = None
+        else:
+            delay = min(STUCK_BACKOFF_BASE * 2 ** (failures - 1), STUCK_BACKOFF_MAX)
+            retry_after = datetime.fromtimestamp(failed_at.timestamp() + delay).strftime("%Y-%m-%d %H:%M:%S")
+        return {
+            'keyword': keyword,
+            'failures': failures,
+            'reason': reason,
+            'last_failure': failed_at.strftime("%Y-%m-%d %H:%M:%S"),
+            'retry_after': retry_after,
+        }
+
+    def record(self, keyword, reason):
+        """Count one more failure and push the next retry out - returns the entry"""
+        keyword = keyword.strip().lower()
+        with self.lock:
+            previous = self._load().get(keyword)
+            entry = self._entry(keyword, (previous['failures'] if previous else 0) + 1, reason, datetime.now())
+            self.entries[keyword] = entry
+            self._append(entry)
+            return entry
+
+    def clear(self, keyword):
+        """Keyword completed - forget its failures"""
+        keyword = keyword.strip().lower()
+        with self.lock:
+            if self._load().pop(keyword, None) is not None:
+                self._append({'keyword': keyword, 'cleared': datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+    def failures(self, keyword):
+        with self.lock:
+            entry = self._load().get(keyword.strip().lower())
+            return entry['failures'] if entry else 0
+
+    def retry_at(self, keyword):
+        """Epoch seconds before which keyword should not be tried (inf = parked, 0 = ready)"""
+        if STUCK_IGNORE_BACKOFF:
+            return 0
+        with self.lock:
+            entry = self._load().get(keyword.strip().lower())
+        if entry is None:
+            return 0
+        if entry['retry_after'] is None:
+            return float('inf')
+        return datetime.strptime(entry['retry_after'], "%Y-%m-%d %H:%M:%S").timestamp()
+
+    def all(self):
+        with self.lock:
+            return dict(self._load())
+
+
+stuck_registry = StuckRegistry()
 
 
 def save_stuck_keyword(keyword, reason="Stuck during search"):
-    """Save a stuck keyword to the stuck keywords file"""
-    try:
-        # Read existing stuck keywords
-        existing = load_stuck_keywords()
-
-        # Add new keyword if not already there
-        if keyword not in existing:
-            with open(STUCK_KEYWORDS_FILE, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"{keyword}  # {reason} - {timestamp}\n")
-            return True
-    except Exception as e:
-        print(f"{Colors.warning('⚠')} Error saving stuck keyword: {e}")
+    """Record a stuck keyword - it is retried after an exponential backoff"""
+    entry = stuck_registry.record(keyword, reason)
+    when = f"retry after {entry['retry_after']}" if entry['retry_after'] else "parked"
+    print(f"   {Colors.warning('⚠')} '{keyword}' failure #{entry['failures']} - {when}")
+    return True
+
+
+def requeue_stuck(retry_queue, keyword):
+    """Schedule an in-run retry once keyword's backoff is over - never when it is parked or already due"""
+    due = stuck_registry.retry_at(keyword)
+    if time.time() < due < float('inf'):
+        heapq.heappush(retry_queue, (due, keyword))
+        return True
     return False
 
 # ========================
-# CHROME DRIVER SETUP
+# RESULTS STORE (CSV / SQLITE)
 # ========================
 
 
-def setup_chrome_driver():
-    """Set up undetected Chrome driver with crash protection"""
-    options = uc.ChromeOptions()
-    options.add_argument(
-        f"--user-data-dir=/Users/mac/Library/Application Support/Google/Chrome")
-    options.add_argument(f"--profile-directory={CHROME_PROFILE}")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--disable-logging")
-    options.add_argument("--log-level=3")
-    options.page_load_strategy = 'eager'
+def item_id_from_url(url):
+    """Extract the numeric eBay item ID from an /itm/ URL"""
+    return url.rstrip('/').split('/')[-1].split('?')[0]
 
-    try:
-        driver = uc.Chrome(options=options, version_main=128,
-                           driver_executable_path=None, use_subprocess=True)
-        driver.implicitly_wait(1.5)
-        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
 
-        try:
-            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": driver.execute_script("return navigator.userAgent").replace('Headless', '')
-            })
-            driver.execute_script(
-                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        except:
-            pass
+class CsvResultsStore:
+    """Default store - appends to OUTPUT_FILE and tails it via the resume index"""
 
-        watchdog.activity()
-        return driver
-    except Exception as e:
-        print(f"{Colors.error('✗')} Driver setup failed: {e}")
-        raise
+    name = "csv"
 
+    def __init__(self):
+        self.index = resume_index
+        self.stopped = None
+        self.decisions_lock = threading.Lock()
 
-def restart_browser_safe(driver):
-    """Safely restart the browser with better error handling"""
-    print("\n" + "="*70)
-    print("💫 RESTARTING BROWSER (stuck prevention)")
-    print("="*70)
+    def setup(self):
+        return setup_csv()
 
-    print(f"   {Colors.CYAN}→{Colors.RESET} Closing current browser instance...",
-          end="", flush=True)
-    try:
-        driver.quit()
-        time.sleep(0.3)
-        print(f" {Colors.success('✓')}")
-    except:
-        print(f" {Colors.warning('⚠')} (already closed)")
+    def load_index(self):
+        return get_processed_keywords()
 
-    print(f"   {Colors.CYAN}→{Colors.RESET} Waiting for cleanup...",
-          end="", flush=True)
-    time.sleep(1.5)
-    print(f" {Colors.success('✓')}")
+    def refresh(self):
+        self.index.refresh()
 
-    for attempt in range(3):
+    def save(self, result):
+        return save_to_csv(result)
+
+    def record_decision(self, keyword, decision, products, good, llr):
+        entry = keyword_decision_entry(keyword, decision, products, good, llr)
+        with self.decisions_lock:
+            self.stopped_keywords()
+            try:
+                with open(KEYWORD_DECISIONS_FILE, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"{Colors.warning('⚠')} Could not record keyword decision: {e}")
+            if decision == 'stopped':
+                self.stopped.add(entry['keyword'])
+            else:
+                self.stopped.discard(entry['keyword'])
+
+    def stopped_keywords(self):
+        """Keywords whose latest decision is an early stop - read once, then kept in memory"""
+        if self.stopped is None:
+            decisions = {}
+            try:
+                with open(KEYWORD_DECISIONS_FILE, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        decisions[entry['keyword']] = entry['decision']
+            except OSError:
+                pass
+            self.stopped = {kw for kw, decision in decisions.items() if decision == 'stopped'}
+        return self.stopped
+
+    def keyword_yields(self):
+        """{keyword: (products checked, winners)} - counted while the resume index reads the CSV"""
+        self.index.refresh()
+        with self.index.lock:
+            return dict(self.index.yields)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteResultsStore:
+    """SQLite results store - WAL mode, rows keyed by item ID, batched commits
+
+    Several scraper processes can point at the same database: WAL lets readers
+    run alongside the writer and commits are short because rows are buffered
+    in memory and written with one executemany per batch.
+    """
+
+    name = "sqlite"
+    INSERT_SQL = ("INSERT OR IGNORE INTO results (item_id, keyword, keyword_raw, url, price, sales_window, "
+                  "window_sales, sales_histogram, date_checked, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+    def __init__(self, path=RESULTS_DB_FILE, batch_size=DB_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = None
+        self.lock = threading.RLock()
+        self.pending = []
+        self.pending_since = None
+        self.queued = {}  # keyword -> {item_id: url} handed to the writer thread, not buffered yet
+        self.index = self
+
+    def setup(self):
         try:
-            print(
-                f"   {Colors.CYAN}→{Colors.RESET} Starting new browser (attempt {attempt+1}/3)...", end="", flush=True)
-            new_driver = setup_chrome_driver()
-            print(f" {Colors.success('✓')}")
-            print(f"   {Colors.GREEN}✓ Browser restart successful!{Colors.RESET}")
-            print("="*70 + "\n")
-            watchdog.reset()
-            return new_driver
+            self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA busy_timeout=30000")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    item_id TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    keyword_raw TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    price TEXT,
+                    sales_window TEXT,
+                    window_sales INTEGER,
+                    sales_histogram TEXT,
+                    date_checked TEXT,
+                    status TEXT
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_results_keyword_item ON results(keyword, item_id);
+                CREATE INDEX IF NOT EXISTS idx_results_item ON results(item_id);
+                CREATE TABLE IF NOT EXISTS keyword_decisions (
+                    keyword TEXT PRIMARY KEY,
+                    decision TEXT NOT NULL,
+                    products INTEGER,
+                    good INTEGER,
+                    llr REAL,
+                    decided_at TEXT
+                );
+            """)
+            self._migrate_legacy()
+            self.conn.commit()
+            print(f"{Colors.success('✓')} Using SQLite store: {self.path} (WAL)")
+            return True
         except Exception as e:
-            print(f" {Colors.error('✗')} FAILED")
-            if attempt < 2:
-                print(
-                    f"   {Colors.CYAN}→{Colors.RESET} Retrying in 2 seconds...")
-                time.sleep(2)
-            else:
-                print(
-                    f"   {Colors.RED}✗ CRITICAL: Browser restart failed after 3 attempts{Colors.RESET}")
-                print("="*70 + "\n")
-                raise Exception("Browser restart failed permanently")
+            print(f"{Colors.error('✗')} ERROR opening SQLite store: {e}")
+            return False
 
+    def _migrate_legacy(self):
+        """Databases from the January/February 2026 schema get the window columns, filled in"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        if 'jan_sales' not in columns or 'sales_window' in columns:
+            return
+        for column in ("sales_window TEXT", "window_sales INTEGER", "sales_histogram TEXT"):
+            self.conn.execute(f"ALTER TABLE results ADD COLUMN {column}")
+        first, last = LEGACY_WINDOW
+        self.conn.execute(
+            "UPDATE results SET sales_window = ?, "
+            "window_sales = COALESCE(jan_sales, 0) + COALESCE(feb_sales, 0), "
+            "sales_histogram = ? || ':' || COALESCE(jan_sales, 0) || ' ' || ? || ':' || COALESCE(feb_sales, 0)",
+            (window_label(LEGACY_WINDOW), first, last))
+        print(f"{Colors.success('✓')} Migrated {self.path} to the sales-window schema")
+
+    def load_index(self):
+        with self.lock:
+            products, keywords = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT keyword) FROM results").fetchone()
+        print(f"{Colors.success('✓')} Loaded {products} processed products from {self.path}")
+        if keywords:
+            print(f"   {Colors.CYAN}→{Colors.RESET} Processed keywords: {keywords}")
+        return self
+
+    def refresh(self):
+        # Queries always see rows committed by other processes
+        self.flush_if_stale()
 
-def is_driver_alive(driver):
-    """Quick driver health check"""
+    @staticmethod
+    def _row(result):
+        return (
+            item_id_from_url(result['url']),
+            result['keyword'].strip().lower(),
+            result['keyword'],
+            result['url'],
+            result['price'],
+            result['window'],
+            result['window_sales'],
+            format_histogram(result['sales']),
+            result['date_checked'],
+            result.get('status', 'Success'),
+        )
+
+    def save(self, result):
+        try:
+            with self.lock:
+                row = self._row(result)
+                self.pending.append(row)
+                self.queued.get(row[1], {}).pop(row[0], None)
+                if self.pending_since is None:
+                    self.pending_since = time.time()
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+                else:
+                    self.flush_if_stale()
+            watchdog.activity()
+            return True
+        except Exception as e:
+            print(f"{Colors.error('✗')} Save error: {e}")
+            return False
+
+    def flush_if_stale(self):
+        with self.lock:
+            if self.pending_since is not None and time.time() - self.pending_since >= DB_FLUSH_SECONDS:
+                self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.pending or self.conn is None:
+                return
+            with self.conn:
+                self.conn.executemany(self.INSERT_SQL, self.pending)
+            self.pending = []
+            self.pending_since = None
+
+    def close(self):
+        with self.lock:
+            if self.conn is None:
+                return
+            self.flush()
+            self.conn.close()
+            self.conn = None
+
+    # Resume index interface - indexed queries plus the unflushed buffer
+
+    def _pending_urls(self, keyword):
+        return {row[3] for row in self.pending if row[1] == keyword} | set(self.queued.get(keyword, {}).values())
+
+    def record(self, keyword, url):
+        """Count a row queued for the writer thread right away - dedup and progress see it at once"""
+        keyword = keyword.strip().lower()
+        with self.lock:
+            self.queued.setdefault(keyword, {})[item_id_from_url(url)] = url
+
+    def get(self, keyword, default=None):
+        keyword = keyword.strip().lower()
+        with self.lock:
+            urls = {row[0] for row in self.conn.execute(
+                "SELECT url FROM results WHERE keyword = ?", (keyword,))}
+            urls |= self._pending_urls(keyword)
+        return urls if urls else default
+
+    def progress(self, keyword):
+        keyword = keyword.strip().lower()
+        with self.lock:
+            pending = {row[0] for row in self.pending if row[1] == keyword} | set(self.queued.get(keyword, ()))
+            # Stored rows plus buffered ones not stored yet - one grouped query
+            placeholders = ", ".join("?" * len(pending)) or "NULL"
+            stored, overlap = self.conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(item_id IN ({placeholders})), 0) FROM results WHERE keyword = ?",
+                (*pending, keyword)).fetchone()
+        return stored + len(pending) - overlap
+
+    def completed(self, min_products):
+        self.flush()
+        with self.lock:
+            return {row[0] for row in self.conn.execute(
+                "SELECT keyword FROM results GROUP BY keyword HAVING COUNT(*) >= ?",
+                (min_products,))}
+
+    def record_decision(self, keyword, decision, products, good, llr):
+        entry = keyword_decision_entry(keyword, decision, products, good, llr)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO keyword_decisions (keyword, decision, products, good, llr, decided_at) "
+                "VALUES (:keyword, :decision, :products, :good, :llr, :decided_at)", entry)
+
+    def stopped_keywords(self):
+        with self.lock:
+            return {row[0] for row in self.conn.execute(
+                "SELECT keyword FROM keyword_decisions WHERE decision = 'stopped'")}
+
+    def keyword_yields(self):
+        """{keyword: (products checked, winners)} - one grouped query"""
+        self.flush()
+        with self.lock:
+            return {row[0]: (row[1], row[2] or 0) for row in self.conn.execute(
+                "SELECT keyword, COUNT(*), SUM(window_sales >= ?) FROM results GROUP BY keyword",
+                (WINNER_THRESHOLD,))}
+
+    def has_item(self, keyword, item_id):
+        keyword = keyword.strip().lower()
+        with self.lock:
+            if any(row[0] == item_id and row[1] == keyword for row in self.pending):
+                return True
+            if item_id in self.queued.get(keyword, ()):
+                return True
+            return self.conn.execute(
+                "SELECT 1 FROM results WHERE keyword = ? AND item_id = ?",
+                (keyword, item_id)).fetchone() is not None
+
+    def import_csv(self, csv_path):
+        """Import an existing results CSV (duplicates are ignored)"""
+        imported = 0
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            known = CSV_HEADERS + LEGACY_CSV_HEADERS
+            cols = {name: header.index(name) for name in known if name in header}
+            if 'Keyword' not in cols or 'Product URL' not in cols:
+                cols = {name: i for i, name in enumerate(CSV_HEADERS)}
+
+            def field(row, name, default=''):
+                idx = cols.get(name)
+                return row[idx] if idx is not None and idx < len(row) else default
+
+            with self.lock:
+                batch = []
+                for row in reader:
+                    keyword = field(row, 'Keyword').strip()
+                    url = field(row, 'Product URL').strip()
+                    if not keyword or not url:
+                        continue
+                    if 'Sales Window' in cols:
+                        history = {'window': field(row, 'Sales Window'),
+                                   'sales': parse_histogram(field(row, 'Sales Histogram'))}
+                    else:
+                        history = legacy_history(field(row, 'January 2026 Sales', 0),
+                                                 field(row, 'February 2026 Sales', 0))
+                    batch.append(self._row(build_result(
+                        keyword, url, field(row, 'Price'), history,
+                        field(row, 'Status', 'Success') or 'Success', field(row, 'Date Checked'))))
+                    if len(batch) >= 5000:
+                        imported += self._insert_many(batch)
+                        batch = []
+                imported += self._insert_many(batch)
+        return imported
+
+    def _insert_many(self, rows):
+        if not rows:
+            return 0
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(self.INSERT_SQL, rows)
+            return self.conn.total_changes - before
+
+    def export_csv(self, csv_path):
+        """Export all rows back to the CSV schema used by OUTPUT_FILE"""
+        self.flush()
+        exported = 0
+        with self.lock, open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADERS)
+            for row in self.conn.execute(
+                    "SELECT keyword_raw, url, price, sales_window, window_sales, sales_histogram, "
+                    "date_checked, status FROM results ORDER BY rowid"):
+                writer.writerow(row)
+                exported += 1
+        return exported
+
+
+def keyword_decision_entry(keyword, decision, products, good, llr):
+    return {
+        'keyword': keyword.strip().lower(),
+        'decision': decision,
+        'products': products,
+        'good': good,
+        'llr': round(llr, 3),
+        'decided_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _to_int(value):
     try:
-        _ = driver.current_url
-        watchdog.activity()
-        return True
-    except:
-        return False
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def open_results_store(backend=None):
+    """Create the results store selected by RESULTS_BACKEND"""
+    backend = backend or RESULTS_BACKEND
+    if backend == "sqlite":
+        return SqliteResultsStore()
+    if backend == "csv":
+        return CsvResultsStore()
+    raise ValueError(f"Unknown results backend: {backend}")
+
+
+results_store = CsvResultsStore()
 
 # ========================
-# EBAY SEARCH & FILTER - ANTI-STUCK
+# KEYWORD SCHEDULER
 # ========================
 
+SCHEDULE_STOPWORDS = {'and', 'for', 'the', 'with', 'set', 'new', 'pack', 'pcs', 'lot'}
+
+
+def keyword_tokens(keyword):
+    return {token for token in re.findall(r'[a-z0-9]+', keyword.lower())
+            if len(token) > 2 and token not in SCHEDULE_STOPWORDS}
+
+
+class YieldScheduler:
+    """Orders pending keywords by expected winner yield
+
+    Every token of a scraped keyword collects that keyword's products and
+    WINNER_THRESHOLD hits. A pending keyword's estimate pools the counts of its
+    tokens and shrinks them toward the overall hit rate with
+    SCHEDULE_PRIOR_WEIGHT pseudo-products. Every 1/SCHEDULE_EXPLORE-th slot goes
+    to a keyword with too little evidence, in file order, so the estimates keep
+    learning about keywords they know nothing of.
+    """
+
+    def __init__(self, yields):
+        self.token_products = {}
+        self.token_winners = {}
+        products = winners = 0
+        for keyword, (checked, won) in yields.items():
+            products += checked
+            winners += won
+            for token in keyword_tokens(keyword):
+                self.token_products[token] = self.token_products.get(token, 0) + checked
+                self.token_winners[token] = self.token_winners.get(token, 0) + won
+        self.base_rate = winners / products if products else 0.0
+
+    def evidence(self, keyword):
+        return sum(self.token_products.get(token, 0) for token in keyword_tokens(keyword))
+
+    def estimate(self, keyword):
+        """Expected share of a keyword's products that are winners"""
+        tokens = keyword_tokens(keyword)
+        products = sum(self.token_products.get(token, 0) for token in tokens)
+        winners = sum(self.token_winners.get(token, 0) for token in tokens)
+        return (winners + SCHEDULE_PRIOR_WEIGHT * self.base_rate) / (products + SCHEDULE_PRIOR_WEIGHT)
+
+    def order(self, keywords):
+        ranked = deque(sorted(keywords, key=self.estimate, reverse=True))
+        unknown = deque(kw for kw in keywords if self.evidence(kw) < SCHEDULE_MIN_EVIDENCE)
+        every = round(1 / SCHEDULE_EXPLORE) if SCHEDULE_EXPLORE > 0 else 0
+        scheduled, ordered = set(), []
+        while ranked or unknown:
+            source = unknown if unknown and every and (len(ordered) + 1) % every == 0 else ranked
+            if not source:
+                source = unknown
+            keyword = source.popleft()
+            if keyword not in scheduled:
+                scheduled.add(keyword)
+                ordered.append(keyword)
+        return ordered
+
+
+def schedule_keywords(keywords, store):
+    """Reorder keywords for this run according to KEYWORD_SCHEDULE"""
+    if KEYWORD_SCHEDULE != "yield" or len(keywords) < 2:
+        return keywords, None
+    scheduler = YieldScheduler(store.keyword_yields())
+    if not scheduler.token_products:
+        print(f"   {Colors.CYAN}→{Colors.RESET} No scraped history yet - keeping file order")
+        return keywords, None
+    ordered = scheduler.order(keywords)
+    known = sum(1 for kw in keywords if scheduler.evidence(kw) >= SCHEDULE_MIN_EVIDENCE)
+    print(f"   {Colors.CYAN}→{Colors.RESET} Ranked by expected winner yield "
+          f"(base rate {scheduler.base_rate:.1%}, {known}/{len(keywords)} keywords with history, "
+          f"{SCHEDULE_EXPLORE:.0%} exploration)")
+    return ordered, scheduler
 
-def apply_price_filter(driver):
-    """Apply minimum price filter ($8) with anti-stuck protection"""
-    try:
-        watchdog.activity()
-        start_time = time.time()
-        max_attempt_time = 10
-        
-        print(f"   {Colors.CYAN}→{Colors.RESET} Applying price filter (min $8)...", end="", flush=True)
-        
+# ========================
+# KEYWORD CLUSTERS
+# ========================
+
+CLUSTER_STOPWORDS = {'a', 'an', 'and', 'the', 'for', 'with', 'of', 'in', 'on', 'to', '&'}
+
+
+def normalize_token(token):
+    """Crude singular form - enough to match 'hooks'/'hook' and 'batteries'/'battery'"""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 4 and token.endswith(('ches', 'shes', 'sses', 'xes', 'zes')):
+        return token[:-2]
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def keyword_signature(keyword):
+    """Order-free normalized token set - plurals, word order and 'X for Y' forms collapse"""
+    return frozenset(normalize_token(token) for token in re.findall(r'[a-z0-9&]+', keyword.lower())
+                     if token not in CLUSTER_STOPWORDS)
+
+
+class KeywordClusters:
+    """Groups near-duplicate keywords so a cluster pays for one search
+
+    The first member processed searches under its own keyword and publishes
+    each results page it loads; the other members take their candidates from
+    those pages and get already-checked items from the item cache.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cluster_of = {}  # keyword -> representative keyword
+        self.sizes = {}
+        self.source = {}  # representative -> keyword whose search feeds the cluster
+        self.pages = {}  # (representative, page) -> records
+        self.searches_saved = 0
+
+    def build(self, keywords):
+        """Greedy single pass - a keyword joins the first cluster it is similar enough to"""
+        self.cluster_of.clear()
+        self.sizes.clear()
+        representatives = []  # (signature, keyword)
+        by_token = {}
+        for keyword in keywords:
+            signature = keyword_signature(keyword)
+            candidates = {index for token in signature for index in by_token.get(token, ())}
+            match = None
+            for index in sorted(candidates):
+                other, representative = representatives[index]
+                union = len(signature | other)
+                if union and len(signature & other) / union >= CLUSTER_SIMILARITY:
+                    match = representative
+                    break
+            if match is None:
+                match = keyword.lower()
+                for token in signature:
+                    by_token.setdefault(token, []).append(len(representatives))
+                representatives.append((signature, match))
+            self.cluster_of[keyword.lower()] = match
+            self.sizes[match] = self.sizes.get(match, 0) + 1
+        return len(representatives)
+
+    def _cluster(self, keyword):
+        cluster = self.cluster_of.get(keyword.strip().lower())
+        return cluster if cluster and self.sizes.get(cluster, 0) > 1 else None
+
+    def members(self, keyword):
+        cluster = self._cluster(keyword)
+        return [kw for kw, rep in self.cluster_of.items() if rep == cluster] if cluster else [keyword.lower()]
+
+    def search_keyword(self, keyword):
+        """Keyword to load further result pages under - the one that searched first"""
+        cluster = self._cluster(keyword)
+        with self.lock:
+            return self.source.get(cluster, keyword) if cluster else keyword
+
+    def get(self, keyword, page=1):
+        """Records another member already loaded for this page, or None"""
+        if not KEYWORD_CLUSTERS:
+            return None
+        cluster = self._cluster(keyword)
+        with self.lock:
+            records = self.pages.get((cluster, page)) if cluster else None
+            if records is not None and page == 1:
+                self.searches_saved += 1
+            return records
+
+    def put(self, keyword, page, records):
+        cluster = self._cluster(keyword) if KEYWORD_CLUSTERS else None
+        if not cluster or not records:
+            return
+        with self.lock:
+            self.source.setdefault(cluster, keyword)
+            self.pages.setdefault((cluster, page), records)
+
+    def summary(self):
+        if not self.searches_saved:
+            return None
+        return f"{self.searches_saved} searches served from a near-duplicate keyword's results"
+
+
+keyword_clusters = KeywordClusters()
+
+
+def cluster_keywords(keywords):
+    """Build the clusters for this run and report how many searches they can save"""
+    if not KEYWORD_CLUSTERS or len(keywords) < 2:
+        return
+    clusters = keyword_clusters.build(keywords)
+    saved = len(keywords) - clusters
+    if not saved:
+        return
+    print(f"   {Colors.CYAN}→{Colors.RESET} {len(keywords)} keywords form {clusters} search clusters "
+          f"- up to {saved} searches saved")
+    largest = sorted((size, rep) for rep, size in keyword_clusters.sizes.items() if size > 1)[-3:]
+    for size, representative in reversed(largest):
+        print(f"      {size}× {', '.join(keyword_clusters.members(representative)[:4])}")
+
+# ========================
+# RESOURCE BLOCKING (CDP)
+# ========================
+
+AD_TRACKER_PATTERNS = [
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*googletagservices.com*",
+    "*amazon-adsystem.com*", "*adnxs.com*", "*criteo.com*", "*criteo.net*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*moatads.com*", "*taboola.com*",
+    "*outbrain.com*", "*facebook.net*", "*connect.facebook.com*", "*bat.bing.com*",
+]
+# Trailing * so versioned URLs (".woff2?v=3", ".jpg?set_id=...") still match
+FONT_MEDIA_PATTERNS = [
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*",
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*",
+]
+IMAGE_PATTERNS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+]
+
+# extension-safe leaves scripts, XHR, CSS and anything the sold-history extension
+# loads untouched - only ads, fonts, media and eBay's listing photos are dropped.
+# minimal also drops every image on any host.
+BLOCKING_PRESETS = {
+    "off": [],
+    "extension-safe": AD_TRACKER_PATTERNS + FONT_MEDIA_PATTERNS + ["*i.ebayimg.com/*"],
+    "minimal": AD_TRACKER_PATTERNS + FONT_MEDIA_PATTERNS + ["*i.ebayimg.com/*"] + IMAGE_PATTERNS,
+}
+
+# Fallback sizes (bytes) for blocked resource types we have not seen load yet
+TYPICAL_RESOURCE_BYTES = {
+    "Image": 35000, "Font": 40000, "Media": 400000, "Script": 50000,
+    "XHR": 4000, "Fetch": 4000, "Stylesheet": 20000, "Document": 60000, "Other": 5000,
+}
+
+
+class ResourceBlocker:
+    """Blocks URL patterns via CDP and counts requests/bytes saved per page
+
+    Savings come from the Chrome performance log. Every request is tied to the
+    page that issued it through Network.requestWillBeSent's documentURL, so a
+    prefetched tab's blocks are counted on its own page. Blocked requests come
+    from Network.loadingFailed events; their bytes never load, so they are
+    estimated from the running average size of that resource type.
+    """
+
+    def __init__(self, preset=None):
+        self.preset = preset
+        self.lock = threading.Lock()
+        self.avg_bytes = {}  # resource type -> (total bytes, count)
+        self.request_pages = {}  # requestId -> documentURL, until it finishes
+        self.pages = 0
+        self.blocked = 0
+        self.bytes_saved = 0
+        self.bytes_loaded = 0
+
+    @property
+    def patterns(self):
+        return BLOCKING_PRESETS[self.preset or RESOURCE_BLOCKING]
+
+    @property
+    def enabled(self):
+        return bool(self.patterns)
+
+    def configure_options(self, options):
+        if self.enabled:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def apply(self, driver):
+        if not self.enabled:
+            return
+        hub = getattr(driver, 'ebh_events', None)
+        if hub is not None:
+            # uc's event reactor drains the performance log - take events from it instead
+            driver.ebh_network_events = deque(maxlen=50000)
+            hub.subscribe('*', driver.ebh_network_events.append)
+        try:
+            self.block(driver)
+        except Exception as e:
+            print(f"{Colors.warning('⚠')} Resource blocking unavailable: {e}")
+
+    def block(self, driver):
+        """Send the block list to the current tab - Network settings are per target, so every new tab needs it"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+
+    def _estimate(self, resource_type):
+        total, count = self.avg_bytes.get(resource_type, (0, 0))
+        if count:
+            return total // count
+        return TYPICAL_RESOURCE_BYTES.get(resource_type, TYPICAL_RESOURCE_BYTES["Other"])
+
+    def collect(self, driver):
+        """Drain the performance log and return one counter per page seen since the last call
+
+        Each counter is {'url', 'blocked', 'bytes_saved', 'bytes_loaded'}, in the
+        order the pages first appeared.
+        """
+        if not self.enabled:
+            return []
+        pages = {}
+        types = {}
+        with self.lock:
+            for message in self._drain(driver):
+                method = message.get('method')
+                params = message.get('params', {})
+                request_id = params.get('requestId')
+                if method == 'Network.requestWillBeSent':
+                    self.request_pages[request_id] = params.get('documentURL') or ''
+                    continue
+                if method == 'Network.responseReceived':
+                    types[request_id] = params.get('type', 'Other')
+                    continue
+                if method not in ('Network.loadingFinished', 'Network.loadingFailed'):
+                    continue
+                url = self.request_pages.pop(request_id, '')
+                page = pages.setdefault(url, {'url': url, 'blocked': 0, 'bytes_saved': 0, 'bytes_loaded': 0})
+                if method == 'Network.loadingFinished':
+                    size = int(params.get('encodedDataLength') or 0)
+                    page['bytes_loaded'] += size
+                    resource_type = types.get(request_id)
+                    if resource_type and size:
+                        total, count = self.avg_bytes.get(resource_type, (0, 0))
+                        self.avg_bytes[resource_type] = (total + size, count + 1)
+                elif params.get('blockedReason'):
+                    page['blocked'] += 1
+                    page['bytes_saved'] += self._estimate(params.get('type', 'Other'))
+
+            if len(self.request_pages) > 50000:
+                self.request_pages.clear()
+            for page in pages.values():
+                self.pages += 1
+                self.blocked += page['blocked']
+                self.bytes_saved += page['bytes_saved']
+                self.bytes_loaded += page['bytes_loaded']
+        return list(pages.values())
+
+    @staticmethod
+    def report(pages):
+        """Print one line per page that had requests blocked"""
+        for page in pages:
+            if page['blocked']:
+                print(f"      {Colors.CYAN}→{Colors.RESET} Blocked {page['blocked']} requests "
+                      f"(~{page['bytes_saved'] // 1024} KB saved) on {page['url'][:80] or 'page'}")
+
+    @staticmethod
+    def _drain(driver):
+        """CDP event messages since the last call, from the hub buffer or the performance log"""
+        buffered = getattr(driver, 'ebh_network_events', None)
+        if buffered is not None:
+            while buffered:
+                yield buffered.popleft()
+            return
+        try:
+            entries = driver.get_log('performance')
+        except Exception:
+            return
+        for entry in entries:
+            try:
+                yield json.loads(entry['message'])['message']
+            except (KeyError, ValueError, TypeError):
+                continue
+
+    def summary(self):
+        if not self.enabled or not self.pages:
+            return None
+        return (f"{self.blocked} requests blocked, ~{self.bytes_saved / 1048576:.1f} MB saved "
+                f"({self.bytes_loaded / 1048576:.1f} MB loaded) over {self.pages} pages")
+
+
+resource_blocker = ResourceBlocker()
+
+# ========================
+# CDP EVENTS
+# ========================
+
+
+class CdpEventHub:
+    """Fans out the CDP event stream of an undetected-chromedriver instance
+
+    uc delivers every event to a single '*' listener (fed from the performance
+    log), so consumers subscribe here instead of reading the log themselves.
+    """
+
+    def __init__(self, driver):
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        self.seen_methods = set()
+        driver.add_cdp_listener('*', self._dispatch)
+
+    def subscribe(self, method, callback):
+        with self.lock:
+            self.subscribers.setdefault(method, []).append(callback)
+
+    def unsubscribe(self, method, callback):
+        with self.lock:
+            callbacks = self.subscribers.get(method, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def _dispatch(self, message):
+        method = message.get('method')
+        with self.lock:
+            self.seen_methods.add(method)
+            callbacks = self.subscribers.get(method, []) + self.subscribers.get('*', [])
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:
+                pass
+
+
+class TargetWatch:
+    """Collects Target.targetCreated events for page targets while armed"""
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.created = queue.Queue()
+        hub.subscribe('Target.targetCreated', self._on_created)
+
+    def _on_created(self, message):
+        info = message.get('params', {}).get('targetInfo', {})
+        if info.get('type') == 'page':
+            self.created.put(info.get('targetId'))
+
+    def wait(self, known_handles, timeout):
+        """First new page target not in known_handles (ChromeDriver handles are target IDs)"""
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                target_id = self.created.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if target_id and target_id not in known_handles:
+                return target_id
+
+    def close(self):
+        self.hub.unsubscribe('Target.targetCreated', self._on_created)
+
+# ========================
+# CHROME DRIVER SETUP
+# ========================
+
+
+_launch_lock = threading.Lock()  # undetected-chromedriver patches its binary on launch
+restart_latencies = []  # (kind, seconds) for every browser restart
+
+
+def setup_chrome_driver(user_data_dir=None):
+    """Set up undetected Chrome driver with crash protection"""
+    user_data_dir = user_data_dir or CHROME_USER_DATA_DIR
+    options = uc.ChromeOptions()
+    options.add_argument(
+        f"--user-data-dir={user_data_dir}")
+    options.add_argument(f"--profile-directory={CHROME_PROFILE}")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--disable-popup-blocking")
+    options.add_argument("--disable-logging")
+    options.add_argument("--log-level=3")
+    options.page_load_strategy = 'eager'
+    resource_blocker.configure_options(options)
+
+    try:
+        with _launch_lock:
+            driver = uc.Chrome(options=options, version_main=128,
+                               driver_executable_path=None, use_subprocess=True,
+                               enable_cdp_events=HISTORY_TAB_MODE == "persistent")
+        track_commands(driver)
+        driver.ebh_user_data_dir = user_data_dir
+        driver.ebh_events = None
+        driver.ebh_history_handle = None
+        # selector_engine probes in one script call, which the implicit wait does not touch
+        driver.implicitly_wait(1.5)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(MAX_STUCK_TIME)
+
+        try:
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                "userAgent": driver.execute_script("return navigator.userAgent").replace('Headless', '')
+            })
+            driver.execute_script(
+                "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        except:
+            pass
+
+        if getattr(driver, 'reactor', None):
+            try:
+                driver.ebh_events = CdpEventHub(driver)
+                driver.execute_cdp_cmd('Target.setDiscoverTargets', {'discover': True})
+            except Exception:
+                pass
+
+        resource_blocker.apply(driver)
+
+        watchdog.activity()
+        return driver
+    except Exception as e:
+        print(f"{Colors.error('✗')} Driver setup failed: {e}")
+        raise
+
+
+# The header greets signed-out visitors with a "Sign in" link (signed-in ones get "Sign out")
+JS_SIGNED_OUT = """
+const header = document.querySelector('#gh, header');
+if (!header) return null;
+return [...header.querySelectorAll('a')].some(a => /^\\s*sign in\\s*$/i.test(a.textContent));
+"""
+
+
+def is_logged_in(driver):
+    """Load the eBay home page and read the header - None when it cannot tell"""
+    try:
+        driver.get(EBAY_BASE_URL)
+        signed_out = driver.execute_script(JS_SIGNED_OUT)
+    except Exception:
+        return None
+    return None if signed_out is None else not signed_out
+
+
+class BrowserStandby:
+    """A browser launched in the background so a restart is a pointer swap
+
+    The standby runs on its own user-data-dir (Chrome locks the profile). On a
+    swap the old browser is torn down in the background and the next standby
+    is launched on the old profile directory once it is free. A standby that
+    comes up signed out of eBay is not swapped in.
+    """
+
+    def __init__(self, profile_dirs):
+        self.profile_dirs = profile_dirs  # The two user-data-dirs active/standby alternate on
+        self.driver = None
+        self.thread = None
+        self.error = None
+
+    def other_profile(self, user_data_dir):
+        first, second = self.profile_dirs
+        return second if os.path.abspath(user_data_dir) == os.path.abspath(first) else first
+
+    def launch(self, user_data_dir, after=None):
+        """Start a standby on user_data_dir, optionally after another thread finishes"""
+        def run():
+            if after is not None:
+                after.join()
+            try:
+                driver = setup_chrome_driver(user_data_dir)
+                driver.ebh_logged_in = is_logged_in(driver)
+                self.driver = driver
+            except Exception as e:
+                self.error = e
+
+        self.driver = None
+        self.error = None
+        self.thread = threading.Thread(target=run, name="standby-launch", daemon=True)
+        self.thread.start()
+
+    def take(self, timeout=STANDBY_WAIT):
+        """Hand over the standby browser, or None if it is not ready"""
+        if self.thread is None:
+            return None
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            return None
+        driver, self.driver, self.thread = self.driver, None, None
+        return driver
+
+    def close(self):
+        driver = self.take(timeout=STANDBY_WAIT)
+        if driver is not None:
+            _quit_quietly(driver)
+
+
+def _quit_quietly(driver):
+    close_engine(driver)
+    try:
+        driver.quit()
+    except:
+        pass
+
+
+def restart_browser_safe(driver, user_data_dir=None, standby=None):
+    """Safely restart the browser with better error handling"""
+    print("\n" + "="*70)
+    print("💫 RESTARTING BROWSER (stuck prevention)")
+    print("="*70)
+
+    restart_start = time.time()
+    user_data_dir = getattr(driver, 'ebh_user_data_dir', None) or user_data_dir
+    logged_out = False
+
+    if standby is not None:
+        print(f"   {Colors.CYAN}→{Colors.RESET} Swapping in warm standby browser...",
+              end="", flush=True)
+        new_driver = standby.take()
+        logged_out = new_driver is not None and getattr(new_driver, 'ebh_logged_in', None) is False
+        if new_driver is not None and not logged_out and is_driver_alive(new_driver):
+            # Old browser goes away in the background; its profile hosts the next standby
+            teardown = threading.Thread(target=_quit_quietly, args=(driver,),
+                                        name="browser-teardown", daemon=True)
+            teardown.start()
+            standby.launch(user_data_dir, after=teardown)
+
+            elapsed = time.time() - restart_start
+            restart_latencies.append(('warm', elapsed))
+            print(f" {Colors.success('✓')} ({elapsed:.2f}s)")
+            print(f"   {Colors.GREEN}✓ Browser restart successful!{Colors.RESET}")
+            print("="*70 + "\n")
+            watchdog.reset()
+            return new_driver
+
+        if new_driver is not None:
+            _quit_quietly(new_driver)
+        if logged_out:
+            print(f" {Colors.warning('⚠')} (standby is signed out of eBay - cold restart)")
+        else:
+            print(f" {Colors.warning('⚠')} (not ready - cold restart)")
+
+    print(f"   {Colors.CYAN}→{Colors.RESET} Closing current browser instance...",
+          end="", flush=True)
+    try:
+        close_engine(driver)
+        driver.quit()
+        time.sleep(0.3)
+        print(f" {Colors.success('✓')}")
+    except:
+        print(f" {Colors.warning('⚠')} (already closed)")
+
+    print(f"   {Colors.CYAN}→{Colors.RESET} Waiting for cleanup...",
+          end="", flush=True)
+    time.sleep(1.5)
+    print(f" {Colors.success('✓')}")
+
+    if logged_out:
+        # Both browsers are closed - refresh the standby's copy from the signed-in profile
+        standby_dir = standby.other_profile(user_data_dir)
+        print(f"   {Colors.CYAN}→{Colors.RESET} Refreshing standby profile...", end="", flush=True)
+        try:
+            copy_profile(user_data_dir, standby_dir)
+            print(f" {Colors.success('✓')}")
+        except Exception as e:
+            print(f" {Colors.warning('⚠')} ({e})")
+
+    for attempt in range(3):
+        try:
+            print(
+                f"   {Colors.CYAN}→{Colors.RESET} Starting new browser (attempt {attempt+1}/3)...", end="", flush=True)
+            new_driver = setup_chrome_driver(user_data_dir)
+            elapsed = time.time() - restart_start
+            restart_latencies.append(('cold', elapsed))
+            print(f" {Colors.success('✓')} ({elapsed:.1f}s)")
+            print(f"   {Colors.GREEN}✓ Browser restart successful!{Colors.RESET}")
+            print("="*70 + "\n")
+            watchdog.reset()
+            if standby is not None and standby.thread is None:
+                # Last standby was used up or failed - line up a new one
+                standby.launch(standby.other_profile(user_data_dir))
+            return new_driver
+        except Exception as e:
+            print(f" {Colors.error('✗')} FAILED")
+            if attempt < 2:
+                print(
+                    f"   {Colors.CYAN}→{Colors.RESET} Retrying in 2 seconds...")
+                time.sleep(2)
+            else:
+                print(
+                    f"   {Colors.RED}✗ CRITICAL: Browser restart failed after 3 attempts{Colors.RESET}")
+                print("="*70 + "\n")
+                raise Exception("Browser restart failed permanently")
+
+
+def restart_latency_summary():
+    """One-line report of restart latencies by kind"""
+    parts = []
+    for kind in ('warm', 'cold'):
+        times = [t for k, t in restart_latencies if k == kind]
+        if times:
+            parts.append(f"{kind} {len(times)}× avg {sum(times) / len(times):.2f}s max {max(times):.2f}s")
+    return ", ".join(parts)
+
+
+PROFILE_COPY_IGNORE = shutil.ignore_patterns("Cache", "Code Cache", "GPUCache", "CacheStorage",
+                                             "Service Worker", "Singleton*", "*.lock")
+
+
+def copy_profile(source_dir, target_dir):
+    """Copy Local State and CHROME_PROFILE from one user-data-dir to another, minus caches"""
+    os.makedirs(target_dir, exist_ok=True)
+    local_state = os.path.join(source_dir, "Local State")
+    if os.path.exists(local_state):
+        shutil.copy2(local_state, target_dir)
+    shutil.copytree(
+        os.path.join(source_dir, CHROME_PROFILE),
+        os.path.join(target_dir, CHROME_PROFILE),
+        ignore=PROFILE_COPY_IGNORE,
+        dirs_exist_ok=True)
+    return target_dir
+
+
+def clone_profile(worker_id):
+    """Copy the logged-in Chrome profile into a private user-data-dir for a worker
+
+    Chrome locks a user-data-dir, so parallel browsers cannot share one. Caches are
+    skipped; an existing clone is reused so its login survives between runs.
+    """
+    target = os.path.abspath(os.path.join(WORKER_PROFILE_ROOT, f"worker-{worker_id}"))
+    if os.path.isdir(os.path.join(target, CHROME_PROFILE)):
+        return target
+    return copy_profile(CHROME_USER_DATA_DIR, target)
+
+
+def standby_profile_dir(user_data_dir):
+    """User-data-dir the warm standby for a browser on user_data_dir runs on"""
+    if os.path.abspath(user_data_dir) == os.path.abspath(CHROME_USER_DATA_DIR):
+        return os.path.abspath(os.path.join(WORKER_PROFILE_ROOT, "standby"))
+    return user_data_dir.rstrip(os.sep) + "-standby"
+
+
+def prepare_standby_profile(user_data_dir=None):
+    """Copy user_data_dir for the warm standby - call before that profile is launched
+
+    A running Chrome holds its profile locked and half-written, so the copy is
+    made once while it is closed. An existing copy is reused, like worker clones;
+    if it turns out signed out, restart_browser_safe refreshes it on a cold restart.
+    """
+    if not WARM_STANDBY:
+        return None
+    user_data_dir = user_data_dir or CHROME_USER_DATA_DIR
+    standby_dir = standby_profile_dir(user_data_dir)
+    if os.path.isdir(os.path.join(standby_dir, CHROME_PROFILE)):
+        return standby_dir
+    try:
+        return copy_profile(user_data_dir, standby_dir)
+    except Exception as e:
+        print(f"{Colors.warning('⚠')} Warm standby disabled - profile copy failed: {e}")
+        return None
+
+
+def start_standby(driver):
+    """Launch a warm standby next to driver - None when WARM_STANDBY is off
+
+    The standby profile must already exist from prepare_standby_profile.
+    """
+    if not WARM_STANDBY:
+        return None
+    user_data_dir = getattr(driver, 'ebh_user_data_dir', CHROME_USER_DATA_DIR)
+    standby_dir = standby_profile_dir(user_data_dir)
+    if not os.path.isdir(os.path.join(standby_dir, CHROME_PROFILE)):
+        return None
+    standby = BrowserStandby((user_data_dir, standby_dir))
+    standby.launch(standby_dir)
+    return standby
+
+
+def is_driver_alive(driver):
+    """Quick driver health check"""
+    try:
+        _ = driver.current_url
+        watchdog.activity()
+        return True
+    except:
+        return False
+
+# ========================
+# BROWSER HEALTH & RECYCLING
+# ========================
+
+
+def _proc_children():
+    """Map pid -> child pids from /proc"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+            # comm may contain spaces - ppid is the 2nd field after the closing paren
+            ppid = int(stat[stat.rindex(b')') + 2:].split()[1])
+        except (OSError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree_rss_mb(root_pid):
+    """Resident memory of a process and all its descendants, or None without /proc"""
+    if not root_pid or not os.path.isdir('/proc'):
+        return None
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    children = _proc_children()
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            pass
+        stack.extend(children.get(pid, ()))
+    return total / 1048576
+
+
+def browser_root_pid(driver):
+    """PID whose process tree holds the browser - Chrome itself, else chromedriver"""
+    pid = getattr(driver, 'browser_pid', None)
+    if pid:
+        return pid
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class RecyclePolicy:
+    """Decides when to recycle a browser from its health, not a fixed counter
+
+    One policy per browser loop (main loop or pool worker). Page load times
+    are recorded by the thread that drives the browser via record_page_latency.
+    """
+
+    def __init__(self):
+        self.latencies = deque(maxlen=RECYCLE_LATENCY_WINDOW)
+        self.pages = 0
+        self.recycles = 0
+        _health_local.policy = self
+
+    def reset(self):
+        self.latencies.clear()
+        self.pages = 0
+
+    def record(self, seconds):
+        self.latencies.append(seconds)
+        self.pages += 1
+
+    def sample(self, driver):
+        try:
+            tabs = len(driver.window_handles)
+        except Exception:
+            tabs = None
+        latencies = list(self.latencies)
+        return {
+            'rss_mb': process_tree_rss_mb(browser_root_pid(driver)),
+            'tabs': tabs,
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'pages': self.pages,
+        }
+
+    def check(self, driver):
+        """Sample health and return (recycle?, cause) - every decision is logged"""
+        health = self.sample(driver)
+        causes = []
+        if health['rss_mb'] is not None and health['rss_mb'] > RECYCLE_MAX_RSS_MB:
+            causes.append(f"rss {health['rss_mb']:.0f}MB > {RECYCLE_MAX_RSS_MB}MB")
+        if health['tabs'] is not None and health['tabs'] > RECYCLE_MAX_TABS:
+            causes.append(f"{health['tabs']} tabs > {RECYCLE_MAX_TABS}")
+        if len(self.latencies) >= RECYCLE_LATENCY_WINDOW // 2 and health['p90'] > RECYCLE_LATENCY_P90:
+            causes.append(f"p90 {health['p90']:.1f}s > {RECYCLE_LATENCY_P90}s")
+        if self.pages >= RECYCLE_MAX_PAGES:
+            causes.append(f"{self.pages} pages ≥ {RECYCLE_MAX_PAGES}")
+
+        recycle = bool(causes)
+        cause = "; ".join(causes) if causes else "healthy"
+        rss = f"{health['rss_mb']:.0f}MB" if health['rss_mb'] is not None else "n/a"
+        p90 = f"{health['p90']:.1f}s" if health['p90'] is not None else "n/a"
+        verdict = f"{Colors.YELLOW}RECYCLE{Colors.RESET}" if recycle else f"{Colors.GREEN}keep{Colors.RESET}"
+        print(f"   🩺 Browser health: rss {rss} | tabs {health['tabs']} | p90 {p90} | pages {self.pages} → {verdict} ({cause})")
+
+        self._log(health, recycle, cause)
+        if recycle:
+            self.recycles += 1
+        return recycle, cause
+
+    def _log(self, health, recycle, cause):
+        try:
+            with _recycle_log_lock, open(RECYCLE_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'worker': threading.current_thread().name,
+                    'decision': 'recycle' if recycle else 'keep',
+                    'cause': cause,
+                    **health,
+                }) + "\n")
+        except Exception:
+            pass
+
+
+_health_local = threading.local()
+_recycle_log_lock = threading.Lock()
+
+
+def record_page_latency(seconds):
+    """Feed a page load time to the current thread's recycle policy"""
+    policy = getattr(_health_local, 'policy', None)
+    if policy is not None:
+        policy.record(seconds)
+
+# ========================
+# ADAPTIVE PACING
+# ========================
+
+
+class PacingController:
+    """AIMD controller for the delay between requests
+
+    Phases (search, product, http) report their latency and outcome. A streak
+    of healthy outcomes steps the delay down additively; a timeout, stuck or
+    throttled outcome multiplies it by PACING_BACKOFF. The delay lives on the
+    controller behind its lock and starts from REQUEST_DELAY; callers read it
+    with delay(). Timeouts are left to calibration - shrinking them on success
+    would cut off the very pages that are slow. Each change is appended to
+    PACING_LOG_FILE for auditing.
+    """
+
+    TROUBLE = ('timeout', 'stuck', 'throttled', 'error')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.value = None  # Current delay; None until the first adjustment
+        self.latencies = {}  # phase -> recent latencies
+        self.streaks = {}  # phase -> consecutive healthy outcomes
+        self.decisions = 0
+        self.backoffs = 0
+
+    def delay(self):
+        """Seconds to wait between requests"""
+        with self.lock:
+            return REQUEST_DELAY if self.value is None else self.value
+
+    def record(self, phase, seconds, outcome='ok'):
+        if not ADAPTIVE_PACING:
+            return
+        with self.lock:
+            recent = self.latencies.setdefault(phase, deque(maxlen=RECYCLE_LATENCY_WINDOW))
+            median = percentile(list(recent), 50)
+            if seconds is not None:
+                recent.append(seconds)
+
+            if outcome == 'ok' and median and seconds is not None and seconds > PACING_SLOW_FACTOR * median:
+                outcome = 'slow'
+
+            current = REQUEST_DELAY if self.value is None else self.value
+            if outcome in self.TROUBLE:
+                self.streaks[phase] = 0
+                self.backoffs += 1
+                self._adjust(phase, seconds, outcome, current,
+                             min(PACING_DELAY_MAX, max(current, PACING_DELAY_MIN) * PACING_BACKOFF))
+            elif outcome == 'ok':
+                self.streaks[phase] = self.streaks.get(phase, 0) + 1
+                if self.streaks[phase] >= PACING_HEALTHY_STREAK:
+                    self.streaks[phase] = 0
+                    self._adjust(phase, seconds, outcome, current,
+                                 max(PACING_DELAY_MIN, current - PACING_DELAY_STEP))
+            else:
+                self.streaks[phase] = 0
+
+    def _adjust(self, phase, seconds, outcome, old, new):
+        new = round(new, 3)
+        if new == old:
+            return
+        self.value = new
+        self.decisions += 1
+        if outcome != 'ok':
+            print(f"   {Colors.YELLOW}🐢 Pacing back-off ({phase} {outcome}):{Colors.RESET} "
+                  f"REQUEST_DELAY {old}→{new}")
+        self._log(phase, seconds, outcome, {'REQUEST_DELAY': [old, new]})
+
+    def _log(self, phase, seconds, outcome, changes):
+        try:
+            with open(PACING_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'worker': threading.current_thread().name,
+                    'phase': phase,
+                    'outcome': outcome,
+                    'latency': round(seconds, 3) if seconds is not None else None,
+                    'median': percentile(list(self.latencies.get(phase, [])), 50),
+                    'changes': changes,
+                }) + "\n")
+        except Exception:
+            pass
+
+    def summary(self):
+        if not ADAPTIVE_PACING or not self.decisions:
+            return None
+        return f"{self.decisions} adjustments ({self.backoffs} back-offs) → REQUEST_DELAY={self.delay()}"
+
+
+pacing = PacingController()
+
+# ========================
+# WAIT ENGINE
+# ========================
+
+# Resolves in-page as soon as the condition holds: a MutationObserver re-checks on
+# every DOM change and a short timer covers readyState/style changes. The Python
+# side only pays one round trip per wait; max_wait is an upper bound, not a delay.
+JS_WAIT = """
+const [condition, arg, maxMs, sinceMark, settleMs] = arguments;
+const done = arguments[arguments.length - 1];
+const started = Date.now();
+let lastMutation = started;
+
+const text = (el) => (el && (el.innerText || el.textContent || el.getAttribute('aria-label'))) || '';
+const visible = (el) => !!el && el.getClientRects().length > 0;
+const resultsPresent = () => !!document.querySelector(
+    '.srp-results .s-item, .srp-results li[data-listing-id], #srp-river-results li');
+const chipPresent = (label) => [...document.querySelectorAll('.brm__item, [class*="applied"], input:checked')]
+    .some(el => text(el).includes(label) || text(el.closest('li, label, a')).includes(label));
+const quietFor = (ms) => Date.now() - lastMutation >= ms;
+
+const checks = {
+    ready: () => document.readyState !== 'loading',
+    complete: () => document.readyState === 'complete',
+    selector: () => !!document.querySelector(arg),
+    xpath: () => visible(document.evaluate(arg, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue),
+    results: () => resultsPresent(),
+    filtered: () => resultsPresent() && ((arg && chipPresent(arg)) || quietFor(500)),
+    body_length: () => !!document.body && document.body.innerText.length > arg,
+    mentions: () => location.href.includes(arg) || (!!document.body && document.body.innerText.includes(arg)),
+    quiet: () => quietFor(arg),
+};
+
+// A marked document that has not mutated yet has not reacted to the action
+const changed = () => !sinceMark || !window.__ebhMark || window.__ebhMutations > 0;
+
+let finished = false;
+let observer = null;
+let timer = null;
+const finish = (ok) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(timer);
+    done(ok);
+};
+
+let satisfiedAt = null;
+const evaluate = () => {
+    if (finished) return;
+    let ok = false;
+    try { ok = changed() && checks[condition](); } catch (e) { ok = false; }
+    if (ok) {
+        if (satisfiedAt === null) satisfiedAt = Date.now();
+        if (!settleMs || quietFor(settleMs)) return finish(true);
+    } else {
+        satisfiedAt = null;
+    }
+    if (Date.now() - started >= maxMs) finish(false);
+};
+
+observer = new MutationObserver(() => { lastMutation = Date.now(); evaluate(); });
+observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true});
+timer = setInterval(evaluate, 50);
+evaluate();
+"""
+
+JS_MARK = """
+if (window.__ebhObserver) window.__ebhObserver.disconnect();
+window.__ebhMark = true;
+window.__ebhMutations = 0;
+window.__ebhObserver = new MutationObserver((records) => { window.__ebhMutations += records.length; });
+window.__ebhObserver.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+"""
+
+
+def mark_page(driver):
+    """Start counting DOM mutations so a later wait can tell the page reacted"""
+    try:
+        driver.execute_script(JS_MARK)
+    except Exception:
+        pass
+
+
+def wait_until(driver, condition, arg=None, max_wait=None, since_mark=False, settle=0.0, phase=None):
+    """Block until an in-page readiness condition holds, at most max_wait seconds
+
+    Conditions: ready, complete, selector, xpath, results, filtered (results plus
+    the filter chip or a quiet DOM), body_length, mentions (text in the URL or
+    page), quiet. With since_mark the page
+    must also have changed since mark_page() - a navigation counts as a change.
+    A successful wait is recorded under phase for calibration.
+    """
+    if max_wait is None:
+        max_wait = SEARCH_WAIT
+    if watchdog.deadline is not None:
+        max_wait = watchdog.deadline.clamp(max_wait)
+    started = time.time()
+    deadline = started + max_wait
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0 or watchdog.check(MAX_STUCK_TIME):
+            return False
+        try:
+            ok = driver.execute_async_script(
+                JS_WAIT, condition, arg, int(remaining * 1000), since_mark, int(settle * 1000))
+            watchdog.activity()
+            if ok and phase:
+                record_phase(phase, time.time() - started)
+            return bool(ok)
+        except TimeoutException:
+            return False
+        except WebDriverException:
+            # Document unloaded mid-wait (navigation) - keep waiting on the new one
+            since_mark = False
+            time.sleep(0.05)
+
+
+def click_and_wait(driver, element, chip=None, max_wait=None):
+    """Click a filter element and wait until the filtered results are in place"""
+    if max_wait is None:
+        max_wait = FILTER_WAIT
+    mark_page(driver)
+    driver.execute_script("arguments[0].click();", element)
+    watchdog.activity()
+    return wait_until(driver, 'filtered', chip, max_wait, since_mark=True, settle=0.15)
+
+# ========================
+# SELECTOR ENGINE
+# ========================
+
+# Evaluates every candidate XPath in one script call - no implicit wait per miss
+JS_PROBE = """
+const [selectors, needVisible, needEnabled] = arguments;
+const usable = (el) => (!needVisible || el.getClientRects().length > 0) &&
+    (!needEnabled || !el.disabled);
+for (let i = 0; i < selectors.length; i++) {
+    let snapshot;
+    try {
+        snapshot = document.evaluate(selectors[i], document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (let j = 0; j < snapshot.snapshotLength; j++) {
+        const el = snapshot.snapshotItem(j);
+        if (el.nodeType === 1 && usable(el)) return [i, el];
+    }
+}
+return null;
+"""
+
+
+class SelectorEngine:
+    """Finds the first matching selector of a group, trying past winners first
+
+    Hit counts per (group, selector) are persisted so the selector that matched
+    on the last run is probed first on the next one.
+    """
+
+    def __init__(self, path=SELECTOR_STATS_FILE):
+        self.path = path
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.dirty = 0
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.stats = json.load(f)
+            except Exception as e:
+                print(f"{Colors.warning('⚠')} Error reading selector stats: {e}")
+        return self
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            try:
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.stats, f, indent=2)
+                os.replace(tmp_path, self.path)
+                self.dirty = 0
+            except Exception as e:
+                print(f"{Colors.warning('⚠')} Error saving selector stats: {e}")
+
+    def order(self, group, selectors):
+        """Most successful selectors first; ties keep the hand-written order"""
+        hits = self.stats.get(group, {})
+        return sorted(selectors, key=lambda sel: -hits.get(sel, 0))
+
+    def record(self, group, selector):
+        with self.lock:
+            group_stats = self.stats.setdefault(group, {})
+            group_stats[selector] = group_stats.get(selector, 0) + 1
+            self.dirty += 1
+            flush = self.dirty >= 20
+        if flush:
+            self.save()
+
+    def find(self, driver, group, selectors, visible=True, enabled=False):
+        """Return the first usable element matched by any selector, or None"""
+        ordered = self.order(group, selectors)
+        try:
+            match = driver.execute_script(JS_PROBE, ordered, visible, enabled)
+        except Exception:
+            return None
+        if not match:
+            return None
+        index, element = match
+        self.record(group, ordered[index])
+        watchdog.activity()
+        return element
+
+
+selector_engine = SelectorEngine()
+
+# ========================
+# EBAY SEARCH & FILTER - ANTI-STUCK
+# ========================
+
+
+def apply_price_filter(driver):
+    """Apply minimum price filter ($8) with anti-stuck protection"""
+    try:
+        watchdog.activity()
+        
+        print(f"   {Colors.CYAN}→{Colors.RESET} Applying price filter (min $8)...", end="", flush=True)
+        
         # Try to find the minimum price input field
         min_price_selectors = [
             "//input[@aria-label='Minimum Value in $']",
@@ -385,702 +2548,2318 @@ def apply_price_filter(driver):
             "//*[@id='s0-51-12-6-2-2[0]-2-1-content-menu']//input[1]"  # Common eBay price filter
         ]
         
-        price_input = None
-        for selector in min_price_selectors:
-            if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
-                print(f" {Colors.warning('⚠')} (timeout)")
-                return False
-                
-            try:
-                price_input = driver.find_element(By.XPATH, selector)
-                if price_input.is_displayed():
-                    break
-            except:
-                continue
-        
-        if not price_input:
-            print(f" {Colors.warning('⚠')} (not found)")
+        if watchdog.check(MAX_STUCK_TIME):
+            print(f" {Colors.warning('⚠')} (timeout)")
+            return False
+
+        price_input = selector_engine.find(driver, 'price_input', min_price_selectors)
+        
+        if not price_input:
+            print(f" {Colors.warning('⚠')} (not found)")
+            return False
+        
+        # Clear and enter minimum price
+        try:
+            driver.execute_script("arguments[0].scrollIntoView(true);", price_input)
+            time.sleep(0.2)
+            price_input.clear()
+            price_input.send_keys(str(MIN_PRICE))
+            watchdog.activity()
+            time.sleep(0.3)
+            
+            # Try to submit the price filter
+            submit_selectors = [
+                "//button[contains(text(), 'Submit price range')]",
+                "//button[@aria-label='Submit price range']",
+                "//button[contains(@class, 'x-textrange__input-btn')]"
+            ]
+            
+            submit_btn = selector_engine.find(driver, 'price_submit', submit_selectors, enabled=True)
+            if submit_btn:
+                click_and_wait(driver, submit_btn)
+                print(f" {Colors.success('✓')}")
+                return True
+            
+            # If no submit button found, try pressing Enter
+            mark_page(driver)
+            price_input.send_keys(Keys.RETURN)
+            watchdog.activity()
+            wait_until(driver, 'filtered', None, FILTER_WAIT, since_mark=True, settle=0.15)
+            print(f" {Colors.success('✓')}")
+            return True
+            
+        except Exception as e:
+            print(f" {Colors.warning('⚠')} (error: {str(e)[:30]})")
+            return False
+            
+    except Exception:
+        print(f" {Colors.warning('⚠')} (failed)")
+        return False
+
+
+def build_search_url(keyword, page=1):
+    """Build the filtered results URL: keyword, min price, US Only, Unbranded"""
+    params = {
+        '_nkw': keyword,
+        '_sacat': 0,
+        '_udlo': MIN_PRICE,
+        'LH_PrefLoc': 1,  # Item location: US Only
+        'Brand': 'Unbranded',
+    }
+    if CANDIDATE_POOL:
+        params['_ipg'] = RESULTS_PAGE_SIZE
+    if page > 1:
+        params['_pgn'] = page
+    return f"{EBAY_BASE_URL}/sch/i.html?{urlencode(params)}"
+
+
+def verify_search_filters(driver):
+    """Check which filters the loaded results page actually applied"""
+    js_verify = """
+    const minPrice = arguments[0];
+    const params = new URLSearchParams(location.search);
+    const text = (el) => (el && (el.innerText || el.textContent)) || '';
+
+    // Is a filter control for this label rendered, and is it selected?
+    const filterState = (label) => {
+        let rendered = false;
+        for (const input of document.querySelectorAll('input[type="checkbox"], input[type="radio"]')) {
+            const host = input.closest('li, label, a') || input.parentElement;
+            const name = input.getAttribute('aria-label') || text(host);
+            if (!name.includes(label)) continue;
+            rendered = true;
+            if (input.checked) return 'on';
+        }
+        for (const chip of document.querySelectorAll('.brm__item, [class*="applied"]')) {
+            if (text(chip).includes(label)) return 'on';
+        }
+        return rendered ? 'off' : 'absent';
+    };
+
+    const minInput = document.querySelector(
+        'input[aria-label="Minimum Value in $"], .x-textrange__input--from, input[name="_udlo"]');
+    return {
+        results: !!document.querySelector('.srp-results, #srp-river-results, ul.srp-list'),
+        price: params.get('_udlo') === String(minPrice) &&
+            (!minInput || !minInput.value || parseFloat(minInput.value) === minPrice),
+        us_only: params.get('LH_PrefLoc') === '1' && filterState('US Only') !== 'off',
+        unbranded: params.get('Brand') === 'Unbranded' && filterState('Unbranded') !== 'off'
+    };
+    """
+    try:
+        return driver.execute_script(js_verify, MIN_PRICE) or {}
+    except Exception:
+        return {}
+
+
+def search_ebay_keyword_fast(driver, keyword):
+    """Load the filtered results URL directly - skips homepage, typing and filter clicks
+
+    Returns True/False when the fast path settled the search, or None when the
+    results page did not come up and the caller should use the click path.
+    """
+    print(f"   {Colors.CYAN}→{Colors.RESET} Loading filtered results URL...", end="", flush=True)
+
+    start = time.time()
+    try:
+        driver.get(build_search_url(keyword))
+        record_page_latency(time.time() - start)
+        watchdog.activity()
+    except TimeoutException:
+        record_page_latency(time.time() - start)
+        try:
+            driver.execute_script("window.stop();")
+            watchdog.activity()
+        except:
+            pass
+
+    # Wait for the result list, at most SEARCH_WAIT
+    if wait_until(driver, 'results', max_wait=SEARCH_WAIT):
+        record_phase('search_url', time.time() - start)
+    if watchdog.check(MAX_STUCK_TIME):
+        print(f" {Colors.error('✗ STUCK - needs restart')}")
+        return False
+    state = verify_search_filters(driver)
+
+    if not state.get('results'):
+        print(f" {Colors.warning('⚠')} (no results list - using click path)")
+        return None
+
+    missing = [name for name in ('price', 'us_only', 'unbranded') if not state.get(name)]
+    if not missing:
+        print(f" {Colors.success('✓')} ({time.time() - start:.1f}s)")
+        watchdog.activity()
+        return True
+
+    print(f" {Colors.warning('⚠')} (not applied: {', '.join(missing)})")
+
+    # Only click the filters that did not take effect
+    if 'price' in missing:
+        apply_price_filter(driver)
+    for name, label, apply_filter in (('us_only', 'US Only', apply_us_only_filter_safe),
+                                      ('unbranded', 'Unbranded', apply_unbranded_filter_safe)):
+        if name not in missing:
+            continue
+        print(f"   {Colors.CYAN}→{Colors.RESET} Applying {label} filter...", end="", flush=True)
+        filter_start = time.time()
+        ok = apply_filter(driver)
+        if time.time() - filter_start > FILTER_MAX_WAIT or watchdog.check(MAX_STUCK_TIME):
+            print(f" {Colors.error('✗ STUCK - needs restart')}")
+            return False
+        print(f" {Colors.success('✓')}" if ok else f" {Colors.warning('⚠')} (skipped)")
+
+    watchdog.activity()
+    wait_until(driver, 'results', max_wait=FILTER_WAIT)
+    return True
+
+
+def search_ebay_keyword(driver, keyword, retry=0):
+    """Search eBay for a keyword with anti-stuck protection"""
+    try:
+        watchdog.reset()
+
+        if not is_driver_alive(driver):
+            return False
+
+        if FAST_SEARCH_URL and retry == 0:
+            fast_ok = search_ebay_keyword_fast(driver, keyword)
+            if fast_ok is not None:
+                return fast_ok
+            watchdog.activity()
+
+        # Navigate to eBay with timeout
+        start = time.time()
+        try:
+            driver.get("https://www.ebay.com")
+            watchdog.activity()
+            if wait_until(driver, 'selector', '#gh-ac', SEARCH_WAIT):
+                record_phase('homepage', time.time() - start)
+        except TimeoutException:
+            if time.time() - start > MAX_STUCK_TIME:
+                print(
+                    f"   {Colors.warning('⚠')} Navigation stuck, forcing stop...")
+            try:
+                driver.execute_script("window.stop();")
+                watchdog.activity()
+            except:
+                pass
+
+        # Check if stuck during navigation
+        if watchdog.check(MAX_STUCK_TIME):
+            print(
+                f"   {Colors.error('✗')} STUCK during navigation - needs restart")
+            return False
+
+        # Search with timeout
+        start = time.time()
+        try:
+            search_box = WebDriverWait(driver, 6).until(
+                EC.presence_of_element_located((By.ID, "gh-ac"))
+            )
+            search_box.clear()
+            search_box.send_keys(keyword)
+            mark_page(driver)
+            search_box.send_keys(Keys.RETURN)
+            watchdog.activity()
+            if wait_until(driver, 'results', max_wait=SEARCH_WAIT, since_mark=True):
+                record_phase('search_submit', time.time() - start)
+        except TimeoutException:
+            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
+                print(
+                    f"   {Colors.error('✗')} STUCK on search box - needs restart")
+                return False
+
+            if retry < MAX_RETRIES:
+                print(f"   {Colors.warning('⚠')} Search timeout, retrying...")
+                time.sleep(1)
+                return search_ebay_keyword(driver, keyword, retry + 1)
+            print(
+                f"   {Colors.error('✗')} Search failed after {MAX_RETRIES} attempts")
+            return False
+        except Exception as e:
+            print(f"   {Colors.error('✗')} Search error: {e}")
+            return False
+
+        # Apply price filter FIRST
+        price_start = time.time()
+        if apply_price_filter(driver):
+            record_phase('filter_price', time.time() - price_start)
+
+        # Apply filters with strict timeout
+        print(
+            f"   {Colors.CYAN}→{Colors.RESET} Applying US Only filter...", end="", flush=True)
+        us_start = time.time()
+        us_ok = apply_us_only_filter_safe(driver)
+
+        # Check if stuck on US filter
+        if time.time() - us_start > FILTER_MAX_WAIT or watchdog.check(MAX_STUCK_TIME):
+            print(f" {Colors.error('✗ STUCK - needs restart')}")
+            return False
+
+        if us_ok:
+            record_phase('filter_us_only', time.time() - us_start)
+            print(f" {Colors.success('✓')}")
+        else:
+            print(f" {Colors.warning('⚠')} (skipped)")
+
+        print(
+            f"   {Colors.CYAN}→{Colors.RESET} Applying Unbranded filter...", end="", flush=True)
+        unbranded_start = time.time()
+        unbranded_ok = apply_unbranded_filter_safe(driver)
+
+        # Check if stuck on Unbranded filter
+        if time.time() - unbranded_start > FILTER_MAX_WAIT or watchdog.check(MAX_STUCK_TIME):
+            print(f" {Colors.error('✗ STUCK - needs restart')}")
+            return False
+
+        if unbranded_ok:
+            record_phase('filter_unbranded', time.time() - unbranded_start)
+            print(f" {Colors.success('✓')}")
+        else:
+            print(f" {Colors.warning('⚠')} (skipped)")
+
+        watchdog.activity()
+        wait_until(driver, 'results', max_wait=FILTER_WAIT)
+        return True
+
+    except Exception as e:
+        print(f"   {Colors.error('✗')} Keyword search error: {e}")
+        return False
+
+
+def apply_us_only_filter_safe(driver):
+    """Apply US Only filter with strict anti-stuck timeout - checks Recently used filters first"""
+    start_time = time.time()
+
+    try:
+        # PRIORITY 1: Check "Recently used filters" section first (fastest)
+        recently_used_selectors = [
+            "//h3[contains(text(), 'Recently used filters')]//following::span[contains(text(), 'US Only')]",
+            "//div[contains(@class, 'recently') or contains(text(), 'Recently used')]//following::span[contains(text(), 'US Only')]",
+            "//section[contains(@aria-label, 'Recently')]//span[contains(text(), 'US Only')]"
+        ]
+        
+        if watchdog.check(MAX_STUCK_TIME):
             return False
+
+        element = selector_engine.find(driver, 'us_only_recent', recently_used_selectors)
+        if element:
+            driver.execute_script("arguments[0].scrollIntoView(true);", element)
+            time.sleep(0.1)
+            click_and_wait(driver, element, 'US Only')
+            return True
         
-        # Clear and enter minimum price
-        try:
-            driver.execute_script("arguments[0].scrollIntoView(true);", price_input)
-            time.sleep(0.2)
-            price_input.clear()
-            price_input.send_keys(str(MIN_PRICE))
-            watchdog.activity()
-            time.sleep(0.3)
-            
-            # Try to submit the price filter
-            submit_selectors = [
-                "//button[contains(text(), 'Submit price range')]",
-                "//button[@aria-label='Submit price range']",
-                "//button[contains(@class, 'x-textrange__input-btn')]"
-            ]
-            
-            for selector in submit_selectors:
+        # PRIORITY 2: Standard selectors (fallback)
+        selectors = [
+            "//span[contains(text(), 'US Only')]",
+            "//a[contains(text(), 'US Only')]",
+            "//div[contains(text(), 'US Only')]"
+        ]
+
+        while time.time() - start_time < FILTER_MAX_WAIT:
+            if watchdog.check(MAX_STUCK_TIME):
+                return False
+
+            element = selector_engine.find(driver, 'us_only', selectors, visible=False)
+            if element:
                 try:
-                    submit_btn = driver.find_element(By.XPATH, selector)
-                    if submit_btn.is_displayed() and submit_btn.is_enabled():
-                        driver.execute_script("arguments[0].click();", submit_btn)
-                        watchdog.activity()
-                        time.sleep(BUTTON_WAIT)
-                        print(f" {Colors.success('✓')}")
-                        return True
-                except:
+                    driver.execute_script(
+                        "arguments[0].scrollIntoView(true);", element)
+                    time.sleep(0.1)
+                    click_and_wait(driver, element, 'US Only')
+                    return True
+                except StaleElementReferenceException:
                     continue
-            
-            # If no submit button found, try pressing Enter
-            price_input.send_keys(Keys.RETURN)
+
             watchdog.activity()
-            time.sleep(BUTTON_WAIT)
-            print(f" {Colors.success('✓')}")
-            return True
-            
-        except Exception as e:
-            print(f" {Colors.warning('⚠')} (error: {str(e)[:30]})")
-            return False
-            
+            wait_until(driver, 'xpath', " | ".join(selectors), BUTTON_WAIT, phase='filter_button')
+
+        return False
     except Exception:
-        print(f" {Colors.warning('⚠')} (failed)")
         return False
 
 
-def search_ebay_keyword(driver, keyword, retry=0):
-    """Search eBay for a keyword with anti-stuck protection"""
+def apply_unbranded_filter_safe(driver):
+    """Apply Unbranded filter - checks Recently used filters first, then tries expansion"""
+    start_time = time.time()
+    max_attempt_time = 8  # Only try for 8 seconds total
+
     try:
-        watchdog.reset()
+        # PRIORITY 1: Check "Recently used filters" section FIRST (fastest & most reliable)
+        recently_used_selectors = [
+            "//h3[contains(text(), 'Recently used filters')]//following::span[contains(text(), 'Unbranded')]",
+            "//div[contains(@class, 'recently') or contains(text(), 'Recently used')]//following::span[contains(text(), 'Unbranded')]",
+            "//section[contains(@aria-label, 'Recently')]//span[contains(text(), 'Unbranded')]",
+            "//h3[text()='Recently used filters']/following::*[contains(text(), 'Unbranded')]"
+        ]
+        
+        # PRIORITY 2: Try direct selection (Unbranded is already visible in main filters)
+        unbranded_selectors = [
+            "//span[contains(text(), 'Unbranded')]",
+            "//a[contains(text(), 'Unbranded')]",
+            "//input[@aria-label='Unbranded']",
+            "//label[contains(text(), 'Unbranded')]"
+        ]
+
+        for group, group_selectors in (('unbranded_recent', recently_used_selectors),
+                                       ('unbranded', unbranded_selectors)):
+            if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
+                return False
+
+            element = selector_engine.find(driver, group, group_selectors)
+            if element:
+                driver.execute_script(
+                    "arguments[0].scrollIntoView(true);", element)
+                time.sleep(0.1)
+                click_and_wait(driver, element, 'Unbranded')
+                return True
+
+        # FALLBACK: Try expanding Brand section (but limit time)
+        if time.time() - start_time < max_attempt_time and not watchdog.check(MAX_STUCK_TIME):
+            brand_expand_selectors = [
+                "//h3[contains(text(), 'Brand')]//parent::button",
+                "//button[contains(@aria-label, 'Brand')]",
+                "//div[contains(@class, 'x-refine__main__list')]//button[.//span[contains(text(), 'Brand')]]",
+                "//span[contains(text(), 'Brand')]//ancestor::button"
+            ]
+
+            brand_button = selector_engine.find(driver, 'brand_expand', brand_expand_selectors, visible=False)
+            if brand_button:
+                driver.execute_script(
+                    "arguments[0].scrollIntoView(true);", brand_button)
+                time.sleep(0.2)
+                driver.execute_script("arguments[0].click();", brand_button)
+                watchdog.activity()
+                wait_until(driver, 'xpath', "//*[contains(text(), 'Unbranded')]", BUTTON_WAIT,
+                           phase='filter_button')
+
+                # Quick check for Unbranded after expanding
+                if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
+                    return False
+
+                element = selector_engine.find(driver, 'unbranded', unbranded_selectors)
+                if element:
+                    driver.execute_script(
+                        "arguments[0].scrollIntoView(true);", element)
+                    time.sleep(0.1)
+                    click_and_wait(driver, element, 'Unbranded')
+                    return True
+
+                # If we expanded Brand but didn't find Unbranded quickly, give up
+
+        # Don't try Brand Type at all - it opens too many options and causes timeout
+        # Just return False and let the search continue without Unbranded filter
+        return False
+        
+    except Exception:
+        return False
+
+
+# Result cards -> the same record shape as parse_search_results, in one call
+JS_EXTRACT_RECORDS = """
+const maxProducts = arguments[0];
+const text = (el) => (el && (el.innerText || el.textContent) || '').trim();
+const idOf = (href) => { const m = (href || '').match(/\\/itm\\/(?:[^\\/?]*\\/)?(\\d{10,})/); return m && m[1]; };
+const priceOf = (value) => { const m = value.match(/\\$\\s*([\\d,]+(?:\\.\\d+)?)/); return m ? parseFloat(m[1].replace(/,/g, '')) : null; };
+const records = [];
+const seen = new Set();
+const add = (record) => {
+    if (!record.item_id || seen.has(record.item_id) || records.length >= maxProducts) return;
+    seen.add(record.item_id);
+    record.url = `https://www.ebay.com/itm/${record.item_id}`;
+    records.push(record);
+};
+
+for (const card of document.querySelectorAll('li.s-item, li.s-card, li[data-listing-id]')) {
+    const link = card.querySelector('a[href*="/itm/"]');
+    const body = text(card);
+    const sold = body.match(/([\\d,]+)\\+?\\s+sold/i);
+    const origin = body.match(/\\bfrom\\s+([A-Z][A-Za-z .,'-]+?)\\s*(?:\\n|$)/);
+    add({
+        item_id: idOf(link && link.href),
+        title: text(card.querySelector('.s-item__title, .s-card__title')),
+        price: priceOf(text(card.querySelector('.s-item__price, .s-card__price'))),
+        sold: sold ? parseInt(sold[1].replace(/,/g, ''), 10) : 0,
+        origin: origin ? origin[1].trim() : '',
+        sponsored: /Sponsored/.test(body) || !!card.querySelector('[aria-label*="Sponsored"]'),
+    });
+}
+
+// Unknown layout - fall back to bare item links
+if (!records.length) {
+    for (const link of document.querySelectorAll('a[href*="/itm/"]')) {
+        add({item_id: idOf(link.href), title: '', price: null, sold: 0, origin: '', sponsored: false});
+    }
+}
+return records;
+"""
+
+
+def extract_product_records(driver, max_products=10):
+    """Extract result-card records (ID, price, sold badge, origin, sponsored) with anti-stuck protection"""
+    try:
+        watchdog.activity()
 
         if not is_driver_alive(driver):
-            return False
+            return []
 
-        # Navigate to eBay with timeout
         start = time.time()
         try:
-            driver.get("https://www.ebay.com")
+            # Let lazy-loaded cards render - resolves once the DOM goes quiet
+            driver.execute_script("window.scrollTo(0, 600);")
+            wait_until(driver, 'quiet', 150, SCROLL_DELAY, phase='scroll_settle')
+            driver.execute_script("window.scrollTo(0, 1200);")
+            wait_until(driver, 'quiet', 150, SCROLL_DELAY, phase='scroll_settle')
+            driver.execute_script("window.scrollTo(0, 0);")
+            watchdog.activity()
+        except:
+            pass
+
+        if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
+            print(f"   {Colors.warning('⚠')} Stuck during scroll, continuing...")
+            return []
+
+        records = driver.execute_script(JS_EXTRACT_RECORDS, max_products)
+        watchdog.activity()
+        record_phase('extract_urls', time.time() - start)
+        return records[:max_products]
+
+    except Exception:
+        return []
+
+
+def extract_product_urls(driver, max_products=10):
+    """Extract product URLs with anti-stuck protection"""
+    return [record['url'] for record in extract_product_records(driver, max_products)]
+
+
+# ========================
+# CANDIDATE POOL
+# ========================
+
+
+def load_results_page(driver, keyword, page):
+    """Navigate to results page number page and return its records"""
+    start = time.time()
+    try:
+        driver.get(build_search_url(keyword, page))
+        record_page_latency(time.time() - start)
+    except TimeoutException:
+        record_page_latency(time.time() - start)
+        try:
+            driver.execute_script("window.stop();")
+        except:
+            pass
+    except WebDriverException:
+        return []
+    watchdog.activity()
+    if not wait_until(driver, 'results', max_wait=SEARCH_WAIT):
+        return []
+    return extract_product_records(driver, RESULTS_PAGE_SIZE)
+
+
+def candidate_pool(first_page, fetch_page, skip, max_pages=POOL_MAX_PAGES):
+    """Yield result records whose URL is not in skip, loading further pages only on demand
+
+    first_page is the already-extracted page 1; fetch_page(n) returns page n's
+    records. Stops after max_pages, on an empty page, or when a page repeats
+    the previous one (eBay serves its last page past the end).
+    """
+    yielded = set()
+    records = first_page
+    for page in range(1, max_pages + 1):
+        if page > 1:
+            print(f"   {Colors.CYAN}→{Colors.RESET} Loading results page {page} for more candidates...")
+            records = fetch_page(page)
+        page_urls = {record['url'] for record in records or []}
+        if not page_urls or page_urls <= yielded:
+            return
+        for record in records:
+            url = record['url']
+            if url in yielded or url in skip:
+                continue
+            yielded.add(url)
+            yield record
+        yielded |= page_urls
+
+
+# ========================
+# PRE-FILTER
+# ========================
+
+
+def prefilter_record(record):
+    """Decide from card metadata alone whether an item deserves a sold-history visit
+
+    Returns (keep, reason). Fields the card did not show never reject an item.
+    """
+    if not PREFILTER:
+        return True, "off"
+    price = record.get('price')
+    if PREFILTER_MIN_PRICE is not None and price is not None and price < PREFILTER_MIN_PRICE:
+        return False, f"price ${price:g} < ${PREFILTER_MIN_PRICE:g}"
+    if PREFILTER_MIN_SOLD and (record.get('sold') or 0) < PREFILTER_MIN_SOLD:
+        return False, f"{record.get('sold') or 0} sold < {PREFILTER_MIN_SOLD}"
+    if PREFILTER_SKIP_SPONSORED and record.get('sponsored'):
+        return False, "sponsored"
+    origin = record.get('origin') or ''
+    if PREFILTER_US_ONLY and origin and origin not in ('United States', 'US', 'USA'):
+        return False, f"ships from {origin}"
+    return True, "pass"
+
+
+class PrefilterStats:
+    """Scores pre-filter decisions against the sales counts the visits found
+
+    Rejected items are audited at PREFILTER_AUDIT_RATE so missed winners are
+    measured, not guessed. Every decision is appended to PREFILTER_LOG_FILE.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.kept = 0
+        self.rejected = 0
+        self.kept_good = 0
+        self.kept_checked = 0
+        self.audited = 0
+        self.audited_good = 0
+
+    def decide(self, keyword, records):
+        """Split records into (visit, skip) - skip holds (record, reason)"""
+        visit, skip = [], []
+        for record in records:
+            keep, reason = prefilter_record(record)
+            if keep:
+                visit.append(record)
+            elif random.random() < PREFILTER_AUDIT_RATE:
+                record = dict(record, audit=reason)
+                visit.append(record)
+            else:
+                skip.append((record, reason))
+                self._log(keyword, record, 'skip', reason)
+        with self.lock:
+            self.kept += sum(1 for record in visit if 'audit' not in record)
+            self.rejected += len(records) - len(visit) + sum(1 for record in visit if 'audit' in record)
+        return visit, skip
+
+    def outcome(self, keyword, record, result):
+        """Record what the sold-history visit found for a pre-filtered record"""
+        if result is None:
+            return
+        good = is_good_result(result)
+        with self.lock:
+            if 'audit' in record:
+                self.audited += 1
+                self.audited_good += good
+            else:
+                self.kept_checked += 1
+                self.kept_good += good
+        self._log(keyword, record, 'audit' if 'audit' in record else 'visit',
+                  record.get('audit', 'pass'), result['window_sales'], good)
+
+    def _log(self, keyword, record, decision, reason, window_sales=None, good=None):
+        if not PREFILTER:
+            return
+        try:
+            with self.lock, open(PREFILTER_LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'keyword': keyword,
+                    'item_id': record.get('item_id'),
+                    'price': record.get('price'),
+                    'sold': record.get('sold'),
+                    'origin': record.get('origin'),
+                    'sponsored': record.get('sponsored'),
+                    'decision': decision,
+                    'reason': reason,
+                    'window_sales': window_sales,
+                    'good': good,
+                }) + "\n")
+        except Exception:
+            pass
+
+    def summary(self):
+        if not PREFILTER or not (self.kept or self.rejected):
+            return None
+        text = f"kept {self.kept}, rejected {self.rejected}"
+        if self.kept_checked:
+            text += f" | hit rate {self.kept_good / self.kept_checked:.0%} of {self.kept_checked} visited"
+        if self.audited:
+            text += f" | audited rejects good {self.audited_good}/{self.audited}"
+        return text
+
+
+prefilter_stats = PrefilterStats()
+
+
+# ========================
+# HTTP SEARCH (NO BROWSER)
+# ========================
+
+HTTP_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip',
+    'Connection': 'keep-alive',
+}
+
+CARD_START_RE = re.compile(r'<li\b[^>]*(?:class="[^"]*\bs-(?:item|card)\b[^"]*"|data-listing-id=)[^>]*>', re.I)
+ITEM_ID_RE = re.compile(r'/itm/(?:[^"\'/?]*/)?(\d{10,})')
+# Titles nest spans (e.g. a "New Listing" highlight) - read up to the closing div/h3
+TITLE_RE = re.compile(r'class="[^"]*\bs-(?:item|card)__title\b[^"]*"[^>]*>(.*?)</(?:div|h3)>', re.I | re.S)
+PRICE_RE = re.compile(r'class="[^"]*\bs-(?:item|card)__price\b[^"]*"[^>]*>(.*?)</span>', re.I | re.S)
+SOLD_RE = re.compile(r'([\d,]+)\+?\s+sold', re.I)
+ORIGIN_RE = re.compile(r'\bfrom\s+([A-Z][A-Za-z .,\'-]+?)\s*<', re.S)
+BLOCKED_PAGE_MARKERS = ("Pardon Our Interruption", "captcha", "/splashui/challenge")
+
+
+def _strip_tags(fragment):
+    return html.unescape(re.sub(r'<[^>]+>', ' ', fragment)).split()
+
+
+def parse_price(text):
+    """First dollar amount in text as a float, or None"""
+    match = re.search(r'\$\s*([\d,]+(?:\.\d+)?)', text or '')
+    return float(match.group(1).replace(',', '')) if match else None
+
+
+def parse_search_results(page_html, max_products=None):
+    """Parse item IDs and card metadata from a search results page"""
+    records = []
+    seen = set()
+    starts = [m.start() for m in CARD_START_RE.finditer(page_html)]
+    for n, start in enumerate(starts):
+        card = page_html[start:starts[n + 1] if n + 1 < len(starts) else len(page_html)]
+        id_match = ITEM_ID_RE.search(card)
+        if not id_match or id_match.group(1) in seen:
+            continue
+        item_id = id_match.group(1)
+        seen.add(item_id)
+
+        title = TITLE_RE.search(card)
+        price = PRICE_RE.search(card)
+        sold = SOLD_RE.search(' '.join(_strip_tags(card)))
+        origin = ORIGIN_RE.search(card)
+        records.append({
+            'item_id': item_id,
+            'url': f"https://www.ebay.com/itm/{item_id}",
+            'title': ' '.join(_strip_tags(title.group(1))) if title else '',
+            'price': parse_price(' '.join(_strip_tags(price.group(1)))) if price else None,
+            'sold': int(sold.group(1).replace(',', '')) if sold else 0,
+            'origin': origin.group(1).strip() if origin else '',
+            'sponsored': 'Sponsored' in card,
+        })
+        if max_products and len(records) >= max_products:
+            break
+    return records
+
+
+class HttpSearchClient:
+    """Keep-alive HTTP client for search result pages - one connection per host and thread"""
+
+    def __init__(self, timeout=HTTP_TIMEOUT):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self, scheme, host, fresh=False):
+        pool = getattr(self._local, 'pool', None)
+        if pool is None:
+            pool = self._local.pool = {}
+        key = (scheme, host)
+        if fresh and key in pool:
+            pool.pop(key).close()
+        if key not in pool:
+            conn_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            pool[key] = conn_class(host, timeout=self.timeout)
+        return pool[key]
+
+    def fetch(self, url, redirects=3):
+        """GET url and return (status, text) - reuses the pooled connection"""
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc, fresh=attempt > 0)
+            try:
+                conn.request('GET', path or '/', headers=HTTP_HEADERS)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Server closed the kept-alive connection - reconnect once
+                if attempt:
+                    raise
+        if response.status in (301, 302, 303, 307, 308) and redirects > 0:
+            location = response.getheader('Location', '')
+            return self.fetch(urljoin(url, location), redirects - 1)
+        if response.getheader('Content-Encoding', '') == 'gzip':
+            body = gzip.decompress(body)
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.status, body.decode(charset, errors='replace')
+
+    def search(self, keyword, max_products=PRODUCTS_PER_KEYWORD, page=1):
+        """Return result-card records for keyword, or None if the page was unusable
+
+        A page that parses to zero cards also counts as unusable, so the caller
+        falls back to the browser instead of treating the keyword as empty.
+        """
+        start = time.time()
+        try:
+            status, page_html = self.fetch(build_search_url(keyword, page))
+        except Exception as e:
+            pacing.record('http', time.time() - start, 'timeout' if isinstance(e, OSError) else 'error')
+            print(f"   {Colors.warning('⚠')} HTTP search failed: {str(e)[:60]}")
+            return None
+        if status != 200 or any(marker in page_html for marker in BLOCKED_PAGE_MARKERS):
+            pacing.record('http', time.time() - start, 'throttled')
+            print(f"   {Colors.warning('⚠')} HTTP search rejected (status {status}) - using browser")
+            return None
+        pacing.record('http', time.time() - start)
+        records = parse_search_results(page_html, max_products)
+        if not records:
+            # A 200 without result cards is a layout we cannot read, not an empty search
+            print(f"   {Colors.warning('⚠')} HTTP search page had no result cards - using browser")
+            return None
+        return records
+
+
+http_search = HttpSearchClient()
+
+# ========================
+# PRICE & HISTORY
+# ========================
+
+
+JS_PRICE = """
+const priceEl = document.querySelector('.x-price-primary .ux-textspans, [itemprop="price"], .x-price-primary');
+if (priceEl) {
+    const match = priceEl.textContent.match(/[\\$]?\\s*([\\d,]+\\.?\\d*)/);
+    if (match) return match[1].replace(/,/g, '');
+}
+
+const bodyText = document.body.innerText;
+const priceMatch = bodyText.match(/US \\$([\\d,]+\\.?\\d*)/);
+if (priceMatch) return priceMatch[1].replace(/,/g, '');
+
+const altMatch = bodyText.match(/\\$([\\d,]+\\.?\\d*)/);
+if (altMatch) return altMatch[1].replace(/,/g, '');
+
+return null;
+"""
+
+
+def extract_price(driver):
+    """Extract product price from eBay listing"""
+    try:
+        watchdog.activity()
+
+        if not is_driver_alive(driver):
+            return "N/A"
+
+        js_result = driver.execute_script(JS_PRICE)
+        watchdog.activity()
+
+        if js_result:
+            return f"${js_result}"
+
+        return "N/A"
+    except Exception:
+        return "N/A"
+
+
+def wait_for_extension_button(driver, max_wait=None):
+    """Wait for extension button with timeout"""
+    if watchdog.check(MAX_STUCK_TIME) or not is_driver_alive(driver):
+        return None
+
+    if not wait_until(driver, 'xpath', "//*[contains(text(), 'View Sold History')]",
+                      max_wait or EXTENSION_BUTTON_WAIT, phase='extension_button'):
+        return None
+
+    try:
+        buttons = driver.find_elements(
+            By.XPATH, "//*[contains(text(), 'View Sold History')]")
+
+        for button in buttons:
+            try:
+                if button.is_displayed() and button.is_enabled():
+                    watchdog.activity()
+                    return button
+            except:
+                continue
+    except:
+        pass
+
+    return None
+
+
+def click_sold_history_button(driver):
+    """Click sold history button with anti-stuck protection"""
+    try:
+        watchdog.activity()
+
+        if not is_driver_alive(driver):
+            return False, None
+
+        original_window = driver.current_window_handle
+        original_handles = set(driver.window_handles)
+
+        button = wait_for_extension_button(driver)
+
+        if not button:
+            return False, None
+
+        try:
+            driver.execute_script("arguments[0].scrollIntoView(true);", button)
+            time.sleep(0.1)
+            driver.execute_script("arguments[0].click();", button)
             watchdog.activity()
-            time.sleep(SEARCH_WAIT)
-        except TimeoutException:
-            if time.time() - start > MAX_STUCK_TIME:
-                print(
-                    f"   {Colors.warning('⚠')} Navigation stuck, forcing stop...")
+        except Exception:
             try:
-                driver.execute_script("window.stop();")
+                button.click()
                 watchdog.activity()
             except:
+                return False, None
+
+        start = time.time()
+        for i in range(10):
+            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
+                return False, None
+
+            time.sleep(0.25)
+            try:
+                current_handles = set(driver.window_handles)
+                new_handles = current_handles - original_handles
+
+                if new_handles:
+                    new_window = new_handles.pop()
+                    driver.switch_to.window(new_window)
+                    watchdog.activity()
+                    return True, original_window
+            except Exception:
                 pass
 
-        # Check if stuck during navigation
+        return False, None
+
+    except Exception:
+        return False, None
+
+
+# Routes the extension's window.open / target=_blank links into one named window
+JS_ROUTE_HISTORY = """
+const name = arguments[0];
+if (!window.__ebhRouted) {
+    window.__ebhRouted = true;
+    const open = window.open;
+    window.open = function (url) { return open.call(window, url, name); };
+    document.addEventListener('click', (event) => {
+        const link = event.target.closest && event.target.closest('a[target]');
+        if (link && link.target !== '_self') link.target = name;
+    }, true);
+}
+"""
+
+history_url_template = None  # Learned extension URL with {item_id}, lets us skip the click
+
+
+def learn_history_url(url, item_id):
+    """Remember the extension's history URL shape if it carries the item ID
+
+    The template must rebuild this exact URL and keep the item ID out of the
+    host, so every item's history lands on the same host and path shape.
+    """
+    global history_url_template
+    if history_url_template is not None or item_id not in url:
+        return
+    parsed = urlsplit(url)
+    if not parsed.scheme or not parsed.netloc or item_id in parsed.netloc:
+        return
+    template = url.replace('{', '{{').replace('}', '}}').replace(item_id, '{item_id}')
+    rebuilt = template.format(item_id=item_id)
+    if rebuilt != url or urlsplit(rebuilt)[1:3] != parsed[1:3]:
+        return
+    history_url_template = template
+    print(f"      {Colors.CYAN}→{Colors.RESET} Learned sold-history URL - later items skip the button")
+
+
+def wait_for_new_window(driver, known_handles, target_watch, timeout=None):
+    """New window handle after a click - from Target.targetCreated when the event
+    stream delivers target events, otherwise by checking window_handles"""
+    if timeout is None:
+        timeout = NEW_WINDOW_WAIT
+    hub = getattr(driver, 'ebh_events', None)
+    if target_watch is not None and 'Target.targetCreated' in hub.seen_methods:
+        handle = target_watch.wait(known_handles, timeout)
+        if handle and handle in driver.window_handles:
+            return handle
+        return None
+
+    start = time.time()
+    while time.time() - start < timeout:
         if watchdog.check(MAX_STUCK_TIME):
-            print(
-                f"   {Colors.error('✗')} STUCK during navigation - needs restart")
-            return False
+            return None
+        time.sleep(0.25)
+        try:
+            new_handles = set(driver.window_handles) - known_handles
+            if new_handles:
+                return new_handles.pop()
+        except Exception:
+            pass
+    return None
 
-        # Search with timeout
-        start = time.time()
+
+def wait_for_history_tab(driver, known_handles, history, previous_url, timeout=None):
+    """After a click with the history tab open: a new window the extension opened,
+    or history once it has left previous_url - whichever comes first, else None
+
+    Both outcomes are read from Target.getTargets, so no tab is switched into
+    while waiting.
+    """
+    if timeout is None:
+        timeout = NEW_WINDOW_WAIT
+    start = time.time()
+    while time.time() - start < timeout:
+        if watchdog.check(MAX_STUCK_TIME):
+            return None
+        time.sleep(0.1)
         try:
-            search_box = WebDriverWait(driver, 6).until(
-                EC.presence_of_element_located((By.ID, "gh-ac"))
-            )
-            search_box.clear()
-            search_box.send_keys(keyword)
-            search_box.send_keys(Keys.RETURN)
-            watchdog.activity()
-            time.sleep(SEARCH_WAIT)
-        except TimeoutException:
-            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
-                print(
-                    f"   {Colors.error('✗')} STUCK on search box - needs restart")
-                return False
+            targets = driver.execute_cdp_cmd('Target.getTargets', {})['targetInfos']
+        except Exception:
+            continue
+        pages = {t['targetId']: t.get('url') for t in targets if t.get('type') == 'page'}
+        new_handles = [handle for handle in pages if handle not in known_handles]
+        if new_handles:
+            return new_handles[0]
+        if history in pages and pages[history] != previous_url:
+            return history
+    return None
 
-            if retry < MAX_RETRIES:
-                print(f"   {Colors.warning('⚠')} Search timeout, retrying...")
-                time.sleep(1)
-                return search_ebay_keyword(driver, keyword, retry + 1)
-            print(
-                f"   {Colors.error('✗')} Search failed after {MAX_RETRIES} attempts")
-            return False
-        except Exception as e:
-            print(f"   {Colors.error('✗')} Search error: {e}")
-            return False
 
-        # Apply price filter FIRST
-        price_ok = apply_price_filter(driver)
-        if price_ok:
-            time.sleep(FILTER_WAIT)
+def open_sold_history_persistent(driver, item_id):
+    """Show an item's sold history in the long-lived history tab
 
-        # Apply filters with strict timeout
-        print(
-            f"   {Colors.CYAN}→{Colors.RESET} Applying US Only filter...", end="", flush=True)
-        us_start = time.time()
-        us_ok = apply_us_only_filter_safe(driver)
+    Returns (success, original_window) like click_sold_history_button, with the
+    driver switched to the tab holding the history. Success means the tab shows
+    item_id in its URL or content - a tab still on the previous item is a failure.
+    """
+    try:
+        watchdog.activity()
 
-        # Check if stuck on US filter
-        if time.time() - us_start > FILTER_MAX_WAIT or watchdog.check(MAX_STUCK_TIME):
-            print(f" {Colors.error('✗ STUCK - needs restart')}")
-            return False
+        if not is_driver_alive(driver):
+            return False, None
 
-        if us_ok:
-            print(f" {Colors.success('✓')}")
-        else:
-            print(f" {Colors.warning('⚠')} (skipped)")
+        original_window = driver.current_window_handle
+        known_handles = set(driver.window_handles)
+        history = driver.ebh_history_handle if driver.ebh_history_handle in known_handles else None
 
-        print(
-            f"   {Colors.CYAN}→{Colors.RESET} Applying Unbranded filter...", end="", flush=True)
-        unbranded_start = time.time()
-        unbranded_ok = apply_unbranded_filter_safe(driver)
+        # Fastest: navigate the history tab straight to the learned extension URL
+        if history and history_url_template:
+            driver.switch_to.window(history)
+            try:
+                driver.get(history_url_template.format(item_id=item_id))
+            except TimeoutException:
+                pass
+            if wait_until(driver, 'mentions', item_id, HISTORY_READY_WAIT):
+                watchdog.activity()
+                return True, original_window
+            driver.switch_to.window(original_window)
 
-        # Check if stuck on Unbranded filter
-        if time.time() - unbranded_start > FILTER_MAX_WAIT or watchdog.check(MAX_STUCK_TIME):
-            print(f" {Colors.error('✗ STUCK - needs restart')}")
-            return False
+        hub = getattr(driver, 'ebh_events', None)
+        target_watch = TargetWatch(hub) if hub is not None else None
+        try:
+            driver.execute_script(JS_ROUTE_HISTORY, HISTORY_WINDOW_NAME)
+            button = wait_for_extension_button(driver)
+            if not button:
+                return False, None
 
-        if unbranded_ok:
-            print(f" {Colors.success('✓')}")
-        else:
-            print(f" {Colors.warning('⚠')} (skipped)")
+            previous_url = None
+            if history:
+                driver.switch_to.window(history)
+                previous_url = driver.current_url
+                driver.switch_to.window(original_window)
+
+            driver.execute_script("arguments[0].scrollIntoView(true);", button)
+            driver.execute_script("arguments[0].click();", button)
+            watchdog.activity()
+
+            if history:
+                # Routed into the history tab, or opened outside it (e.g. from a prefetched tab)
+                new_window = wait_for_history_tab(driver, known_handles, history, previous_url)
+            else:
+                new_window = wait_for_new_window(driver, known_handles, target_watch)
+        finally:
+            if target_watch is not None:
+                target_watch.close()
+
+        if not new_window:
+            # Sweep a window that opened just as we gave up; later stragglers go with the next close_extra_tabs
+            close_extra_tabs(driver, original_window)
+            return False, None
+        if new_window != history:
+            if history:
+                # The new window becomes the history tab
+                driver.switch_to.window(history)
+                driver.close()
+            driver.ebh_history_handle = new_window
+        driver.switch_to.window(new_window)
+
+        if not wait_until(driver, 'mentions', item_id, HISTORY_READY_WAIT):
+            driver.switch_to.window(original_window)
+            return False, None
+        learn_history_url(driver.current_url, item_id)
+        watchdog.activity()
+        return True, original_window
+
+    except Exception:
+        return False, None
+
+
+def open_sold_history(driver, item_id):
+    """Open the sold-history view for the current item in the configured tab mode"""
+    if HISTORY_TAB_MODE == "persistent":
+        return open_sold_history_persistent(driver, item_id)
+    return click_sold_history_button(driver)
+
+
+# Dated sale rows -> histogram, computed in the history tab; only the counts come back
+JS_SOLD_HISTORY = """
+const [first, last, byDay] = arguments;
+const MONTHS = {jan: 1, feb: 2, mar: 3, apr: 4, may: 5, jun: 6, jul: 7, aug: 8, sep: 9, oct: 10, nov: 11, dec: 12};
+const NAME = String.raw`(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\\.?`;
+const month = (name) => MONTHS[name.slice(0, 3).toLowerCase()];
+const patterns = [
+    [new RegExp(String.raw`\\b(\\d{1,2})[\\s-]+` + NAME + String.raw`[\\s-]+(\\d{4})\\b`, 'i'), (m) => [m[3], month(m[2]), m[1]]],
+    [new RegExp(String.raw`\\b` + NAME + String.raw`\\s+(\\d{1,2}),?\\s+(\\d{4})\\b`, 'i'), (m) => [m[3], month(m[1]), m[2]]],
+    [/\\b(\\d{4})-(\\d{2})-(\\d{2})\\b/, (m) => [m[1], +m[2], m[3]]],
+    [/\\b(\\d{1,2})\\/(\\d{1,2})\\/(\\d{4})\\b/, (m) => [m[3], +m[1], m[2]]],
+    [new RegExp(String.raw`\\b` + NAME + String.raw`\\s+(\\d{4})\\b`, 'i'), (m) => [m[2], month(m[1]), null]],
+];
+const pad = (n) => String(n).padStart(2, '0');
+const dateOf = (text) => {
+    for (const [re, pick] of patterns) {
+        const m = text.match(re);
+        if (!m) continue;
+        const [year, mon, day] = pick(m);
+        if (mon >= 1 && mon <= 12) {
+            return {month: `${year}-${pad(mon)}`, day: day ? `${year}-${pad(mon)}-${pad(day)}` : null};
+        }
+    }
+    return null;
+};
+
+// A row dated to the month only (e.g. a "Jan 2026 Feb 2026" header) is a sale
+// only when it also carries a price or a bare quantity cell
+const AMOUNT = /\\$\\s*\\d/;
+const QUANTITY = /^\\d{1,4}$/;
+const saleDate = (row) => {
+    const date = dateOf(row.text);
+    if (!date || date.day) return date;
+    return row.cells.some((cell) => AMOUNT.test(cell) || QUANTITY.test(cell)) ? date : null;
+};
+
+// One sale per table row; pages without dated rows fall back to text lines
+let rows = [...document.querySelectorAll('tr, [role="row"]')].map((row) => ({
+    text: row.innerText || '',
+    cells: [...row.querySelectorAll('td, th, [role="cell"], [role="gridcell"]')].map((cell) => (cell.innerText || '').trim()),
+}));
+if (!rows.some(saleDate)) {
+    rows = (document.body ? document.body.innerText : '').split('\\n').map((line) => ({text: line, cells: [line]}));
+}
+
+const months = {};
+const days = {};
+let dated = 0;
+for (const row of rows) {
+    const date = saleDate(row);
+    if (!date) continue;
+    dated++;
+    if (date.month < first || date.month > last) continue;
+    months[date.month] = (months[date.month] || 0) + 1;
+    if (byDay && date.day) days[date.day] = (days[date.day] || 0) + 1;
+}
+return {months, days, rows: rows.length, dated};
+"""
+
+
+def sold_history_record(data, window):
+    """Histogram for the stores from the in-page parser's output (zero-filled months)"""
+    data = data or {}
+    months = data.get('months') or {}
+    if SALES_HISTOGRAM == "day" and data.get('days'):
+        sales = dict(data['days'])
+    else:
+        sales = {bucket: 0 for bucket in window_months(window)}
+        sales.update(months)
+    # Rows dated to the month only have no day bucket - the total always comes from months
+    return {'window': window_label(window), 'sales': sales, 'window_sales': sum(months.values()),
+            'rows': data.get('rows', 0), 'dated': data.get('dated', 0)}
 
+
+def parse_sold_history(driver):
+    """Per-month (or per-day) sales inside the configured window, parsed in the history tab"""
+    window = sales_window()
+    try:
         watchdog.activity()
-        time.sleep(FILTER_WAIT)
-        return True
 
-    except Exception as e:
-        print(f"   {Colors.error('✗')} Keyword search error: {e}")
-        return False
+        if not is_driver_alive(driver):
+            return sold_history_record(None, window)
 
+        if not wait_until(driver, 'body_length', 100, HISTORY_READY_WAIT, phase='history_ready'):
+            return sold_history_record(None, window)
+
+        try:
+            data = driver.execute_script(JS_SOLD_HISTORY, window[0], window[1], SALES_HISTOGRAM == "day")
+            watchdog.activity()
+            return sold_history_record(data, window)
+        except Exception:
+            pass
+
+        return sold_history_record(None, window)
+    except:
+        return sold_history_record(None, window)
 
-def apply_us_only_filter_safe(driver):
-    """Apply US Only filter with strict anti-stuck timeout - checks Recently used filters first"""
-    start_time = time.time()
 
+def close_extra_tabs(driver, original_window):
+    """Close extra tabs quickly"""
     try:
-        # PRIORITY 1: Check "Recently used filters" section first (fastest)
-        recently_used_selectors = [
-            "//h3[contains(text(), 'Recently used filters')]//following::span[contains(text(), 'US Only')]",
-            "//div[contains(@class, 'recently') or contains(text(), 'Recently used')]//following::span[contains(text(), 'US Only')]",
-            "//section[contains(@aria-label, 'Recently')]//span[contains(text(), 'US Only')]"
-        ]
-        
-        for selector in recently_used_selectors:
-            if time.time() - start_time > FILTER_MAX_WAIT or watchdog.check(MAX_STUCK_TIME):
-                return False
-            
-            try:
-                element = driver.find_element(By.XPATH, selector)
-                if element.is_displayed():
-                    driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.1)
-                    driver.execute_script("arguments[0].click();", element)
-                    watchdog.activity()
-                    time.sleep(BUTTON_WAIT)
-                    return True
-            except:
-                continue
-        
-        # PRIORITY 2: Standard selectors (fallback)
-        selectors = [
-            "//span[contains(text(), 'US Only')]",
-            "//a[contains(text(), 'US Only')]",
-            "//div[contains(text(), 'US Only')]"
-        ]
+        watchdog.activity()
 
-        while time.time() - start_time < FILTER_MAX_WAIT:
-            if watchdog.check(MAX_STUCK_TIME):
-                return False
+        if not is_driver_alive(driver):
+            return
 
-            for selector in selectors:
+        all_windows = driver.window_handles
+        keep = {original_window, getattr(driver, 'ebh_history_handle', None),
+                getattr(driver, 'ebh_home_handle', None)}
+        keep |= getattr(driver, 'ebh_prefetch_handles', set())
+
+        for window in all_windows:
+            if window not in keep:
                 try:
-                    element = driver.find_element(By.XPATH, selector)
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.1)
-                    driver.execute_script("arguments[0].click();", element)
+                    driver.switch_to.window(window)
+                    driver.close()
                     watchdog.activity()
-                    time.sleep(BUTTON_WAIT)
-                    return True
-                except (NoSuchElementException, StaleElementReferenceException):
-                    continue
+                except:
+                    pass
 
+        try:
+            driver.switch_to.window(original_window)
             watchdog.activity()
-            time.sleep(0.3)
+        except:
+            if driver.window_handles:
+                driver.switch_to.window(driver.window_handles[0])
+                watchdog.activity()
+    except:
+        pass
 
-        return False
-    except Exception:
-        return False
+# ========================
+# ITEM HISTORY CACHE
+# ========================
 
 
-def apply_unbranded_filter_safe(driver):
-    """Apply Unbranded filter - checks Recently used filters first, then tries expansion"""
-    start_time = time.time()
-    max_attempt_time = 8  # Only try for 8 seconds total
+class ItemHistoryCache:
+    """Persistent item-level cache of sold-history results with TTL and LRU eviction
 
-    try:
-        # PRIORITY 1: Check "Recently used filters" section FIRST (fastest & most reliable)
-        recently_used_selectors = [
-            "//h3[contains(text(), 'Recently used filters')]//following::span[contains(text(), 'Unbranded')]",
-            "//div[contains(@class, 'recently') or contains(text(), 'Recently used')]//following::span[contains(text(), 'Unbranded')]",
-            "//section[contains(@aria-label, 'Recently')]//span[contains(text(), 'Unbranded')]",
-            "//h3[text()='Recently used filters']/following::*[contains(text(), 'Unbranded')]"
-        ]
-        
-        for selector in recently_used_selectors:
-            if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
-                return False
-            
+    The same listing often appears under several related keywords - a hit lets
+    us write the result under the new keyword without touching the browser.
+    """
+
+    def __init__(self, path=ITEM_CACHE_FILE, ttl_hours=ITEM_CACHE_TTL_HOURS,
+                 max_items=ITEM_CACHE_MAX_ITEMS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_items = max_items
+        self.entries = OrderedDict()
+        self.lock = threading.RLock()
+        self.dirty = 0
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            now = time.time()
+            # Stored oldest-first so the LRU order survives restarts
+            for item_id, entry in data.get('items', []):
+                if now - entry.get('checked_at', 0) < self.ttl:
+                    self.entries[item_id] = entry
+            self._evict()
+            print(f"{Colors.success('✓')} Loaded {len(self.entries)} cached items from {self.path}")
+        except Exception as e:
+            print(f"{Colors.warning('⚠')} Error reading item cache: {e}")
+        return self
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            tmp_path = self.path + ".tmp"
             try:
-                element = driver.find_element(By.XPATH, selector)
-                if element.is_displayed():
-                    driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.1)
-                    driver.execute_script("arguments[0].click();", element)
-                    watchdog.activity()
-                    time.sleep(BUTTON_WAIT)
-                    return True
-            except:
-                continue
-        
-        # PRIORITY 2: Try direct selection (Unbranded is already visible in main filters)
-        unbranded_selectors = [
-            "//span[contains(text(), 'Unbranded')]",
-            "//a[contains(text(), 'Unbranded')]",
-            "//input[@aria-label='Unbranded']",
-            "//label[contains(text(), 'Unbranded')]"
-        ]
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'items': list(self.entries.items())}, f)
+                os.replace(tmp_path, self.path)
+                self.dirty = 0
+            except Exception as e:
+                print(f"{Colors.warning('⚠')} Error saving item cache: {e}")
+
+    def get(self, item_id, window=None):
+        """Return a fresh cached entry (for the given sales window) or None"""
+        with self.lock:
+            entry = self.entries.get(item_id)
+            if entry is None or (window is not None and entry.get('window') != window):
+                self.misses += 1
+                return None
+            if time.time() - entry['checked_at'] >= self.ttl:
+                del self.entries[item_id]
+                self.dirty += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(item_id)
+            self.hits += 1
+            return entry
+
+    def peek(self, item_id, window=None):
+        """get() without touching the hit/miss counters or LRU order"""
+        with self.lock:
+            entry = self.entries.get(item_id)
+            if entry is None or (window is not None and entry.get('window') != window):
+                return None
+            return entry
+
+    def put(self, item_id, price, history):
+        with self.lock:
+            self.entries[item_id] = {
+                'price': price,
+                'window': history['window'],
+                'sales': history['sales'],
+                'window_sales': history.get('window_sales', sum(history['sales'].values())),
+                'checked_at': time.time(),
+            }
+            self.entries.move_to_end(item_id)
+            self._evict()
+            self.dirty += 1
+            if self.dirty >= ITEM_CACHE_SAVE_EVERY:
+                self.save()
+
+    def _evict(self):
+        while len(self.entries) > self.max_items:
+            self.entries.popitem(last=False)
+
+
+item_cache = ItemHistoryCache()
+
+
+def cached_result(keyword, url):
+    """Build a result for keyword from the item cache, or None on a miss
+
+    The row keeps status 'Success' - Date Checked carries the original check
+    time, and the in-memory 'cached' flag is never written to the stores.
+    """
+    entry = item_cache.get(item_id_from_url(url), window_label(sales_window()))
+    if entry is None:
+        return None
+    result = build_result(keyword, url, entry['price'], entry, 'Success',
+                          datetime.fromtimestamp(entry['checked_at']).strftime("%Y-%m-%d %H:%M:%S"))
+    result['cached'] = True
+    return result
+
+def checked_result(keyword, url, result):
+    """What a product visit found, even when report_result chose not to save it"""
+    if result is not None:
+        return result
+    entry = item_cache.peek(item_id_from_url(url), window_label(sales_window()))
+    if entry is None:
+        return None
+    return build_result(keyword, url, entry['price'], entry)
+
+
+def is_good_result(result):
+    """Winner on the window total, or a single month at MIN_SALES_THRESHOLD"""
+    return (result['window_sales'] >= WINNER_THRESHOLD
+            or any(count >= MIN_SALES_THRESHOLD for count in month_totals(result['sales']).values()))
 
-        # Quick first pass - try direct selection
-        for selector in unbranded_selectors:
-            if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
-                return False
+# ========================
+# PROCESS PRODUCT
+# ========================
 
-            try:
-                element = driver.find_element(By.XPATH, selector)
-                if element.is_displayed():
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.1)
-                    driver.execute_script("arguments[0].click();", element)
-                    watchdog.activity()
-                    time.sleep(BUTTON_WAIT)
-                    return True
-            except:
-                continue
 
-        # FALLBACK: Try expanding Brand section (but limit time)
-        if time.time() - start_time < max_attempt_time and not watchdog.check(MAX_STUCK_TIME):
-            brand_expand_selectors = [
-                "//h3[contains(text(), 'Brand')]//parent::button",
-                "//button[contains(@aria-label, 'Brand')]",
-                "//div[contains(@class, 'x-refine__main__list')]//button[.//span[contains(text(), 'Brand')]]",
-                "//span[contains(text(), 'Brand')]//ancestor::button"
-            ]
+def report_result(result, item_id, product_index, quota=None):
+    """Print a product result line - returns the result to save, or None to skip
 
-            for selector in brand_expand_selectors:
-                if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
-                    return False
+    The line reads product_index/quota; quota defaults to PRODUCTS_PER_KEYWORD.
+    """
+    price = result['price']
+    monthly = month_totals(result['sales'])
+    months = " ".join(f"{datetime.strptime(bucket, '%Y-%m').strftime('%b')}:{count}"
+                      for bucket, count in sorted(monthly.items()))
+    total = result['window_sales']
+    cached = f" {Colors.GRAY}(cached){Colors.RESET}" if result.get('cached') else ""
 
-                try:
-                    brand_button = driver.find_element(By.XPATH, selector)
-                    driver.execute_script(
-                        "arguments[0].scrollIntoView(true);", brand_button)
-                    time.sleep(0.2)
-                    driver.execute_script("arguments[0].click();", brand_button)
-                    watchdog.activity()
-                    time.sleep(0.5)
+    print(
+        f"      [{product_index}/{quota or PRODUCTS_PER_KEYWORD}]       [{item_id}]... ", end="", flush=True)
 
-                    # Quick check for Unbranded after expanding
-                    for unbranded_selector in unbranded_selectors:
-                        if time.time() - start_time > max_attempt_time or watchdog.check(MAX_STUCK_TIME):
-                            return False
+    if total >= WINNER_THRESHOLD:
+        print(f"{Colors.winner('WINNER!')} {Colors.GREEN}🎯{Colors.RESET} {price} | {months} Total:{total} {Colors.success('✓')}{cached}")
+        return result
+    elif any(count >= MIN_SALES_THRESHOLD for count in monthly.values()):
+        print(
+            f"{Colors.CYAN}Good!{Colors.RESET} 💰 {price} | {months} Total:{total}{cached}")
+        return result
+    else:
+        if SAVE_ALL_PRODUCTS:
+            print(
+                f"{Colors.GRAY}saved{Colors.RESET} 💾 {price} | {months} Total:{total}{cached}")
+            return result
+        print(f"{Colors.GRAY}skip{Colors.RESET} ⏭️ {price} | {months}{cached}")
+        return None
+
+
+class TabPrefetcher:
+    """Loads upcoming listing pages in background tabs of the same driver
+
+    Up to PREFETCH_TABS pages load while the current product's sold history is
+    parsed; take() switches into a prefetched tab and release() closes it.
+    """
+
+    def __init__(self, driver, depth=None):
+        self.driver = driver
+        self.depth = PREFETCH_TABS if depth is None else depth
+        self.home = driver.current_window_handle
+        self.inflight = OrderedDict()  # url -> (handle, started)
+        driver.ebh_prefetch_handles = set()
+        driver.ebh_home_handle = self.home  # The search tab - close_extra_tabs must keep it
+
+    def fill(self, upcoming):
+        """Start loading the next urls until depth + the current page are in flight"""
+        for url in upcoming:
+            if len(self.inflight) > self.depth:
+                break
+            if url in self.inflight:
+                continue
+            try:
+                handle = self._open(url)
+            except Exception:
+                self.depth = -1  # CDP unavailable - fall back to sequential loading
+                return
+            self.inflight[url] = (handle, time.time())
+            self.driver.ebh_prefetch_handles.add(handle)
 
-                        try:
-                            element = driver.find_element(By.XPATH, unbranded_selector)
-                            if element.is_displayed():
-                                driver.execute_script(
-                                    "arguments[0].scrollIntoView(true);", element)
-                                time.sleep(0.1)
-                                driver.execute_script("arguments[0].click();", element)
-                                watchdog.activity()
-                                time.sleep(BUTTON_WAIT)
-                                return True
-                        except:
-                            continue
-                    
-                    # If we expanded Brand but didn't find Unbranded quickly, give up
-                    break
-                except:
-                    continue
+    def _open(self, url):
+        """Open a background tab loading url and return its handle
 
-        # Don't try Brand Type at all - it opens too many options and causes timeout
-        # Just return False and let the search continue without Unbranded filter
-        return False
-        
-    except Exception:
-        return False
+        With resource blocking on, the tab starts blank so the block list is
+        in place before the listing page sends its first request.
+        """
+        if not resource_blocker.enabled:
+            return self.driver.execute_cdp_cmd('Target.createTarget', {'url': url, 'background': True})['targetId']
+        handle = self.driver.execute_cdp_cmd(
+            'Target.createTarget', {'url': 'about:blank', 'background': True})['targetId']
+        current = self.driver.current_window_handle
+        try:
+            self.driver.switch_to.window(handle)
+            resource_blocker.block(self.driver)
+            self.driver.execute_cdp_cmd('Page.navigate', {'url': url})
+        except Exception:
+            with contextlib.suppress(Exception):
+                self.driver.execute_cdp_cmd('Target.closeTarget', {'targetId': handle})
+            raise
+        finally:
+            with contextlib.suppress(WebDriverException):
+                self.driver.switch_to.window(current)
+        return handle
+
+    def take(self, url):
+        """Switch into the tab loading url; returns its start time or None"""
+        entry = self.inflight.pop(url, None)
+        if entry is None:
+            return None
+        handle, started = entry
+        self.driver.ebh_prefetch_handles.discard(handle)
+        try:
+            self.driver.switch_to.window(handle)
+        except WebDriverException:
+            return None
+        return started
 
+    def release(self):
+        """Close the current product tab and return to the search tab"""
+        try:
+            if self.driver.current_window_handle != self.home:
+                self.driver.close()
+        except WebDriverException:
+            pass
+        try:
+            self.driver.switch_to.window(self.home)
+        except WebDriverException:
+            pass
 
-def extract_product_urls(driver, max_products=10):
-    """Extract product URLs with anti-stuck protection"""
+    def close(self):
+        for handle, _ in self.inflight.values():
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except WebDriverException:
+                pass
+        self.inflight.clear()
+        self.driver.ebh_prefetch_handles = set()
+        self.driver.ebh_home_handle = None
+        try:
+            self.driver.switch_to.window(self.home)
+        except WebDriverException:
+            pass
+
+
+def process_product(driver, keyword, url, product_index, retry_count=0, loading_since=None,
+                    deadline=None, quota=None):
+    """Process single product with anti-stuck protection
+
+    loading_since is set when the driver is already on a prefetched tab that
+    started loading url at that time. Retries stop once deadline is spent.
+    """
     try:
         watchdog.activity()
 
         if not is_driver_alive(driver):
-            return []
+            return None, False
+
+        if not url.startswith('https://www.ebay.com/itm/'):
+            return None, True
+
+        item_id = url.split('/')[-1].split('?')[0]
+        if not item_id.isdigit() or len(item_id) < 10:
+            return None, True
+
+        if loading_since is not None:
+            # Prefetched tab - same page-load budget, counted from when it started loading
+            remaining = PAGE_LOAD_TIMEOUT - (time.time() - loading_since)
+            if wait_until(driver, 'body_length', 100, max(remaining, ITEM_READY_WAIT)):
+                record_page_latency(time.time() - loading_since)
+                watchdog.activity()
+            else:
+                record_page_latency(time.time() - loading_since)
+                try:
+                    driver.execute_script("window.stop();")
+                except WebDriverException:
+                    return None, False
+                return process_product(driver, keyword, url, product_index, retry_count,
+                                       deadline=deadline, quota=quota)
 
         start = time.time()
         try:
-            driver.execute_script("window.scrollTo(0, 600);")
-            time.sleep(SCROLL_DELAY)
-            driver.execute_script("window.scrollTo(0, 1200);")
-            time.sleep(SCROLL_DELAY)
-            driver.execute_script("window.scrollTo(0, 0);")
+            if loading_since is None:
+                driver.get(url)
+                record_page_latency(time.time() - start)
+                record_phase('item_page', time.time() - start)
             watchdog.activity()
-            time.sleep(0.2)
-        except:
-            pass
+        except TimeoutException:
+            record_page_latency(time.time() - start)
+            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
+                print(
+                    f"      [{product_index}/{quota or PRODUCTS_PER_KEYWORD}] STUCK on navigation - needs restart")
+                return None, False
 
-        if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
-            print(f"   {Colors.warning('⚠')} Stuck during scroll, continuing...")
-            return []
+            try:
+                driver.execute_script("window.stop();")
+                watchdog.activity()
+            except:
+                pass
 
-        js_extract = """
-        const links = document.querySelectorAll('a[href*="/itm/"]');
-        const urls = new Set();
-        
-        for (let link of links) {
-            const match = link.href.match(/\\/itm\\/(\\d+)/);
-            if (match && match[1] && match[1].length >= 10) {
-                urls.add(`https://www.ebay.com/itm/${match[1]}`);
-                if (urls.size >= arguments[0]) break;
-            }
-        }
-        return Array.from(urls);
-        """
+            if retry_count < MAX_RETRIES and not (deadline and deadline.expired):
+                time.sleep(0.5)
+                return process_product(driver, keyword, url, product_index, retry_count + 1,
+                                       deadline=deadline, quota=quota)
+            return None, True
+        except WebDriverException:
+            return None, False
 
-        urls = driver.execute_script(js_extract, max_products)
-        watchdog.activity()
-        return urls[:max_products]
+        loaded = wait_until(driver, 'body_length', 100, ITEM_READY_WAIT, phase='item_ready')
+        if not loaded and watchdog.check(MAX_STUCK_TIME):
+            print(
+                f"      [{product_index}/{quota or PRODUCTS_PER_KEYWORD}] STUCK waiting for page - needs restart")
+            return None, False
 
-    except Exception:
-        return []
+        if not loaded:
+            if retry_count < MAX_RETRIES and not (deadline and deadline.expired):
+                time.sleep(0.5)
+                return process_product(driver, keyword, url, product_index, retry_count + 1,
+                                       deadline=deadline, quota=quota)
+            return None, True
 
-# ========================
-# PRICE & HISTORY
-# ========================
+        price = extract_price(driver)
+        history_start = time.time()
+        success, original_window = open_sold_history(driver, item_id)
+        if success:
+            record_phase('history_open', time.time() - history_start)
 
+        if not success:
+            return None, True
+
+        history = parse_sold_history(driver)
+        close_extra_tabs(driver, original_window)
+
+        item_cache.put(item_id, price, history)
+        result = build_result(keyword, url, price, history)
 
-def extract_price(driver):
-    """Extract product price from eBay listing"""
-    try:
         watchdog.activity()
+        return report_result(result, item_id, product_index, quota), True
 
-        if not is_driver_alive(driver):
-            return "N/A"
+    except WebDriverException:
+        return None, False
+    except Exception as e:
+        return None, True
 
-        js_price = """
-        const priceEl = document.querySelector('.x-price-primary .ux-textspans, [itemprop="price"], .x-price-primary');
-        if (priceEl) {
-            const match = priceEl.textContent.match(/[\\$]?\\s*([\\d,]+\\.?\\d*)/);
-            if (match) return match[1].replace(/,/g, '');
-        }
-        
-        const bodyText = document.body.innerText;
-        const priceMatch = bodyText.match(/US \\$([\\d,]+\\.?\\d*)/);
-        if (priceMatch) return priceMatch[1].replace(/,/g, '');
-        
-        const altMatch = bodyText.match(/\\$([\\d,]+\\.?\\d*)/);
-        if (altMatch) return altMatch[1].replace(/,/g, '');
-        
-        return null;
-        """
+# ========================
+# CDP ENGINE (ASYNCIO)
+# ========================
 
-        js_result = driver.execute_script(js_price)
-        watchdog.activity()
 
-        if js_result:
-            return f"${js_result}"
+def js_call(source, *args, promise=False):
+    """Runtime.evaluate expression running a WebDriver-style script body with arguments
 
-        return "N/A"
-    except Exception:
-        return "N/A"
+    With promise=True the last argument is a resolve callback, as for execute_async_script.
+    """
+    call_args = json.dumps(list(args))
+    if promise:
+        return (f"new Promise((resolve) => (function () {{{source}\n}})"
+                f".apply(null, {call_args}.concat([resolve])))")
+    return f"(function () {{{source}\n}}).apply(null, {call_args})"
 
 
-def wait_for_extension_button(driver, max_wait=2.0):
-    """Wait for extension button with timeout"""
-    start_time = time.time()
+class CdpError(Exception):
+    """A DevTools command failed or the page threw"""
 
-    while time.time() - start_time < max_wait:
-        if watchdog.check(MAX_STUCK_TIME):
-            return None
 
-        try:
-            if not is_driver_alive(driver):
-                return None
+class CdpConnection:
+    """One DevTools websocket to the browser - commands and events for all tabs multiplexed"""
 
-            buttons = driver.find_elements(
-                By.XPATH, "//*[contains(text(), 'View Sold History')]")
+    def __init__(self, ws_url):
+        self.ws_url = ws_url
+        self.ws = None
+        self.reader = None
+        self.next_id = 0
+        self.pending = {}
+        self.listeners = {}
 
-            for button in buttons:
-                try:
-                    if button.is_displayed() and button.is_enabled():
-                        watchdog.activity()
-                        return button
-                except:
+    async def connect(self):
+        self.ws = await websockets.connect(self.ws_url, max_size=None, ping_interval=None)
+        self.reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                if 'id' in message:
+                    future = self.pending.pop(message['id'], None)
+                    if future is None or future.done():
+                        continue
+                    if 'error' in message:
+                        future.set_exception(CdpError(message['error'].get('message', 'CDP error')))
+                    else:
+                        future.set_result(message.get('result', {}))
                     continue
-        except:
+                key = (message.get('method'), message.get('sessionId'))
+                for callback in list(self.listeners.get(key, [])):
+                    callback(message.get('params', {}))
+        except Exception:
+            pass
+        finally:
+            # Browser gone - fail everything still waiting
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("DevTools connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=None):
+        if timeout is None:
+            timeout = MAX_STUCK_TIME
+        if self.reader is None or self.reader.done():
+            raise ConnectionError("DevTools connection closed")
+        self.next_id += 1
+        message = {'id': self.next_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        try:
+            await self.ws.send(json.dumps(message))
+        except Exception as e:
+            self.pending.pop(self.next_id, None)
+            raise ConnectionError(f"DevTools connection closed: {e}")
+        return await asyncio.wait_for(future, timeout)
+
+    def on(self, method, callback, session_id=None):
+        self.listeners.setdefault((method, session_id), []).append(callback)
+
+    def off(self, method, callback, session_id=None):
+        callbacks = self.listeners.get((method, session_id), [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self.reader is not None:
+            await asyncio.gather(self.reader, return_exceptions=True)
+
+
+class CdpTab:
+    """A page target driven over a flattened CDP session"""
+
+    def __init__(self, conn, target_id, session_id):
+        self.conn = conn
+        self.target_id = target_id
+        self.session_id = session_id
+
+    @classmethod
+    async def open(cls, conn, url='about:blank'):
+        target = await conn.send('Target.createTarget', {'url': url, 'background': True})
+        return await cls.attach(conn, target['targetId'])
+
+    @classmethod
+    async def attach(cls, conn, target_id):
+        session = await conn.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})
+        tab = cls(conn, target_id, session['sessionId'])
+        await tab.send('Page.enable')
+        return tab
+
+    async def send(self, method, params=None, timeout=None):
+        return await self.conn.send(method, params, self.session_id, timeout)
+
+    async def navigate(self, url, timeout=None):
+        """Navigate and wait for the load event; stops loading after timeout like driver.get"""
+        if timeout is None:
+            timeout = PAGE_LOAD_TIMEOUT
+        loaded = asyncio.get_running_loop().create_future()
+
+        def on_load(params):
+            if not loaded.done():
+                loaded.set_result(True)
+
+        self.conn.on('Page.loadEventFired', on_load, self.session_id)
+        try:
+            await self.send('Page.navigate', {'url': url})
+            await asyncio.wait_for(loaded, timeout)
+            return True
+        except asyncio.TimeoutError:
+            await self.send('Page.stopLoading')
+            return False
+        finally:
+            self.conn.off('Page.loadEventFired', on_load, self.session_id)
+
+    async def evaluate(self, expression, timeout=None):
+        response = await self.send('Runtime.evaluate', {
+            'expression': expression, 'returnByValue': True, 'awaitPromise': True}, timeout)
+        if 'exceptionDetails' in response:
+            raise CdpError(response['exceptionDetails'].get('text', 'script error'))
+        return response.get('result', {}).get('value')
+
+    async def call(self, source, *args):
+        return await self.evaluate(js_call(source, *args))
+
+    async def wait(self, condition, arg=None, max_wait=None, settle=0.0):
+        """wait_until for a CDP tab - same in-page JS_WAIT conditions"""
+        if max_wait is None:
+            max_wait = SEARCH_WAIT
+        expression = js_call(JS_WAIT, condition, arg, int(max_wait * 1000), False,
+                             int(settle * 1000), promise=True)
+        try:
+            return bool(await self.evaluate(expression, timeout=max_wait + 2))
+        except (CdpError, asyncio.TimeoutError):
+            return False
+
+    async def close(self):
+        try:
+            await self.conn.send('Target.closeTarget', {'targetId': self.target_id})
+        except Exception:
             pass
 
-        watchdog.activity()
-        time.sleep(0.15)
 
-    return None
+JS_CLICK_SOLD_HISTORY = """
+const button = document.evaluate("//*[contains(text(), 'View Sold History')]", document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!button) return false;
+button.scrollIntoView(true);
+button.click();
+return true;
+"""
 
 
-def click_sold_history_button(driver):
-    """Click sold history button with anti-stuck protection"""
+def debugger_ws_url(driver):
+    """Browser-level DevTools websocket of a running ChromeDriver session"""
+    address = driver.capabilities['goog:chromeOptions']['debuggerAddress']
+    conn = http.client.HTTPConnection(address, timeout=HTTP_TIMEOUT)
     try:
-        watchdog.activity()
+        conn.request('GET', '/json/version')
+        return json.loads(conn.getresponse().read())['webSocketDebuggerUrl']
+    finally:
+        conn.close()
 
-        if not is_driver_alive(driver):
-            return False, None
 
-        original_window = driver.current_window_handle
-        original_handles = set(driver.window_handles)
+class SeleniumEngine:
+    """Synchronous WebDriver engine - the default code path behind the engine interface"""
 
-        button = wait_for_extension_button(driver)
+    name = "selenium"
 
-        if not button:
-            return False, None
+    def __init__(self, driver):
+        self.driver = driver
 
-        try:
-            driver.execute_script("arguments[0].scrollIntoView(true);", button)
-            time.sleep(0.1)
-            driver.execute_script("arguments[0].click();", button)
-            watchdog.activity()
-        except Exception:
-            try:
-                button.click()
-                watchdog.activity()
-            except:
-                return False, None
+    def search(self, keyword):
+        return search_ebay_keyword(self.driver, keyword)
 
-        start = time.time()
-        for i in range(10):
-            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
-                return False, None
+    def extract(self, max_products):
+        return extract_product_records(self.driver, max_products)
 
-            time.sleep(0.25)
-            try:
-                current_handles = set(driver.window_handles)
-                new_handles = current_handles - original_handles
+    def page(self, keyword, page):
+        return load_results_page(self.driver, keyword, page)
 
-                if new_handles:
-                    new_window = new_handles.pop()
-                    driver.switch_to.window(new_window)
-                    watchdog.activity()
-                    return True, original_window
-            except Exception:
-                pass
+    def process_product(self, keyword, url, product_index, quota=None):
+        return process_product(self.driver, keyword, url, product_index, quota=quota)
 
-        return False, None
+    def process_products(self, keyword, urls, first_index=1, quota=None):
+        """{url: (result, browser_ok)} - one product after another"""
+        outcomes = {}
+        for i, url in enumerate(urls, first_index):
+            outcomes[url] = self.process_product(keyword, url, i, quota)
+            if not outcomes[url][1]:
+                break
+        return outcomes
 
-    except Exception:
-        return False, None
+    def close(self):
+        pass
 
 
-def parse_sold_history(driver):
-    """Parse sold history with anti-stuck timeout - Updated for Jan and Feb 2026"""
-    try:
-        watchdog.activity()
+class CdpEngine:
+    """Asyncio engine on one DevTools websocket per browser
+
+    Attaches to the Chrome that undetected_chromedriver launched (same profile,
+    login and extension) and runs up to CDP_TABS product tabs concurrently from
+    an event loop thread. Exposes the same search/extract/process_product
+    interface as SeleniumEngine.
+    """
+
+    name = "cdp"
+
+    def __init__(self, driver, tabs=None):
+        if websockets is None:
+            raise RuntimeError("the cdp engine needs the 'websockets' package (pip install websockets)")
+        self.driver = driver
+        self.tabs = tabs or CDP_TABS
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="cdp-engine", daemon=True)
+        self.thread.start()
+        self.conn = None
+        self.search_tab = None
+        self.slots = None
+        self.history_lock = None
+        self.owned = set()
+        self._run(self._start(debugger_ws_url(driver)))
+
+    @classmethod
+    def for_driver(cls, driver):
+        """The engine attached to this driver's browser, created on first use"""
+        engine = getattr(driver, 'ebh_engine', None)
+        if engine is None:
+            engine = cls(driver)
+            driver.ebh_engine = engine
+        return engine
+
+    def _run(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    async def _start(self, ws_url):
+        self.conn = CdpConnection(ws_url)
+        await self.conn.connect()
+        await self.conn.send('Target.setDiscoverTargets', {'discover': True})
+        self.slots = asyncio.Semaphore(self.tabs)
+        self.history_lock = asyncio.Lock()
+        self.search_tab = await self._open_tab()
+
+    async def _open_tab(self, url='about:blank'):
+        tab = await CdpTab.open(self.conn, url)
+        self.owned.add(tab.target_id)
+        return tab
+
+    async def _close_tab(self, tab):
+        self.owned.discard(tab.target_id)
+        await tab.close()
+
+    # ---- search / extract ----
+
+    def search(self, keyword):
+        return self._run(self._search(keyword))
+
+    async def _search(self, keyword):
+        start = time.time()
+        await self.search_tab.navigate(build_search_url(keyword), PAGE_LOAD_TIMEOUT)
+        found = await self.search_tab.wait('results', max_wait=SEARCH_WAIT)
+        print(f"   {Colors.CYAN}→{Colors.RESET} CDP search {'✓' if found else '✗'} ({time.time() - start:.1f}s)")
+        return found
+
+    def extract(self, max_products):
+        return self._run(self._extract(max_products))
+
+    async def _extract(self, max_products):
+        tab = self.search_tab
+        for offset in (600, 1200):
+            await tab.evaluate(f"window.scrollTo(0, {offset})")
+            await tab.wait('quiet', 150, SCROLL_DELAY)
+        records = await tab.call(JS_EXTRACT_RECORDS, max_products)
+        return (records or [])[:max_products]
+
+    def page(self, keyword, page):
+        return self._run(self._page(keyword, page))
+
+    async def _page(self, keyword, page):
+        await self.search_tab.navigate(build_search_url(keyword, page), PAGE_LOAD_TIMEOUT)
+        if not await self.search_tab.wait('results', max_wait=SEARCH_WAIT):
+            return []
+        return await self._extract(RESULTS_PAGE_SIZE)
 
-        if not is_driver_alive(driver):
-            return {"Jan 2026": 0, "Feb 2026": 0}
+    # ---- products ----
 
-        start = time.time()
-        for i in range(6):
-            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
-                return {"Jan 2026": 0, "Feb 2026": 0}
+    def process_product(self, keyword, url, product_index, quota=None):
+        return self._run(self._product(keyword, url, product_index, quota))
+
+    def process_products(self, keyword, urls, first_index=1, quota=None):
+        """{url: (result, browser_ok)} - up to CDP_TABS products in flight at once"""
+        async def run_all():
+            outcomes = await asyncio.gather(*(
+                self._product(keyword, url, i, quota) for i, url in enumerate(urls, first_index)))
+            return dict(zip(urls, outcomes))
+        return self._run(run_all())
 
+    async def _product(self, keyword, url, product_index, quota=None):
+        item_id = item_id_from_url(url)
+        if not item_id:
+            return None, True
+
+        async with self.slots:
+            try:
+                tab = await self._open_tab()
+            except (ConnectionError, CdpError):
+                return None, False
             try:
-                page_text = driver.execute_script(
-                    "return document.body.innerText;")
+                loaded = await tab.navigate(url, PAGE_LOAD_TIMEOUT)
+                if not await tab.wait('body_length', 100, ITEM_READY_WAIT if loaded else 0.2):
+                    return None, True
 
-                if len(page_text) > 100:
-                    jan_count = page_text.count("Jan 2026")
-                    feb_count = page_text.count("Feb 2026")
-                    watchdog.activity()
-                    return {"Jan 2026": jan_count, "Feb 2026": feb_count}
-            except Exception:
-                pass
+                price = await tab.call(JS_PRICE)
+                price = f"${price}" if price else "N/A"
 
-            watchdog.activity()
-            time.sleep(0.15)
+                history = await self._open_history(tab)
+                if history is None:
+                    return None, True
+                window = sales_window()
+                try:
+                    await history.wait('body_length', 100, HISTORY_READY_WAIT)
+                    data = await history.call(JS_SOLD_HISTORY, window[0], window[1], SALES_HISTOGRAM == "day")
+                finally:
+                    await self._close_tab(history)
+            except ConnectionError:
+                return None, False
+            except (CdpError, asyncio.TimeoutError):
+                return None, True
+            finally:
+                await self._close_tab(tab)
 
-        return {"Jan 2026": 0, "Feb 2026": 0}
-    except:
-        return {"Jan 2026": 0, "Feb 2026": 0}
+        history = sold_history_record(data, window)
+        item_cache.put(item_id, price, history)
+        return report_result(build_result(keyword, url, price, history), item_id, product_index, quota), True
 
+    async def _open_history(self, tab):
+        """Click the extension button and attach to the window it opens
 
-def close_extra_tabs(driver, original_window):
-    """Close extra tabs quickly"""
-    try:
-        watchdog.activity()
+        Clicks are serialized so a new page target can be matched to the tab
+        that caused it even when the extension does not set openerId.
+        """
+        if not await tab.wait('xpath', "//*[contains(text(), 'View Sold History')]", EXTENSION_BUTTON_WAIT):
+            return None
 
-        if not is_driver_alive(driver):
-            return
+        async with self.history_lock:
+            created = asyncio.get_running_loop().create_future()
 
-        all_windows = driver.window_handles
+            def on_created(params):
+                info = params.get('targetInfo', {})
+                if (info.get('type') == 'page' and info.get('targetId') not in self.owned
+                        and info.get('openerId') in (None, tab.target_id) and not created.done()):
+                    created.set_result(info['targetId'])
 
-        for window in all_windows:
-            if window != original_window:
-                try:
-                    driver.switch_to.window(window)
-                    driver.close()
-                    watchdog.activity()
-                except:
-                    pass
+            self.conn.on('Target.targetCreated', on_created)
+            try:
+                if not await tab.call(JS_CLICK_SOLD_HISTORY):
+                    return None
+                target_id = await asyncio.wait_for(created, NEW_WINDOW_WAIT)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self.conn.off('Target.targetCreated', on_created)
+
+            self.owned.add(target_id)
+        return await CdpTab.attach(self.conn, target_id)
+
+    def close(self):
+        async def shutdown():
+            if self.search_tab is not None:
+                await self._close_tab(self.search_tab)
+            await self.conn.close()
+        try:
+            if self.conn is not None:
+                self._run(shutdown(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def close_engine(driver):
+    """Shut down a CDP engine attached to this driver, if any"""
+    engine = getattr(driver, 'ebh_engine', None)
+    if engine is not None:
+        driver.ebh_engine = None
+        engine.close()
 
-        try:
-            driver.switch_to.window(original_window)
-            watchdog.activity()
-        except:
-            if driver.window_handles:
-                driver.switch_to.window(driver.window_handles[0])
-                watchdog.activity()
-    except:
-        pass
 
-# ========================
-# PROCESS PRODUCT
-# ========================
+def make_engine(driver, name=None):
+    name = name or ENGINE
+    if name == "cdp":
+        return CdpEngine.for_driver(driver)
+    return SeleniumEngine(driver)
 
 
-def process_product(driver, keyword, url, product_index, retry_count=0):
-    """Process single product with anti-stuck protection"""
+def benchmark_engines(keywords, engines=("selenium", "cdp"), products=None):
+    """Run the same keywords through each engine and compare phase timings"""
+    products = products or PRODUCTS_PER_KEYWORD
+    print(f"\n{Colors.BOLD}⏱  ENGINE BENCHMARK{Colors.RESET} - {len(keywords)} keywords × {products} products")
+    # Both persist as they go - load first so a benchmark adds to them instead of overwriting
+    item_cache.load()
+    selector_engine.load()
+    driver = setup_chrome_driver()
+    if not driver:
+        return
+    rows = []
     try:
-        watchdog.activity()
+        for keyword in keywords:
+            for name in engines:
+                try:
+                    engine = make_engine(driver, name)
+                except RuntimeError as e:
+                    print(f"   {Colors.warning('⚠')} {name}: {e}")
+                    continue
+                print(f"\n   {Colors.CYAN}[{name}]{Colors.RESET} {keyword}")
+                start = time.time()
+                found = engine.search(keyword)
+                search_time = time.time() - start
+                start = time.time()
+                urls = [record['url'] for record in engine.extract(products)] if found else []
+                extract_time = time.time() - start
+                start = time.time()
+                outcomes = engine.process_products(keyword, urls)
+                product_time = time.time() - start
+                done = sum(1 for _, ok in outcomes.values() if ok)
+                rows.append((name, keyword, search_time, extract_time, product_time, done))
+                if name == "selenium":
+                    close_extra_tabs(driver, driver.window_handles[0])
+    finally:
+        close_engine(driver)
+        _quit_quietly(driver)
+        item_cache.save()
+        selector_engine.save()
+
+    print(f"\n{'engine':<10} {'keyword':<28} {'search':>8} {'extract':>8} {'products':>9} {'per item':>9}")
+    for name, keyword, search_time, extract_time, product_time, done in rows:
+        per_item = product_time / done if done else 0.0
+        print(f"{name:<10} {keyword[:28]:<28} {search_time:>7.1f}s {extract_time:>7.1f}s "
+              f"{product_time:>8.1f}s {per_item:>8.2f}s")
+    for name in engines:
+        total = sum(row[2] + row[3] + row[4] for row in rows if row[0] == name)
+        items = sum(row[5] for row in rows if row[0] == name)
+        if items:
+            print(f"   {Colors.BOLD}{name}{Colors.RESET}: {total:.1f}s total, {total / items:.2f}s per product")
 
-        if not is_driver_alive(driver):
-            return None, False
+# ========================
+# EARLY STOPPING
+# ========================
 
-        if not url.startswith('https://www.ebay.com/itm/'):
-            return None, True
 
-        item_id = url.split('/')[-1].split('?')[0]
-        if not item_id.isdigit() or len(item_id) < 10:
-            return None, True
+class SequentialTest:
+    """Wald's sequential probability ratio test over one keyword's checked products
 
-        start = time.time()
-        try:
-            driver.get(url)
-            watchdog.activity()
-        except TimeoutException:
-            if time.time() - start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
-                print(
-                    f"      [{product_index}/{PRODUCTS_PER_KEYWORD}] STUCK on navigation - needs restart")
-                return None, False
+    Weighs "good-product rate is EARLY_STOP_DUD_RATE" against "... is
+    EARLY_STOP_GOOD_RATE". The log-likelihood ratio crossing its lower bound
+    stops the keyword; crossing the upper bound marks it promising.
+    """
 
-            try:
-                driver.execute_script("window.stop();")
-                watchdog.activity()
-            except:
-                pass
+    def __init__(self):
+        self.products = 0
+        self.good = 0
+        self.llr = 0.0
+        self.decision = None
+        self.lower = math.log(EARLY_STOP_BETA / (1 - EARLY_STOP_ALPHA))
+        self.upper = math.log((1 - EARLY_STOP_BETA) / EARLY_STOP_ALPHA)
+
+    def observe(self, good):
+        """Add one product - returns 'stopped', 'promising' or None while undecided"""
+        if self.decision:
+            return self.decision
+        self.products += 1
+        self.good += good
+        if good:
+            self.llr += math.log(EARLY_STOP_GOOD_RATE / EARLY_STOP_DUD_RATE)
+        else:
+            self.llr += math.log((1 - EARLY_STOP_GOOD_RATE) / (1 - EARLY_STOP_DUD_RATE))
+        if self.products >= EARLY_STOP_MIN_PRODUCTS:
+            if self.llr <= self.lower:
+                self.decision = 'stopped'
+            elif self.llr >= self.upper:
+                self.decision = 'promising'
+        return self.decision
 
-            if retry_count < MAX_RETRIES:
-                time.sleep(0.5)
-                return process_product(driver, keyword, url, product_index, retry_count + 1)
-            return None, True
-        except WebDriverException:
-            return None, False
 
-        loaded = False
-        load_start = time.time()
-        for i in range(4):
-            if time.time() - load_start > MAX_STUCK_TIME or watchdog.check(MAX_STUCK_TIME):
-                print(
-                    f"      [{product_index}/{PRODUCTS_PER_KEYWORD}] STUCK waiting for page - needs restart")
-                return None, False
+class SamplingBudget:
+    """Product visits saved by early stops, lent out to promising keywords"""
 
-            time.sleep(0.2)
-            try:
-                if is_driver_alive(driver):
-                    body_length = driver.execute_script(
-                        "return document.body.innerText.length;")
-                    if body_length > 100:
-                        loaded = True
-                        watchdog.activity()
-                        break
-            except Exception:
-                pass
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.banked = 0
+        self.stopped = 0
+        self.saved = 0
+        self.boosted = 0
+        self.spent = 0
+
+    def deposit(self, visits):
+        with self.lock:
+            self.stopped += 1
+            self.saved += visits
+            self.banked += visits
+
+    def withdraw(self, limit):
+        with self.lock:
+            bonus = min(self.banked, limit)
+            self.banked -= bonus
+            if bonus:
+                self.boosted += 1
+                self.spent += bonus
+            return bonus
+
+    def summary(self):
+        if not self.stopped and not self.boosted:
+            return None
+        return (f"{self.stopped} keywords stopped early ({self.saved} visits saved), "
+                f"{self.boosted} promising keywords got {self.spent} extra")
 
-        if not loaded:
-            if retry_count < MAX_RETRIES:
-                time.sleep(0.5)
-                return process_product(driver, keyword, url, product_index, retry_count + 1)
-            return None, True
 
-        price = extract_price(driver)
-        success, original_window = click_sold_history_button(driver)
+sampling_budget = SamplingBudget()
 
-        if not success:
-            return None, True
+# ========================
+# RUN JOURNAL
+# ========================
 
-        sales_count = parse_sold_history(driver)
-        close_extra_tabs(driver, original_window)
+JOURNAL_RECORD_FIELDS = ('item_id', 'url', 'title', 'price', 'sold', 'origin', 'sponsored')
 
-        result = {
-            'keyword': keyword,
-            'url': url,
-            'price': price,
-            'jan_sales': sales_count["Jan 2026"],
-            'feb_sales': sales_count["Feb 2026"],
-            'date_checked': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'status': 'Success'
-        }
 
-        jan = sales_count["Jan 2026"]
-        feb = sales_count["Feb 2026"]
-        total = jan + feb
+class RunJournal:
+    """Append-only JSONL journal of run progress - survives crashes and Ctrl-C
 
-        print(
-            f"      [{product_index}/{PRODUCTS_PER_KEYWORD}]       [{item_id}]... ", end="", flush=True)
+    Events: start (keyword began), page (its candidate records), product (one
+    item's outcome, including items that never reach the results file), finish,
+    retry (stuck counter) and counters. Replaying the file rebuilds the state of
+    every unfinished keyword so a restart continues at the exact item without
+    searching again. Finished keywords are dropped when the file is compacted.
+    """
 
-        if total >= WINNER_THRESHOLD:
-            print(f"{Colors.winner('WINNER!')} {Colors.GREEN}🎯{Colors.RESET} {price} | Jan:{jan} Feb:{feb} Total:{total} {Colors.success('✓')}")
-            watchdog.activity()
-            return result, True
-        elif jan >= MIN_SALES_THRESHOLD or feb >= MIN_SALES_THRESHOLD:
-            print(
-                f"{Colors.CYAN}Good!{Colors.RESET} 💰 {price} | Jan:{jan} Feb:{feb} Total:{total}")
-            watchdog.activity()
-            return result, True
-        else:
-            if SAVE_ALL_PRODUCTS:
-                print(
-                    f"{Colors.GRAY}saved{Colors.RESET} 💾 {price} | Jan:{jan} Feb:{feb} Total:{total}")
-                watchdog.activity()
-                return result, True
-            print(f"{Colors.GRAY}skip{Colors.RESET} ⏭️ {price} | Jan:{jan} Feb:{feb}")
-            return None, True
+    def __init__(self, path=RUN_JOURNAL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+        self.appended = 0
+        self.keywords = {}  # keyword -> {'pages': {n: records}, 'products': {url: event}, 'stuck': n, 'active': bool}
+        self.counters = {'crashes': 0}
+        self.stuck_keywords = set()
 
-    except WebDriverException:
-        return None, False
-    except Exception as e:
-        return None, True
+    def load(self):
+        """Replay the journal, compact it and open it for appending - returns the resumable keywords"""
+        if not RUN_JOURNAL:
+            return []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue  # torn last line from a crash
+        except OSError:
+            pass
+        self.compact()
+        return [kw for kw, state in self.keywords.items() if state['active']]
+
+    def _state(self, keyword):
+        return self.keywords.setdefault(keyword.strip().lower(),
+                                        {'pages': {}, 'products': {}, 'stuck': 0, 'active': False})
+
+    def _apply(self, event):
+        kind = event['e']
+        if kind == 'counters':
+            self.counters.update(event['counters'])
+            return
+        keyword = event['kw'].strip().lower()
+        if kind == 'finish':
+            self.keywords.pop(keyword, None)
+            if event.get('status') == 'stuck':
+                self.stuck_keywords.add(keyword)
+            return
+        state = self._state(keyword)
+        if kind == 'start':
+            state['active'] = True
+        elif kind == 'page':
+            state['pages'][event['page']] = event['records']
+        elif kind == 'product':
+            state['products'][event['url']] = event
+        elif kind == 'retry':
+            state['stuck'] = event['stuck']
+
+    def _write(self, event, sync=False):
+        if not RUN_JOURNAL:
+            return
+        with self.lock:
+            self._apply(event)
+            try:
+                if self.file is None:
+                    self.file = open(self.path, 'a', encoding='utf-8')
+                self.file.write(json.dumps(event) + "\n")
+                self.file.flush()
+                if sync:
+                    os.fsync(self.file.fileno())
+                self.appended += 1
+            except OSError as e:
+                print(f"{Colors.warning('⚠')} Run journal write failed: {e}")
+                return
+            if self.appended >= JOURNAL_COMPACT_EVERY:
+                self._compact()
+
+    def compact(self):
+        with self.lock:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the file as the live state only - written aside, then swapped in"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        events = [{'e': 'counters', 'counters': self.counters}]
+        events += [{'e': 'finish', 'kw': kw, 'status': 'stuck'} for kw in sorted(self.stuck_keywords)]
+        for keyword, state in self.keywords.items():
+            if state['active']:
+                events.append({'e': 'start', 'kw': keyword})
+            if state['stuck']:
+                events.append({'e': 'retry', 'kw': keyword, 'stuck': state['stuck']})
+            for page, records in sorted(state['pages'].items()):
+                events.append({'e': 'page', 'kw': keyword, 'page': page, 'records': records})
+            events.extend(state['products'].values())
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for event in events:
+                    f.write(json.dumps(event) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.appended = 0
+        except OSError as e:
+            print(f"{Colors.warning('⚠')} Run journal compaction failed: {e}")
+
+    # ---- events ----
+
+    def start(self, keyword):
+        self._write({'e': 'start', 'kw': keyword}, sync=True)
+
+    def page(self, keyword, page, records):
+        records = [{field: record.get(field) for field in JOURNAL_RECORD_FIELDS} for record in records]
+        self._write({'e': 'page', 'kw': keyword, 'page': page, 'records': records}, sync=True)
+
+    def product(self, keyword, url, outcome, result=None):
+        """outcome: saved, skipped (checked, not saved), failed (no history), prefiltered or cached"""
+        self._write({'e': 'product', 'kw': keyword, 'url': url, 'outcome': outcome,
+                     'window_sales': result['window_sales'] if result else None,
+                     'good': is_good_result(result) if result else None})
+
+    def finish(self, keyword, saved, status='done'):
+        self._write({'e': 'finish', 'kw': keyword, 'saved': saved, 'status': status}, sync=True)
+
+    def forget(self, keyword):
+        """Finish a journaled keyword that turned out to be complete already"""
+        with self.lock:
+            known = keyword.strip().lower() in self.keywords
+        if known:
+            self.finish(keyword, 0)
+
+    def retry(self, keyword, stuck_count):
+        self._write({'e': 'retry', 'kw': keyword, 'stuck': stuck_count}, sync=True)
+
+    def count(self, **counters):
+        self._write({'e': 'counters', 'counters': counters}, sync=True)
+
+    def finish_run(self):
+        """Every keyword is done - the next run starts from a clean journal"""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            self.keywords.clear()
+            self.stuck_keywords.clear()
+            self.counters = {'crashes': 0}
+            if not RUN_JOURNAL:
+                return  # --no-journal: a journal left by an earlier run stays for its resume
+            with contextlib.suppress(OSError):
+                os.remove(self.path)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    # ---- resume state ----
+
+    def pages(self, keyword, page):
+        with self.lock:
+            state = self.keywords.get(keyword.strip().lower())
+            return state['pages'].get(page) if state else None
+
+    def products(self, keyword):
+        """{url: product event} already journaled for keyword"""
+        with self.lock:
+            state = self.keywords.get(keyword.strip().lower())
+            return dict(state['products']) if state else {}
+
+    def stuck_count(self, keyword):
+        with self.lock:
+            state = self.keywords.get(keyword.strip().lower())
+            return state['stuck'] if state else 0
+
+
+run_journal = RunJournal()
 
 # ========================
 # PROCESS KEYWORD
 # ========================
 
 
-def process_keyword(driver, keyword, processed_urls, stuck_count=0):
+def process_keyword(driver, keyword, processed_urls, stuck_count=0, save_result=None):
     """Process keyword with comprehensive anti-stuck protection and retry logic"""
+    save_result = save_result or results_store.save
+    worker = threading.current_thread().name
+    worker_tag = f" {Colors.GRAY}[{worker}]{Colors.RESET}" if worker != "MainThread" else ""
     print(f"\n{'='*70}")
-    print(f"🎯 {Colors.BOLD}KEYWORD:{Colors.RESET} {keyword}")
+    print(f"🎯 {Colors.BOLD}KEYWORD:{Colors.RESET} {keyword}{worker_tag}")
     if stuck_count > 0:
         print(
             f"   {Colors.YELLOW}⚠ Retry attempt {stuck_count}/{KEYWORD_STUCK_RETRY}{Colors.RESET}")
     print(f"{'='*70}")
 
+    deadline = Deadline(keyword_budget(), f"Keyword '{keyword}'")
+    previous_deadline = deadline_supervisor.enter(driver, deadline)
     try:
         watchdog.reset()
 
@@ -1088,24 +4867,68 @@ def process_keyword(driver, keyword, processed_urls, stuck_count=0):
             print(f"   {Colors.error('✗')} Browser not responding")
             return 0, False, stuck_count
 
+        engine = make_engine(driver) if ENGINE != "selenium" else None
+        run_journal.start(keyword)
+        journaled = run_journal.products(keyword)
+
+        # Browserless search first - Chrome is then only used for sold history
+        page_size = RESULTS_PAGE_SIZE if CANDIDATE_POOL else PRODUCTS_PER_KEYWORD
+        search_keyword = keyword_clusters.search_keyword(keyword)
+        # Interrupted mid-keyword - the journal still has its candidates
+        records = run_journal.pages(keyword, 1)
+        resumed = records is not None
+        # A near-duplicate keyword already searched - reuse its candidates
+        if not resumed:
+            records = keyword_clusters.get(keyword)
+        shared = not resumed and records is not None
+        if resumed:
+            print(f"   ⏯️  Resuming from run journal: {len(records)} candidates, {len(journaled)} already checked")
+        elif shared:
+            print(f"   ♻️  Reusing {len(records)} results from near-duplicate search '{search_keyword}'")
+        elif HTTP_SEARCH:
+            records = http_search.search(keyword, page_size)
+        via_http = HTTP_SEARCH and records is not None
+        if via_http and not shared:
+            print(f"   📦 Fetched {len(records)} results over HTTP")
+
         # Search with timeout
-        if not search_ebay_keyword(driver, keyword):
+        found = True
+        if records is None:
+            search_start = time.time()
+            found = engine.search(keyword) if engine else search_ebay_keyword(driver, keyword)
+            pacing.record('search', time.time() - search_start,
+                          'ok' if found else ('stuck' if watchdog.is_stuck else 'failed'))
+        if not found:
+            if deadline.expired:
+                return keyword_budget_spent(keyword, deadline, 0)
             if watchdog.is_stuck:
-                if stuck_count < KEYWORD_STUCK_RETRY:
+                # A keyword that failed in earlier runs gets no immediate retries - it waits out its
+                # backoff, unless --retry-stuck asked to ignore it
+                retries = (KEYWORD_STUCK_RETRY if STUCK_IGNORE_BACKOFF or not stuck_registry.failures(keyword)
+                           else 0)
+                if stuck_count < retries:
                     print(
                         f"   {Colors.warning('⚠')} STUCK during search - will retry after browser restart")
                     return 0, False, stuck_count + 1
                 else:
                     print(
-                        f"   {Colors.error('✗')} STUCK {KEYWORD_STUCK_RETRY} times - skipping keyword")
+                        f"   {Colors.error('✗')} STUCK {stuck_count + 1} times - skipping keyword")
+                    save_stuck_keyword(keyword, "Stuck during search - retries exhausted")
                     return 0, True, 0
             print(f"   {Colors.error('✗')} Search failed, moving to next keyword")
             return 0, True, 0
 
-        print(f"   📦 Extracting top {PRODUCTS_PER_KEYWORD} products...")
+        if records is None:
+            print(f"   📦 Extracting {'up to ' + str(page_size) if CANDIDATE_POOL else 'top ' + str(page_size)} products...")
 
-        # Extract URLs
-        urls = extract_product_urls(driver, PRODUCTS_PER_KEYWORD)
+            # One in-page call returns every card's metadata
+            records = (engine.extract(page_size) if engine
+                       else extract_product_records(driver, page_size))
+        urls = [record['url'] for record in records]
+        keyword_clusters.put(keyword, 1, records)
+        if not resumed and records:
+            run_journal.page(keyword, 1, records)
+        resource_blocker.report(resource_blocker.collect(driver))
 
         if not urls:
             print(
@@ -1118,40 +4941,589 @@ def process_keyword(driver, keyword, processed_urls, stuck_count=0):
 
         # Filter new URLs - CHECK CSV TO AVOID DUPLICATES
         keyword_processed = processed_urls.get(keyword, set())
-        new_urls = [url for url in urls if url not in keyword_processed]
+        new_on_page = sum(1 for url in urls if url not in keyword_processed)
+        quota = max(PRODUCTS_PER_KEYWORD - len(keyword_processed), 0)
 
-        if not new_urls:
+        if not new_on_page and not CANDIDATE_POOL:
             print(
                 f"   {Colors.success('✓')} All {len(urls)} products already processed")
             return 0, True, 0
 
-        print(f"   {Colors.success('✓')} Found {len(urls)} products ({len(new_urls)} new, {len(urls) - len(new_urls)} skipped)")
-        print(f"   🏃 Starting to process...")
+        print(f"   {Colors.success('✓')} Found {len(urls)} products ({new_on_page} new, {len(urls) - new_on_page} skipped)")
+
+        def fetch_page(page):
+            more = run_journal.pages(keyword, page)
+            if more is None:
+                more = keyword_clusters.get(keyword, page)
+            if more is not None:
+                return more
+            more = http_search.search(search_keyword, page_size, page) if via_http else None
+            if more is None:
+                try:
+                    more = (engine.page(search_keyword, page) if engine
+                            else load_results_page(driver, search_keyword, page))
+                except Exception:
+                    more = []
+            keyword_clusters.put(keyword, page, more)
+            if more:
+                run_journal.page(keyword, page, more)
+            return more
+
+        # Unseen candidates, page after page, until the quota is met
+        pool = candidate_pool(records, fetch_page, keyword_processed | set(journaled),
+                              POOL_MAX_PAGES if CANDIDATE_POOL else 1)
 
         # Process products
         saved_count = 0
-        for i, url in enumerate(new_urls, 1):
-            result, browser_ok = process_product(driver, keyword, url, i)
+        cache_hits = 0
+        position = 0
+        test = SequentialTest() if EARLY_STOP else None
+
+        def promote():
+            """A promising keyword borrows extra products from visits saved by early stops"""
+            nonlocal quota
+            bonus = sampling_budget.withdraw(EARLY_STOP_BONUS)
+            quota += bonus
+            print(f"   {Colors.GREEN}↑{Colors.RESET} Promising after {test.products} products ({test.good} good)"
+                  + (f" - {bonus} extra products from the saved budget" if bonus else ""))
+
+        def observe(result):
+            """Feed a checked product to the sequential test - True once the keyword should stop"""
+            if test is None or result is None or test.decision:
+                return False
+            decision = test.observe(is_good_result(result))
+            if decision == 'promising':
+                promote()
+            return decision == 'stopped'
+
+        def conclude():
+            """Persist the test's decision; a stopped keyword banks the visits it did not make"""
+            if not (test and test.decision):
+                return
+            results_store.record_decision(keyword, test.decision, test.products, test.good, test.llr)
+            if test.decision == 'stopped':
+                saved_visits = max(quota - saved_count, 0)
+                sampling_budget.deposit(saved_visits)
+                print(f"   {Colors.YELLOW}⏹{Colors.RESET} Stopped early: {test.good}/{test.products} good products "
+                      f"is clearly below threshold - {saved_visits} visits saved for promising keywords")
+
+        if test:
+            # Products checked before an interruption still count as evidence
+            for event in journaled.values():
+                if event.get('good') is not None:
+                    test.observe(event['good'])
+            if test.decision == 'promising':
+                promote()
+
+        while saved_count < quota and not deadline.expired and not (test and test.decision == 'stopped'):
+            batch = list(islice(pool, quota - saved_count))
+            if not batch:
+                break
+
+            # Card metadata decides which items are worth a sold-history visit
+            new_records, rejected = prefilter_stats.decide(keyword, batch)
+            if rejected:
+                print(f"   {Colors.CYAN}→{Colors.RESET} Pre-filter skipped {len(rejected)} of {len(batch)} products")
+                # Skips live in PREFILTER_LOG_FILE and the journal, never the results -
+                # they must not count toward the quota or mark the keyword complete
+                for record, reason in rejected:
+                    print(f"      {Colors.GRAY}prefiltered{Colors.RESET} ⏭️ [{record.get('item_id')}] {reason}")
+                    run_journal.product(keyword, record['url'], 'prefiltered')
+            by_url = {record['url']: record for record in new_records}
+            new_urls = list(by_url)
+            if position:
+                print(f"   {Colors.CYAN}→{Colors.RESET} {saved_count}/{quota} saved - {len(batch)} more candidates from the pool")
+            else:
+                print(f"   🏃 Starting to process...")
+
+            # Already checked under another keyword recently - no browser needed
+            cached = {url: cached_result(keyword, url) for url in new_urls}
+            pending = deque(url for url in new_urls if not cached[url])
+            # The cdp engine loads its products concurrently up front
+            outcomes = engine.process_products(keyword, list(pending), saved_count + 1, quota) if engine else {}
+            prefetcher = (TabPrefetcher(driver) if not engine and PREFETCH_TABS > 0 and len(pending) > 1
+                          else None)
+            try:
+                for i, url in enumerate(new_urls, position + 1):
+                    position = i
+                    result = cached[url]
+                    if result:
+                        cache_hits += 1
+                        if report_result(result, item_id_from_url(url), saved_count + 1, quota):
+                            save_result(result)
+                            saved_count += 1
+                            keyword_processed.add(url)
+                        run_journal.product(keyword, url, 'cached', result)
+                        if observe(result):
+                            break
+                        continue
 
-            if not browser_ok:
-                print(
-                    f"   {Colors.error('✗')} Browser crashed during product processing")
-                return saved_count, False, stuck_count
+                    loading_since = None
+                    if prefetcher:
+                        prefetcher.fill(pending)
+                        loading_since = prefetcher.take(url)
+                    pending.popleft()
+
+                    if engine:
+                        result, browser_ok = outcomes.get(url, (None, False))
+                    else:
+                        product_start = time.time()
+                        with deadline_supervisor.watch(driver, deadline.child(PRODUCT_BUDGET, f"Product {i}")) as budget:
+                            result, browser_ok = process_product(
+                                driver, keyword, url, saved_count + 1, loading_since=loading_since,
+                                deadline=budget, quota=quota)
+                        if budget.aborted:
+                            browser_ok = False
+                        product_time = time.time() - product_start
+                        if not browser_ok or budget.expired:
+                            outcome = 'stuck'
+                        elif result is None and product_time >= PAGE_LOAD_TIMEOUT:
+                            outcome = 'timeout'  # Gave up after page loads ran out of time
+                        else:
+                            outcome = 'ok'
+                        pacing.record('product', product_time, outcome)
+                    if prefetcher and loading_since is not None and browser_ok:
+                        prefetcher.release()
+                    resource_blocker.report(resource_blocker.collect(driver))
+
+                    if deadline.expired:
+                        if result:
+                            save_result(result)
+                            saved_count += 1
+                            keyword_processed.add(url)
+                            run_journal.product(keyword, url, 'saved', result)
+                        return keyword_budget_spent(keyword, deadline, saved_count)
+
+                    if not browser_ok:
+                        print(
+                            f"   {Colors.error('✗')} Browser crashed during product processing")
+                        return saved_count, False, stuck_count
+
+                    checked = checked_result(keyword, url, result)
+                    prefilter_stats.outcome(keyword, by_url[url], checked)
+                    if result:
+                        save_result(result)
+                        saved_count += 1
+                        keyword_processed.add(url)
+                    run_journal.product(keyword, url, 'saved' if result else ('skipped' if checked else 'failed'),
+                                        checked)
+                    if observe(checked):
+                        break
 
-            if result:
-                save_to_csv(result)
-                saved_count += 1
-                keyword_processed.add(url)
+                    if not engine:
+                        time.sleep(pacing.delay())
+            finally:
+                if prefetcher and is_driver_alive(driver):
+                    prefetcher.close()
 
-            time.sleep(REQUEST_DELAY)
+        if deadline.expired:
+            return keyword_budget_spent(keyword, deadline, saved_count)
+
+        # Journaled evidence can settle the test before any product is visited
+        conclude()
+        if not saved_count and not position and not (test and test.decision == 'stopped'):
+            print(
+                f"   {Colors.success('✓')} No unprocessed products left in {len(urls)}+ results")
+            return 0, True, 0
 
+        stuck_registry.clear(keyword)
         print(
             f"   {Colors.GREEN}✓ Keyword complete: {saved_count} products saved{Colors.RESET}")
+        if cache_hits:
+            print(f"   {Colors.CYAN}→{Colors.RESET} {cache_hits} served from item cache")
         return saved_count, True, 0
 
     except Exception as e:
         print(f"   {Colors.error('✗')} Keyword processing error: {e}")
         return 0, True, 0
+    finally:
+        deadline_supervisor.leave(driver, deadline, previous_deadline)
+
+
+def keyword_budget_spent(keyword, deadline, saved_count):
+    """Give up on a keyword whose budget ran out - it costs its budget, never more
+
+    Recorded as stuck rather than retried; a browser the supervisor killed is
+    reported as crashed so the caller restarts it.
+    """
+    print(f"   {Colors.error('⏱')} Keyword budget of {deadline.seconds:.0f}s spent "
+          f"({deadline.elapsed():.0f}s) - {saved_count} products saved, skipping the rest")
+    if deadline.aborted:
+        return saved_count, False, 0
+    save_stuck_keyword(keyword, f"Keyword budget of {deadline.seconds:.0f}s exhausted")
+    return saved_count, True, 0
+
+# ========================
+# WORKER POOL
+# ========================
+
+
+class ResultWriter(threading.Thread):
+    """Single writer thread - the only code that touches the results store in pool mode"""
+
+    def __init__(self, store):
+        super().__init__(name="writer", daemon=True)
+        self.store = store
+        self.queue = queue.Queue()
+        self.saved = 0
+
+    def submit(self, result):
+        """Called on the worker thread - its watchdog and the resume index see the row now"""
+        self.store.index.record(result['keyword'], result['url'])
+        watchdog.activity()
+        self.queue.put(result)
+        return True
+
+    def run(self):
+        while True:
+            try:
+                result = self.queue.get(timeout=1.0)
+            except queue.Empty:
+                # Idle - pick up rows other processes appended
+                self.store.refresh()
+                continue
+            if result is None:
+                break
+            if self.store.save(result):
+                self.saved += 1
+        self.store.flush()
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+
+class PoolStats:
+    """Counters shared by pool workers"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.saved = 0
+        self.crashes = 0
+        self.stuck_keywords = set()
+
+    def add(self, processed=0, saved=0, crashes=0, stuck_keyword=None):
+        with self.lock:
+            self.processed += processed
+            self.saved += saved
+            self.crashes += crashes
+            if stuck_keyword:
+                self.stuck_keywords.add(stuck_keyword)
+
+
+def worker_loop(driver, profile_dir, keyword_queue, writer, stats, standby=None):
+    """Pull keywords from the shared queue until it is empty - one browser per worker"""
+    recycle_policy = RecyclePolicy()
+
+    try:
+        while True:
+            try:
+                keyword, stuck_count = keyword_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if is_keyword_completed(keyword, results_store.index):
+                run_journal.forget(keyword)
+                continue
+
+            # Health check
+            if not is_driver_alive(driver):
+                try:
+                    driver = restart_browser_safe(driver, profile_dir, standby)
+                    recycle_policy.reset()
+                    stats.add(crashes=1)
+                except Exception:
+                    keyword_queue.put((keyword, stuck_count))
+                    break
+
+            saved, success, new_stuck_count = process_keyword(
+                driver, keyword, results_store.index, stuck_count, save_result=writer.submit)
+
+            if not success:
+                try:
+                    driver = restart_browser_safe(driver, profile_dir, standby)
+                    recycle_policy.reset()
+                    stats.add(crashes=1)
+                except Exception:
+                    keyword_queue.put((keyword, new_stuck_count))
+                    break
+
+                if new_stuck_count == 0:
+                    save_stuck_keyword(keyword, "Stuck during search - max retries exceeded")
+                    stats.add(stuck_keyword=keyword)
+                    run_journal.finish(keyword, saved, 'stuck')
+                else:
+                    # Retry later - possibly on another worker
+                    keyword_queue.put((keyword, new_stuck_count))
+                    run_journal.retry(keyword, new_stuck_count)
+                continue
+
+            stats.add(processed=1, saved=saved)
+            run_journal.finish(keyword, saved)
+
+            # Health-driven recycling
+            recycle, _ = recycle_policy.check(driver)
+            if recycle:
+                try:
+                    driver = restart_browser_safe(driver, profile_dir, standby)
+                    recycle_policy.reset()
+                except Exception:
+                    break
+    except Exception as e:
+        print(f"\n{Colors.RED}✗ Worker error: {e}{Colors.RESET}")
+        traceback.print_exc()
+    finally:
+        try:
+            close_engine(driver)
+            driver.quit()
+        except:
+            pass
+        if standby is not None:
+            standby.close()
+
+
+def run_worker_pool(keywords_to_process, workers=None):
+    """Run keywords across several browsers with a shared queue and a single writer"""
+    workers = workers or WORKERS
+
+    keyword_queue = queue.Queue()
+    for kw in keywords_to_process:
+        keyword_queue.put((kw, run_journal.stuck_count(kw)))
+
+    # Launch browsers one at a time - undetected-chromedriver patches its binary on start
+    drivers = []
+    for worker_id in range(1, workers + 1):
+        print(f"\n🌐 Launching Chrome for worker {worker_id}/{workers}...")
+        try:
+            profile_dir = clone_profile(worker_id)
+            prepare_standby_profile(profile_dir)
+            drivers.append((setup_chrome_driver(profile_dir), profile_dir))
+        except Exception as e:
+            print(f"{Colors.error('✗')} Worker {worker_id} failed to start: {e}")
+
+    if not drivers:
+        print(f"{Colors.error('✗')} No browsers could be started")
+        return
+
+    print(f"\n{Colors.YELLOW}⏸️  Please LOGIN to eBay in every browser window ({len(drivers)}){Colors.RESET}")
+    print(f"{Colors.YELLOW}⚠️  Ensure 'View Sold History' extension is active!{Colors.RESET}")
+    input(f"{Colors.GREEN}✓ Press ENTER when ready...{Colors.RESET}\n")
+
+    print(f"🏃 Starting {len(drivers)} workers...\n")
+
+    standbys = [start_standby(driver) for driver, _ in drivers]
+
+    writer = ResultWriter(results_store)
+    writer.start()
+    stats = PoolStats()
+    start_time = time.time()
+
+    threads = [
+        threading.Thread(target=worker_loop, name=f"W{n}",
+                         args=(driver, profile_dir, keyword_queue, writer, stats, standby), daemon=True)
+        for n, ((driver, profile_dir), standby) in enumerate(zip(drivers, standbys), 1)
+    ]
+
+    try:
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1.0)
+        if keyword_queue.empty():
+            run_journal.finish_run()
+    except KeyboardInterrupt:
+        print(f"\n\n{Colors.YELLOW}⚠️  STOPPED BY USER{Colors.RESET}")
+        # Drain the queue so workers finish their current keyword and exit
+        while True:
+            try:
+                keyword_queue.get_nowait()
+            except queue.Empty:
+                break
+    finally:
+        writer.stop()
+        run_journal.close()
+        try:
+            results_store.close()
+        except Exception as e:
+            print(f"{Colors.error('✗')} Error closing results store: {e}")
+        item_cache.save()
+        selector_engine.save()
+
+        print_session_summary(time.time() - start_time, stats.processed, len(keywords_to_process),
+                              stats.saved, stats.crashes, stats.stuck_keywords)
+
+# ========================
+# CALIBRATION
+# ========================
+
+
+class PhaseRecorder:
+    """Latency samples per phase - only collected while calibrating"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = False
+        self.samples = {}
+
+    def record(self, phase, seconds):
+        if not self.active:
+            return
+        with self.lock:
+            self.samples.setdefault(phase, []).append(seconds)
+
+    def stats(self, phase):
+        values = self.samples.get(phase, [])
+        return {
+            'n': len(values),
+            'p50': percentile(values, 50),
+            'p90': percentile(values, 90),
+            'p95': percentile(values, 95),
+            'max': max(values) if values else None,
+        }
+
+
+phase_recorder = PhaseRecorder()
+
+
+def record_phase(phase, seconds):
+    phase_recorder.record(phase, seconds)
+
+
+# setting: (phases it bounds, floor) - tuned to the chosen percentile of the slowest phase
+CALIBRATED_SETTINGS = {
+    'PAGE_LOAD_TIMEOUT': (('homepage', 'item_page', 'search_url'), 3),
+    'SEARCH_WAIT': (('homepage', 'search_submit', 'search_url'), 2),
+    'FILTER_WAIT': (('filter_price', 'filter_us_only', 'filter_unbranded'), 3),
+    'BUTTON_WAIT': (('filter_button',), 0.3),
+    'SCROLL_DELAY': (('scroll_settle',), 0.3),
+    'ITEM_READY_WAIT': (('item_ready',), 0.3),
+    'EXTENSION_BUTTON_WAIT': (('extension_button',), 0.5),
+    'NEW_WINDOW_WAIT': (('history_open',), 0.5),
+    'HISTORY_READY_WAIT': (('history_ready',), 0.3),
+}
+
+
+def derive_settings(recorder, pct=CALIBRATION_PERCENTILE, headroom=CALIBRATION_HEADROOM):
+    """Turn measured phase latencies into timeout settings"""
+    settings = {}
+    for name, (phases, floor) in CALIBRATED_SETTINGS.items():
+        observed = [percentile(recorder.samples[phase], pct) for phase in phases if recorder.samples.get(phase)]
+        if observed:
+            settings[name] = round(max(floor, max(observed) * headroom), 2)
+
+    # The whole filter step may take several waits; stuck means far beyond anything measured
+    filter_max = [recorder.stats(phase)['max'] for phase in CALIBRATED_SETTINGS['FILTER_WAIT'][0]
+                  if recorder.samples.get(phase)]
+    if filter_max:
+        settings['FILTER_MAX_WAIT'] = round(max(5, max(filter_max) * headroom * 1.5), 1)
+    slowest = [max(values) for values in recorder.samples.values() if values]
+    if slowest:
+        # Never below the phase budgets themselves, or the watchdog fires inside a healthy wait
+        budgets = sum(settings.get(name, 0) for name in CALIBRATED_SETTINGS)
+        settings['MAX_STUCK_TIME'] = math.ceil(max(10, max(slowest) * 3, budgets))
+    return settings
+
+
+def load_tuned_settings(path=TUNED_SETTINGS_FILE):
+    """Apply a calibration result at startup - CLI flags still win"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"{Colors.warning('⚠')} Ignoring {path}: {e}")
+        return {}
+
+    allowed = set(CALIBRATED_SETTINGS) | {'FILTER_MAX_WAIT', 'MAX_STUCK_TIME'}
+    applied = {name: value for name, value in data.get('settings', {}).items()
+               if name in allowed and isinstance(value, (int, float))}
+    globals().update(applied)
+    if applied:
+        print(f"{Colors.success('✓')} Loaded {len(applied)} tuned timeouts from {path} "
+              f"(calibrated {data.get('generated', '?')})")
+    return applied
+
+
+def calibrate_command(sample=None, products=None):
+    """Measure per-phase latencies on a keyword sample and write tuned settings"""
+    global FAST_SEARCH_URL, ADAPTIVE_PACING, KEYWORD_BUDGET, PRODUCT_BUDGET, MAX_STUCK_TIME, FILTER_MAX_WAIT
+    sample = sample or CALIBRATION_KEYWORDS
+    products = products or CALIBRATION_PRODUCTS
+    try:
+        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+            keywords = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    except FileNotFoundError:
+        print(f"{Colors.error('✗')} {INPUT_FILE} not found!")
+        return
+    keywords = random.sample(keywords, min(sample, len(keywords)))
+
+    # Measure with generous waits, and search by clicks too, so every phase is timed uncensored
+    for name in CALIBRATED_SETTINGS:
+        globals()[name] = CALIBRATION_CEILING
+    FAST_SEARCH_URL = False
+    ADAPTIVE_PACING = False
+    FILTER_MAX_WAIT = MAX_STUCK_TIME = CALIBRATION_CEILING * 2
+    KEYWORD_BUDGET = PRODUCT_BUDGET = CALIBRATION_CEILING * 20
+
+    print(f"\n{Colors.BOLD}📏 CALIBRATION{Colors.RESET} - {len(keywords)} keywords × {products} products")
+    # Both persist as they go - load first so calibration adds to them instead of overwriting
+    item_cache.load()
+    selector_engine.load()
+    driver = setup_chrome_driver()
+    if not driver:
+        return
+    phase_recorder.active = True
+    started = time.time()
+    try:
+        for keyword in keywords:
+            print(f"\n   {Colors.CYAN}→{Colors.RESET} {keyword}")
+            # Time the filtered-URL load on its own, then run the click path for the rest
+            watchdog.reset()
+            if search_ebay_keyword_fast(driver, keyword) is False:
+                driver = restart_browser_safe(driver)
+            if not search_ebay_keyword(driver, keyword):
+                continue
+            for i, url in enumerate(extract_product_urls(driver, products), 1):
+                _, browser_ok = process_product(driver, keyword, url, i)
+                if not browser_ok:
+                    driver = restart_browser_safe(driver)
+                    break
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}⚠️  Calibration interrupted - using the samples so far{Colors.RESET}")
+    finally:
+        phase_recorder.active = False
+        _quit_quietly(driver)
+        item_cache.save()
+        selector_engine.save()
+
+    phases = {phase: phase_recorder.stats(phase) for phase in sorted(phase_recorder.samples)}
+    if not phases:
+        print(f"{Colors.error('✗')} No phases measured - nothing written")
+        return
+
+    print(f"\n{'phase':<18} {'n':>4} {'p50':>7} {'p90':>7} {'p95':>7} {'max':>7}")
+    for phase, stats in phases.items():
+        print(f"{phase:<18} {stats['n']:>4} {stats['p50']:>6.2f}s {stats['p90']:>6.2f}s "
+              f"{stats['p95']:>6.2f}s {stats['max']:>6.2f}s")
+
+    settings = derive_settings(phase_recorder)
+    with open(TUNED_SETTINGS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'duration_seconds': round(time.time() - started, 1),
+            'keywords': keywords,
+            'percentile': CALIBRATION_PERCENTILE,
+            'headroom': CALIBRATION_HEADROOM,
+            'settings': settings,
+            'phases': phases,
+        }, f, indent=2)
+
+    print(f"\n{Colors.success('✓')} Wrote {len(settings)} tuned settings to {TUNED_SETTINGS_FILE}:")
+    for name, value in settings.items():
+        print(f"   • {name} = {value}")
 
 # ========================
 # MAIN
@@ -1163,15 +5535,26 @@ def main():
     print("="*70)
     print(f"⚙️  Settings:")
     print(f"   • Products per keyword: {PRODUCTS_PER_KEYWORD}")
-    print(f"   • Request delay: {REQUEST_DELAY}s")
-    print(f"   • Browser restart: every {RESTART_EVERY} products")
+    print(f"   • Request delay: {REQUEST_DELAY}s" + (" (adaptive)" if ADAPTIVE_PACING else ""))
+    print(f"   • Browser recycle: rss > {RECYCLE_MAX_RSS_MB}MB, tabs > {RECYCLE_MAX_TABS}, p90 > {RECYCLE_LATENCY_P90}s")
     print(f"   • Winner threshold: {WINNER_THRESHOLD}+ total sales")
     print(f"   • Min sales: {MIN_SALES_THRESHOLD}")
     print(f"   • Min price filter: ${MIN_PRICE}")
+    print(f"   • Search navigation: {'direct URL' if FAST_SEARCH_URL else 'homepage + filter clicks'}")
+    print(f"   • HTTP search results: {HTTP_SEARCH}")
     print(f"   • Save all: {SAVE_ALL_PRODUCTS}")
+    print(f"   • Results backend: {RESULTS_BACKEND}")
+    print(f"   • Browser workers: {WORKERS}")
+    print(f"   • Warm standby browser: {WARM_STANDBY}")
+    print(f"   • Resource blocking: {RESOURCE_BLOCKING}")
+    print(f"   • Sold-history tab: {HISTORY_TAB_MODE}")
+    print(f"   • Prefetch tabs: {PREFETCH_TABS}")
+    print(f"   • Keyword order: {KEYWORD_SCHEDULE}")
+    print(f"   • Engine: {ENGINE}" + (f" ({CDP_TABS} tabs)" if ENGINE == "cdp" else ""))
     print(f"   • Max stuck time: {MAX_STUCK_TIME}s (auto-restart)")
+    print(f"   • Task budgets: {keyword_budget()}s per keyword, {PRODUCT_BUDGET}s per product")
     print(f"   • Keyword retry on stuck: {KEYWORD_STUCK_RETRY} times")
-    print(f"   • Sales months: January & February 2026")
+    print(f"   • Sales window: {window_label(sales_window())} ({SALES_WINDOW_MONTHS} months, per {SALES_HISTOGRAM})")
     print("="*70)
 
     # Initialize session stuck keywords tracker
@@ -1204,14 +5587,19 @@ def main():
         print(f"{Colors.error('✗')} {INPUT_FILE} not found!")
         return
 
-    # Setup CSV
-    if not setup_csv():
+    # Setup results store
+    global results_store
+    results_store = open_results_store()
+    if not results_store.setup():
         return
 
     # Get processed data - REINFORCED CHECK
     print(f"\n{Colors.CYAN}🔍 Checking processed data...{Colors.RESET}")
-    processed_data = get_processed_keywords()
+    processed_data = results_store.load_index()
+    item_cache.load()
+    selector_engine.load()
     completed_keywords = get_completed_keywords(processed_data)
+    interrupted = set(run_journal.load())
 
     # Filter keywords - TRIPLE CHECK with normalization
     keywords_to_process = []
@@ -1238,6 +5626,33 @@ def main():
         print(f"{Colors.GREEN}All {len(all_keywords)} keywords have {PRODUCTS_PER_KEYWORD}+ products in CSV{Colors.RESET}")
         return
 
+    # Keywords that got stuck before wait out their backoff - due ones rejoin the run later
+    now = time.time()
+    retry_queue = [(stuck_registry.retry_at(kw), kw) for kw in keywords_to_process
+                   if stuck_registry.retry_at(kw) > now]
+    if retry_queue:
+        deferred = {kw for _, kw in retry_queue}
+        keywords_to_process = [kw for kw in keywords_to_process if kw not in deferred]
+        parked = sum(1 for due, _ in retry_queue if due == float('inf'))
+        retry_queue = [(due, kw) for due, kw in retry_queue if due != float('inf')]
+        heapq.heapify(retry_queue)
+        print(f"\n{Colors.YELLOW}⏳ Deferred {len(deferred)} stuck keyword(s) from {STUCK_REGISTRY_FILE}"
+              f" ({parked} parked after {STUCK_MAX_FAILURES} failures){Colors.RESET}")
+        if not keywords_to_process:
+            print(f"{Colors.CYAN}💡 Every remaining keyword is backing off - next retry "
+                  f"{datetime.fromtimestamp(retry_queue[0][0]):%Y-%m-%d %H:%M}{Colors.RESET}" if retry_queue else
+                  f"{Colors.CYAN}💡 Every remaining keyword is parked - use --retry-stuck{Colors.RESET}")
+            return
+
+    keywords_to_process, scheduler = schedule_keywords(keywords_to_process, results_store)
+    cluster_keywords(keywords_to_process)
+
+    # Keywords interrupted mid-way go first - the journal holds their candidates
+    resumable = [kw for kw in keywords_to_process if kw.lower() in interrupted]
+    if resumable:
+        print(f"   {Colors.CYAN}→{Colors.RESET} Resuming {len(resumable)} interrupted keyword(s) from {RUN_JOURNAL_FILE}")
+        keywords_to_process = resumable + [kw for kw in keywords_to_process if kw.lower() not in interrupted]
+
     # Show summary
     skipped = len(all_keywords) - len(keywords_to_process)
     print(f"\n📊 {Colors.BOLD}CSV Summary:{Colors.RESET}")
@@ -1249,16 +5664,22 @@ def main():
         print(f"\n📋 {Colors.BOLD}Next keywords to process:{Colors.RESET}")
         for i, kw in enumerate(keywords_to_process[:5], 1):
             existing = get_keyword_progress(kw, processed_data)
+            estimate = f", ~{scheduler.estimate(kw):.0%} winners" if scheduler else ""
             if existing > 0:
-                print(f"   {i}. {kw} ({existing}/{PRODUCTS_PER_KEYWORD} products)")
+                print(f"   {i}. {kw} ({existing}/{PRODUCTS_PER_KEYWORD} products{estimate})")
             else:
-                print(f"   {i}. {kw} (new)")
+                print(f"   {i}. {kw} (new{estimate})")
 
         if len(keywords_to_process) > 5:
             print(f"   ... and {len(keywords_to_process) - 5} more")
 
+    if WORKERS > 1:
+        run_worker_pool(keywords_to_process)
+        return
+
     # Launch browser
     print(f"\n🌐 Launching Chrome...")
+    prepare_standby_profile()
     driver = setup_chrome_driver()
 
     print(f"\n{Colors.YELLOW}⏸️  Please LOGIN to eBay now{Colors.RESET}")
@@ -1267,25 +5688,39 @@ def main():
 
     print("🏃 Starting...\n")
 
+    # Pre-launch the next browser on the copy made before launch
+    standby = start_standby(driver)
+
     # Process keywords
     total_saved = 0
     processed_count = 0
-    browser_restart_counter = 0
+    recycle_policy = RecyclePolicy()
     start_time = time.time()
-    crash_count = 0
-    keyword_stuck_counts = {}
+    # Counters carried over from an interrupted run
+    crash_count = run_journal.counters.get('crashes', 0)
+    keyword_stuck_counts = {kw: run_journal.stuck_count(kw) for kw in keywords_to_process
+                            if run_journal.stuck_count(kw)}
+    session_stuck_keywords |= run_journal.stuck_keywords
 
     try:
         i = 0
         while i < len(keywords_to_process):
+            # Stuck keywords whose backoff ran out rejoin at the end of the run
+            while retry_queue and retry_queue[0][0] <= time.time():
+                _, due_keyword = heapq.heappop(retry_queue)
+                if due_keyword not in keywords_to_process[i:]:
+                    print(f"   {Colors.CYAN}→{Colors.RESET} Backoff over - '{due_keyword}' queued for another try")
+                    keywords_to_process.append(due_keyword)
+
             keyword = keywords_to_process[i]
             
             # FINAL CHECK: Skip if already completed (real-time check)
-            # Reload processed data to catch any concurrent updates
+            # Tail new rows to catch concurrent updates from other processes
             if i % 5 == 0:  # Refresh every 5 keywords
-                processed_data = get_processed_keywords()
+                results_store.refresh()
             
             if is_keyword_completed(keyword, processed_data):
+                run_journal.forget(keyword)
                 print(f"\n{'='*70}")
                 print(f"⏭️  {Colors.YELLOW}SKIPPING:{Colors.RESET} {keyword}")
                 print(f"   {Colors.GREEN}✓ Already has {get_keyword_progress(keyword, processed_data)}/{PRODUCTS_PER_KEYWORD} products{Colors.RESET}")
@@ -1296,9 +5731,10 @@ def main():
             # Health check
             if not is_driver_alive(driver):
                 try:
-                    driver = restart_browser_safe(driver)
-                    browser_restart_counter = 0
+                    driver = restart_browser_safe(driver, standby=standby)
+                    recycle_policy.reset()
                     crash_count += 1
+                    run_journal.count(crashes=crash_count)
                     continue
                 except Exception as e:
                     break
@@ -1313,17 +5749,21 @@ def main():
             if not success:
                 # Update stuck count
                 keyword_stuck_counts[keyword] = new_stuck_count
+                run_journal.retry(keyword, new_stuck_count)
 
                 # Restart browser
                 try:
-                    driver = restart_browser_safe(driver)
-                    browser_restart_counter = 0
+                    driver = restart_browser_safe(driver, standby=standby)
+                    recycle_policy.reset()
                     crash_count += 1
+                    run_journal.count(crashes=crash_count)
 
                     # If stuck count exceeded, move to next keyword
                     if new_stuck_count == 0:
                         save_stuck_keyword(keyword, "Stuck during search - max retries exceeded")
                         session_stuck_keywords.add(keyword)
+                        run_journal.finish(keyword, saved, 'stuck')
+                        requeue_stuck(retry_queue, keyword)
                         i += 1
                         if keyword in keyword_stuck_counts:
                             del keyword_stuck_counts[keyword]
@@ -1336,14 +5776,18 @@ def main():
                     del keyword_stuck_counts[keyword]
                 total_saved += saved
                 processed_count += 1
+                run_journal.finish(keyword, saved)
                 i += 1
 
-            # Periodic restart
-            browser_restart_counter += PRODUCTS_PER_KEYWORD
-            if browser_restart_counter >= RESTART_EVERY:
+            # Just registered as stuck - retry once its backoff is over instead of right away
+            requeue_stuck(retry_queue, keyword)
+
+            # Health-driven recycling
+            recycle, _ = recycle_policy.check(driver)
+            if recycle:
                 try:
-                    driver = restart_browser_safe(driver)
-                    browser_restart_counter = 0
+                    driver = restart_browser_safe(driver, standby=standby)
+                    recycle_policy.reset()
                 except Exception as e:
                     break
 
@@ -1361,6 +5805,9 @@ def main():
                 print(f"   Speed: {rate:.1f} kw/min | Time: {elapsed/60:.1f}m | ETA: {eta_min:.0f}m")
                 print(f"{'='*70}\n")
 
+        if i >= len(keywords_to_process):
+            run_journal.finish_run()
+
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}⚠️  STOPPED BY USER{Colors.RESET}")
     except Exception as e:
@@ -1368,50 +5815,255 @@ def main():
         traceback.print_exc()
     finally:
         try:
+            close_engine(driver)
             driver.quit()
         except:
             pass
+        if standby is not None:
+            standby.close()
+        run_journal.close()
+
+        try:
+            results_store.close()
+        except Exception as e:
+            print(f"{Colors.error('✗')} Error closing results store: {e}")
+        item_cache.save()
+        selector_engine.save()
 
         elapsed = time.time() - start_time
+        print_session_summary(elapsed, processed_count, len(keywords_to_process),
+                              total_saved, crash_count, session_stuck_keywords)
+
+def print_session_summary(elapsed, processed_count, total_keywords, total_saved,
+                          crash_count, session_stuck_keywords):
+    """Print the end-of-session report"""
+    print("\n" + "="*70)
+    print(f"{Colors.GREEN}✓ SESSION COMPLETE!{Colors.RESET}")
+    print(f"   Time: {elapsed/60:.1f}m ({elapsed/3600:.1f}h)")
+    print(f"   Keywords: {processed_count}/{total_keywords}")
+    print(f"   Products saved: {total_saved}")
+    print(f"   Crashes: {crash_count}")
+    print(f"   Item cache: {item_cache.hits} hits / {item_cache.misses} misses")
+    if restart_latencies:
+        print(f"   Browser restarts: {restart_latency_summary()}")
+    if deadline_supervisor.aborts:
+        print(f"   Hung commands aborted past their budget: {deadline_supervisor.aborts}")
+    if pacing.summary():
+        print(f"   Pacing: {pacing.summary()}")
+    if keyword_clusters.summary():
+        print(f"   Keyword clusters: {keyword_clusters.summary()}")
+    if sampling_budget.summary():
+        print(f"   Early stopping: {sampling_budget.summary()}")
+    if prefilter_stats.summary():
+        print(f"   Pre-filter: {prefilter_stats.summary()}")
+    if resource_blocker.summary():
+        print(f"   Blocking ({RESOURCE_BLOCKING}): {resource_blocker.summary()}")
+    if processed_count > 0:
+        print(f"   Speed: {processed_count/(elapsed/60):.1f} kw/min")
+    print(f"   Results: {RESULTS_DB_FILE if results_store.name == 'sqlite' else OUTPUT_FILE}")
+    print("="*70)
+
+    # Show stuck keywords from this session
+    if session_stuck_keywords:
+        print(f"\n{Colors.YELLOW}⚠️  STUCK/FAILED KEYWORDS THIS SESSION:{Colors.RESET}")
+        print("="*70)
+        for i, kw in enumerate(session_stuck_keywords, 1):
+            print(f"   {i}. {kw}")
+        print(f"\n{Colors.CYAN}💡 These keywords have been saved to: {STUCK_REGISTRY_FILE}{Colors.RESET}")
+        print(f"{Colors.CYAN}💡 They are retried automatically once their backoff is over{Colors.RESET}")
+        print("="*70)
 
-        print("\n" + "="*70)
-        print(f"{Colors.GREEN}✓ SESSION COMPLETE!{Colors.RESET}")
-        print(f"   Time: {elapsed/60:.1f}m ({elapsed/3600:.1f}h)")
-        print(f"   Keywords: {processed_count}/{len(keywords_to_process)}")
-        print(f"   Products saved: {total_saved}")
-        print(f"   Crashes: {crash_count}")
-        if processed_count > 0:
-            print(f"   Speed: {processed_count/(elapsed/60):.1f} kw/min")
-        print(f"   Results: {OUTPUT_FILE}")
+    # Show all registered stuck keywords
+    all_stuck = stuck_registry.all()
+    if all_stuck:
+        print(f"\n{Colors.RED}📋 STUCK KEYWORD REGISTRY (all sessions):{Colors.RESET}")
+        print("="*70)
+        for i, entry in enumerate(sorted(all_stuck.values(), key=lambda e: e['keyword']), 1):
+            when = f"retry after {entry['retry_after']}" if entry['retry_after'] else f"{Colors.RED}parked{Colors.RESET}"
+            print(f"   {i}. {entry['keyword']} - {entry['failures']}× ({entry['reason']}), {when}")
+        print(f"\n{Colors.YELLOW}⚠️  Total stuck keywords: {len(all_stuck)}{Colors.RESET}")
+        print(f"{Colors.CYAN}💡 To retry them now: run with --retry-stuck "
+              f"(parked keywords need it, or their line removed from '{STUCK_REGISTRY_FILE}'){Colors.RESET}")
         print("="*70)
 
-        # Show stuck keywords from this session
-        if session_stuck_keywords:
-            print(f"\n{Colors.YELLOW}⚠️  STUCK/FAILED KEYWORDS THIS SESSION:{Colors.RESET}")
-            print("="*70)
-            for i, kw in enumerate(session_stuck_keywords, 1):
-                print(f"   {i}. {kw}")
-            print(f"\n{Colors.CYAN}💡 These keywords have been saved to: {STUCK_KEYWORDS_FILE}{Colors.RESET}")
-            print(f"{Colors.CYAN}💡 They will be shown in every session until processed{Colors.RESET}")
-            print("="*70)
-
-        # Show all accumulated stuck keywords
-        all_stuck = load_stuck_keywords()
-        if all_stuck:
-            print(f"\n{Colors.RED}📋 ALL STUCK KEYWORDS (from all sessions):{Colors.RESET}")
-            print("="*70)
-            for i, kw in enumerate(sorted(all_stuck), 1):
-                print(f"   {i}. {kw}")
-            print(f"\n{Colors.YELLOW}⚠️  Total stuck keywords: {len(all_stuck)}{Colors.RESET}")
-            print(f"{Colors.CYAN}💡 To retry these keywords:{Colors.RESET}")
-            print(f"   1. Add them back to '{INPUT_FILE}'")
-            print(f"   2. Delete '{STUCK_KEYWORDS_FILE}' (or remove specific lines)")
-            print(f"   3. Run the script again")
-            print("="*70)
-
-        if processed_count < len(keywords_to_process):
-            print(f"\n{Colors.CYAN}💡 Run script again to continue!{Colors.RESET}")
+    if processed_count < total_keywords:
+        print(f"\n{Colors.CYAN}💡 Run script again to continue!{Colors.RESET}")
+
+
+def import_csv_command(csv_path):
+    """Import a results CSV into the SQLite store"""
+    store = SqliteResultsStore()
+    if not store.setup():
+        return
+    try:
+        imported = store.import_csv(csv_path)
+        print(f"{Colors.success('✓')} Imported {imported} new rows from {csv_path} into {store.path}")
+    finally:
+        store.close()
+
+
+def benchmark_command(keywords, products=None):
+    """Compare the selenium and cdp engines on a few keywords"""
+    if not keywords:
+        try:
+            with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+                keywords = [line.strip() for line in f
+                            if line.strip() and not line.startswith('#')][:3]
+        except FileNotFoundError:
+            print(f"{Colors.error('✗')} {INPUT_FILE} not found!")
+            return
+    benchmark_engines(keywords, products=products)
+
+
+def export_csv_command(csv_path):
+    """Export the SQLite store to the CSV schema"""
+    store = SqliteResultsStore()
+    if not store.setup():
+        return
+    try:
+        exported = store.export_csv(csv_path)
+        print(f"{Colors.success('✓')} Exported {exported} rows from {store.path} to {csv_path}")
+    finally:
+        store.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="eBay keyword sold-history hunter")
+    parser.add_argument("--backend", choices=["csv", "sqlite"],
+                        help=f"Results backend (default: {RESULTS_BACKEND})")
+    parser.add_argument("--workers", type=int,
+                        help=f"Parallel browsers (default: {WORKERS})")
+    parser.add_argument("--blocking", choices=sorted(BLOCKING_PRESETS),
+                        help=f"Resource blocking preset (default: {RESOURCE_BLOCKING})")
+    parser.add_argument("--http-search", action="store_true",
+                        help="Fetch search results over HTTP; use Chrome only for sold history")
+    parser.add_argument("--base-url",
+                        help=f"eBay base URL for search pages (default: {EBAY_BASE_URL})")
+    parser.add_argument("--no-standby", action="store_true",
+                        help="Do not keep a pre-launched standby browser")
+    parser.add_argument("--history-tab", choices=["persistent", "new-window"],
+                        help=f"Sold-history tab handling (default: {HISTORY_TAB_MODE})")
+    parser.add_argument("--prefetch", type=int,
+                        help=f"Listing pages loaded ahead in background tabs (default: {PREFETCH_TABS})")
+    parser.add_argument("--engine", choices=["selenium", "cdp"],
+                        help=f"Browser engine (default: {ENGINE})")
+    parser.add_argument("--cdp-tabs", type=int,
+                        help=f"Concurrent product tabs for the cdp engine (default: {CDP_TABS})")
+    parser.add_argument("--no-pacing", action="store_true",
+                        help="Keep REQUEST_DELAY fixed")
+    parser.add_argument("--schedule", choices=["yield", "file"],
+                        help=f"Keyword order (default: {KEYWORD_SCHEDULE})")
+    parser.add_argument("--retry-stuck", action="store_true",
+                        help=f"Ignore the backoff in {STUCK_REGISTRY_FILE} and try stuck keywords now")
+    parser.add_argument("--no-journal", action="store_true",
+                        help=f"Do not record or resume from {RUN_JOURNAL_FILE}")
+    parser.add_argument("--no-cluster", action="store_true",
+                        help="Search every keyword, even near-duplicates of another")
+    parser.add_argument("--cluster-similarity", type=float,
+                        help=f"Token-set similarity for near-duplicate keywords (default: {CLUSTER_SIMILARITY})")
+    parser.add_argument("--no-early-stop", action="store_true",
+                        help="Always check every product of a keyword")
+    parser.add_argument("--no-pool", action="store_true",
+                        help=f"Only consider the first {PRODUCTS_PER_KEYWORD} results of one page")
+    parser.add_argument("--pool-pages", type=int,
+                        help=f"Results pages followed per keyword in pool mode (default: {POOL_MAX_PAGES})")
+    parser.add_argument("--no-prefilter", action="store_true",
+                        help="Visit every result's sold history regardless of its card metadata")
+    parser.add_argument("--prefilter-min-sold", type=int,
+                        help=f"Skip cards without an \"N sold\" badge of at least this (default: {PREFILTER_MIN_SOLD})")
+    parser.add_argument("--no-tuned", action="store_true",
+                        help=f"Ignore timeouts calibrated into {TUNED_SETTINGS_FILE}")
+    parser.add_argument("--window-months", type=int,
+                        help=f"Months in the rolling sold-history window (default: {SALES_WINDOW_MONTHS})")
+    parser.add_argument("--window-end", metavar="YYYY-MM",
+                        help="Last month of the sold-history window (default: current month)")
+    parser.add_argument("--histogram", choices=["month", "day"],
+                        help=f"Sales histogram buckets (default: {SALES_HISTOGRAM})")
+    parser.add_argument("--click-search", action="store_true",
+                        help="Search via homepage + filter clicks instead of the direct URL")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="Scrape keywords (default)")
+    import_parser = commands.add_parser("import-csv", help="Import a results CSV into the SQLite store")
+    import_parser.add_argument("csv_path", nargs="?", default=OUTPUT_FILE)
+    export_parser = commands.add_parser("export-csv", help="Export the SQLite store to CSV")
+    export_parser.add_argument("csv_path")
+    calibrate_parser = commands.add_parser("calibrate", help="Measure phase latencies and write tuned timeouts")
+    calibrate_parser.add_argument("--sample", type=int,
+                                  help=f"Keywords sampled from {INPUT_FILE} (default: {CALIBRATION_KEYWORDS})")
+    calibrate_parser.add_argument("--products", type=int,
+                                  help=f"Products per keyword (default: {CALIBRATION_PRODUCTS})")
+    benchmark_parser = commands.add_parser("benchmark", help="Compare the selenium and cdp engines")
+    benchmark_parser.add_argument("keywords", nargs="*",
+                                  help=f"Keywords to run (default: first 3 in {INPUT_FILE})")
+    benchmark_parser.add_argument("--products", type=int,
+                                  help=f"Products per keyword (default: {PRODUCTS_PER_KEYWORD})")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.command != "calibrate" and not args.no_tuned:
+        load_tuned_settings()
+    if args.backend:
+        RESULTS_BACKEND = args.backend
+    if args.workers:
+        WORKERS = args.workers
+    if args.click_search:
+        FAST_SEARCH_URL = False
+    if args.no_standby:
+        WARM_STANDBY = False
+    if args.no_pacing:
+        ADAPTIVE_PACING = False
+    if args.schedule:
+        KEYWORD_SCHEDULE = args.schedule
+    if args.retry_stuck:
+        STUCK_IGNORE_BACKOFF = True
+    if args.no_journal:
+        RUN_JOURNAL = False
+    if args.no_cluster:
+        KEYWORD_CLUSTERS = False
+    if args.cluster_similarity:
+        CLUSTER_SIMILARITY = args.cluster_similarity
+    if args.no_early_stop:
+        EARLY_STOP = False
+    if args.no_pool:
+        CANDIDATE_POOL = False
+    if args.pool_pages:
+        POOL_MAX_PAGES = max(1, args.pool_pages)
+    if args.no_prefilter:
+        PREFILTER = False
+    if args.prefilter_min_sold is not None:
+        PREFILTER_MIN_SOLD = args.prefilter_min_sold
+    if args.window_months:
+        SALES_WINDOW_MONTHS = args.window_months
+    if args.window_end:
+        SALES_WINDOW_END = args.window_end
+    if args.histogram:
+        SALES_HISTOGRAM = args.histogram
+    if args.history_tab:
+        HISTORY_TAB_MODE = args.history_tab
+    if args.prefetch is not None:
+        PREFETCH_TABS = max(0, args.prefetch)
+    if args.engine:
+        ENGINE = args.engine
+        if ENGINE == "cdp" and websockets is None:
+            raise SystemExit("The cdp engine needs the 'websockets' package: pip install websockets")
+    if args.cdp_tabs:
+        CDP_TABS = args.cdp_tabs
+    if args.blocking:
+        RESOURCE_BLOCKING = args.blocking
+    if args.http_search:
+        HTTP_SEARCH = True
+    if args.base_url:
+        EBAY_BASE_URL = args.base_url.rstrip('/')
+
+    if args.command == "import-csv":
+        import_csv_command(args.csv_path)
+    elif args.command == "export-csv":
+        export_csv_command(args.csv_path)
+    elif args.command == "calibrate":
+        calibrate_command(args.sample, args.products)
+    elif args.command == "benchmark":
+        benchmark_command(args.keywords, args.products)
+    else:
+        main()
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+
+import ebay_hunter  # noqa: E402
+
+
+class TargetsDriver:
+    """Reports page targets the way Target.getTargets does; the extension acts after a few polls"""
+
+    def __init__(self, after_polls, new_window=None, routed_url=None):
+        self.pages = {"home": "https://www.ebay.com/itm/1234567890", "history": "chrome-extension://x/?id=1"}
+        self.after_polls = after_polls
+        self.new_window = new_window
+        self.routed_url = routed_url
+        self.polls = 0
+
+    def execute_cdp_cmd(self, method, params):
+        assert method == "Target.getTargets"
+        self.polls += 1
+        if self.polls == self.after_polls:
+            if self.new_window:
+                self.pages[self.new_window] = "chrome-extension://x/?id=2"
+            if self.routed_url:
+                self.pages["history"] = self.routed_url
+        return {"targetInfos": [{"targetId": handle, "type": "page", "url": url}
+                                for handle, url in self.pages.items()]}
+
+
+def wait(driver, timeout=2):
+    ebay_hunter.watchdog.reset()
+    return ebay_hunter.wait_for_history_tab(driver, {"home", "history"}, "history",
+                                            "chrome-extension://x/?id=1", timeout=timeout)
+
+
+def test_routed_into_history_tab():
+    assert wait(TargetsDriver(3, routed_url="chrome-extension://x/?id=2")) == "history"
+
+
+def test_new_window_seen_while_watching_history_tab():
+    # The extension may take most of NEW_WINDOW_WAIT to open its window
+    driver = TargetsDriver(8, new_window="popup")
+    assert wait(driver) == "popup"
+    assert driver.polls == 8
+
+
+def test_neither_outcome():
+    assert wait(TargetsDriver(0), timeout=0.5) is None
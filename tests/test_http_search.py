@@ -0,0 +1,68 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+
+import ebay_hunter  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+with open(os.path.join(DATA_DIR, "search_results.html"), "rb") as f:
+    RESULTS_PAGE = f.read()
+
+# Served with status 200 but carries no result cards (e.g. a reshuffled layout)
+EMPTY_PAGE = b"<html><body><div id='srp-river-results'><p>Loading...</p></div></body></html>"
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        body = RESULTS_PAGE if query.get("_nkw") == ["lamp shade"] else EMPTY_PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def ebay_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(ebay_hunter, "EBAY_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_search_parses_recorded_results_page(ebay_server):
+    records = ebay_hunter.HttpSearchClient(timeout=5).search("lamp shade", 10)
+
+    # The "Shop on eBay" placeholder card has no real item ID and is skipped
+    assert [record["item_id"] for record in records] == ["204512345678", "315098765432", "126543210987"]
+    first, second, third = records
+    assert first["url"] == "https://www.ebay.com/itm/204512345678"
+    assert first["title"] == 'Linen Drum Lamp Shade 12" Off-White'
+    assert (first["price"], first["sold"], first["origin"], first["sponsored"]) == (24.99, 1204, "United States", False)
+    assert (second["price"], second["sold"], second["origin"], second["sponsored"]) == (31.5, 0, "China", True)
+    assert third["title"] == "New Listing Vintage Glass Lamp Shade Replacement"
+    assert (third["price"], third["sold"]) == (1089.0, 7)
+
+
+def test_search_respects_max_products(ebay_server):
+    records = ebay_hunter.HttpSearchClient(timeout=5).search("lamp shade", 2)
+    assert len(records) == 2
+
+
+def test_search_without_result_cards_returns_none(ebay_server):
+    assert ebay_hunter.HttpSearchClient(timeout=5).search("anything else", 10) is None
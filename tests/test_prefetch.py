@@ -0,0 +1,99 @@
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+
+import ebay_hunter  # noqa: E402
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        if handle not in self.driver.window_handles:
+            raise ebay_hunter.WebDriverException(f"no such window: {handle}")
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Tracks tabs the way chromedriver does - handles are CDP target IDs"""
+
+    def __init__(self):
+        self.window_handles = ["home"]
+        self.current_window_handle = "home"
+        self.current_url = "https://www.ebay.com/sch/i.html?_nkw=lamp"
+        self.switch_to = FakeSwitchTo(self)
+        self.ebh_history_handle = None
+        self.opened = 0
+        self.commands = []  # (tab the command went to, method, params)
+
+    def execute_cdp_cmd(self, method, params):
+        if method != "Target.createTarget":
+            self.commands.append((self.current_window_handle, method, params))
+            return {}
+        self.opened += 1
+        handle = f"tab-{self.opened}"
+        self.window_handles.append(handle)
+        self.commands.append((handle, method, params))
+        return {"targetId": handle}
+
+    def open_window(self):
+        self.opened += 1
+        handle = f"popup-{self.opened}"
+        self.window_handles.append(handle)
+        return handle
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+def run_product(driver, prefetcher, url):
+    """What process_keyword does around one prefetched product"""
+    assert prefetcher.take(url) is not None
+    original_window = driver.current_window_handle
+    # The sold-history click opens a window that close_extra_tabs must clean up
+    driver.switch_to.window(driver.open_window())
+    ebay_hunter.close_extra_tabs(driver, original_window)
+    prefetcher.release()
+
+
+def test_home_tab_survives_two_prefetched_products():
+    driver = FakeDriver()
+    prefetcher = ebay_hunter.TabPrefetcher(driver, depth=2)
+    urls = [f"https://www.ebay.com/itm/12345678{n:02d}" for n in range(4)]
+
+    prefetcher.fill(urls)
+    run_product(driver, prefetcher, urls[0])
+    assert "home" in driver.window_handles
+    assert driver.current_window_handle == "home"
+
+    prefetcher.fill(urls[1:])
+    run_product(driver, prefetcher, urls[1])
+    assert "home" in driver.window_handles
+    assert driver.current_window_handle == "home"
+    assert not any(h.startswith("popup-") for h in driver.window_handles)
+
+    prefetcher.close()
+    assert driver.window_handles == ["home"]
+
+
+def test_prefetched_tabs_are_blocked_before_loading(monkeypatch):
+    monkeypatch.setattr(ebay_hunter, "RESOURCE_BLOCKING", "extension-safe")
+    driver = FakeDriver()
+    prefetcher = ebay_hunter.TabPrefetcher(driver, depth=1)
+    urls = [f"https://www.ebay.com/itm/12345678{n:02d}" for n in range(2)]
+
+    prefetcher.fill(urls)
+    assert driver.current_window_handle == "home"
+    for tab in ("tab-1", "tab-2"):
+        methods = [method for handle, method, _ in driver.commands if handle == tab]
+        assert methods == ["Target.createTarget", "Network.enable", "Network.setBlockedURLs", "Page.navigate"]
+    navigated = [params["url"] for _, method, params in driver.commands if method == "Page.navigate"]
+    assert navigated == urls
+    assert all(params["url"] == "about:blank"
+               for _, method, params in driver.commands if method == "Target.createTarget")
+
+
+def test_depth_follows_prefetch_tabs_setting(monkeypatch):
+    monkeypatch.setattr(ebay_hunter, "PREFETCH_TABS", 5)
+    assert ebay_hunter.TabPrefetcher(FakeDriver()).depth == 5
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+
+import ebay_hunter  # noqa: E402
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(ebay_hunter, "STUCK_KEYWORDS_FILE", os.path.join(tmp_path, "stuck_keywords.txt"))
+    registry = ebay_hunter.StuckRegistry(os.path.join(tmp_path, "stuck_keywords.jsonl"))
+    monkeypatch.setattr(ebay_hunter, "stuck_registry", registry)
+    return registry
+
+
+def test_stuck_keyword_requeued_after_backoff(registry):
+    registry.record("lamp shade", "Stuck during search")
+    retry_queue = []
+
+    assert ebay_hunter.requeue_stuck(retry_queue, "lamp shade")
+    assert retry_queue == [(registry.retry_at("lamp shade"), "lamp shade")]
+
+
+def test_parked_keyword_not_requeued(registry, monkeypatch):
+    monkeypatch.setattr(ebay_hunter, "STUCK_MAX_FAILURES", 1)
+    registry.record("lamp shade", "Stuck during search")
+    retry_queue = []
+
+    assert not ebay_hunter.requeue_stuck(retry_queue, "lamp shade")
+    assert retry_queue == []
+
+
+def test_retry_stuck_does_not_requeue_in_run(registry, monkeypatch):
+    # --retry-stuck makes every keyword due at once - requeueing would retry it forever
+    monkeypatch.setattr(ebay_hunter, "STUCK_IGNORE_BACKOFF", True)
+    registry.record("lamp shade", "Stuck during search")
+    retry_queue = []
+
+    assert not ebay_hunter.requeue_stuck(retry_queue, "lamp shade")
+    assert retry_queue == []